@@ -0,0 +1,52 @@
+"""
+Bucketing points by 3 m cell: integer cell IDs (cells.py) versus going through word strings.
+
+Times, over POINTS random coordinates: cell_ids, the three words as strings
+(lat_lng_to_words_batch with return_words), a group-by on each key, rolling cell IDs up to
+level-10 blocks, and turning stored words back into cell IDs versus coordinates. Run from
+backend/:
+
+    python -m benchmarks.bench_cells
+"""
+import argparse
+import time
+
+import numpy as np
+
+from cells import cell_ids, cell_parents, words_to_cell_ids
+from geocoding import lat_lng_to_words_batch, words_to_lat_lng_batch
+
+def _best(func, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--points", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    lats, lngs = rng.uniform(-90, 90, args.points), rng.uniform(-180, 180, args.points)
+    ids, _ = cell_ids(lats, lngs)
+    words, _ = lat_lng_to_words_batch(lats, lngs, return_words=True)
+    keys = np.char.add(np.char.add(np.char.add(words[:, 0], "."), np.char.add(words[:, 1], ".")), words[:, 2])
+
+    timings = [
+        ("key: cell_ids", _best(lambda: cell_ids(lats, lngs))),
+        ("key: words (batch encode)", _best(lambda: lat_lng_to_words_batch(lats, lngs, return_words=True))),
+        ("group-by cell ID", _best(lambda: np.unique(ids, return_counts=True))),
+        ("group-by word string", _best(lambda: np.unique(keys, return_counts=True))),
+        ("roll up to level 10", _best(lambda: cell_parents(ids, 10))),
+        ("words -> cell ID", _best(lambda: words_to_cell_ids(words[:, 0], words[:, 1], words[:, 2]))),
+        ("words -> coordinates", _best(lambda: words_to_lat_lng_batch(words[:, 0], words[:, 1], words[:, 2]))),
+    ]
+    print(f"{args.points:,} points")
+    for label, seconds in timings:
+        print(f"{label:28s} {seconds * 1e3:9.1f} ms {args.points / seconds:>14,.0f} rows/s")
+
+if __name__ == "__main__":
+    main()
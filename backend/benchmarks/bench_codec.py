@@ -0,0 +1,119 @@
+"""
+Microbenchmark for the per-call Codec hot path.
+
+Compares the pre-Codec module functions (reproduced below: a get_word_data lookup, p_base2
+recomputation and output re-validation on every call) with the lat_lng_to_words /
+words_to_lat_lng wrappers and direct Codec calls.
+
+Run from backend/:
+
+    python -m benchmarks.bench_codec [--number 200000]
+"""
+import argparse
+import timeit
+
+import geocoding
+from geocoding import LATITUDE_CELLS, LONGITUDE_CELLS, get_codec, get_word_data
+
+def legacy_lat_lng_to_words(lat: float, lng: float, mode: str = "global"):
+    """lat_lng_to_words as it was before Codec, kept here as the benchmark reference."""
+    if not (-90 <= lat <= 90):
+        raise ValueError("Latitude must be between -90 and 90")
+    if not (-180 <= lng <= 180):
+        raise ValueError("Longitude must be between -180 and 180")
+
+    word_list, word_to_index, word_combinations = get_word_data(mode)
+    word_count = len(word_list)
+
+    lat_grid = max(0, min(int((lat + 90) / 180 * LATITUDE_CELLS), LATITUDE_CELLS - 1))
+    lng_grid = max(0, min(int((lng + 180) / 360 * LONGITUDE_CELLS), LONGITUDE_CELLS - 1))
+    grid_index = lat_grid * LONGITUDE_CELLS + lng_grid
+
+    p_base2 = (word_count - 1) * (word_count - 2)
+    a = grid_index // p_base2
+    r = grid_index % p_base2
+    b = r // (word_count - 2)
+    c = r % (word_count - 2)
+
+    i1 = a
+    i2 = b + (1 if b >= i1 else 0)
+    x = c
+    lo = i1 if i1 < i2 else i2
+    hi = i2 if i2 > i1 else i1
+    if x >= lo:
+        x += 1
+    if x >= hi:
+        x += 1
+
+    selected = (word_list[i1], word_list[i2], word_list[x])
+    if not all(w.isalpha() for w in selected):
+        raise ValueError("Internal error: non-alphabetic word produced.")
+    if len(set(selected)) != 3:
+        raise ValueError("Internal error: duplicate words produced.")
+    return selected
+
+def legacy_words_to_lat_lng(word1: str, word2: str, word3: str, mode: str = "global"):
+    """words_to_lat_lng as it was before Codec, kept here as the benchmark reference."""
+    word1, word2, word3 = word1.lower(), word2.lower(), word3.lower()
+    if not (word1.isalpha() and word2.isalpha() and word3.isalpha()):
+        raise ValueError("Words must contain only alphabetic characters.")
+    if len(set([word1, word2, word3])) != 3:
+        raise ValueError("Words must be unique.")
+
+    word_list, word_to_index, word_combinations = get_word_data(mode)
+    word_count = len(word_list)
+    try:
+        a = word_to_index[word1]
+        w2_val = word_to_index[word2]
+        c = word_to_index[word3]
+    except KeyError:
+        raise ValueError("One or more words not found in the dictionary")
+
+    p_base2 = (word_count - 1) * (word_count - 2)
+    b = w2_val - (1 if w2_val > a else 0)
+    lo = a if a < w2_val else w2_val
+    hi = w2_val if w2_val > a else a
+    if c > hi:
+        c -= 1
+    if c > lo:
+        c -= 1
+    grid_index = a * p_base2 + b * (word_count - 2) + c
+
+    lat_grid = grid_index // LONGITUDE_CELLS
+    lng_grid = grid_index % LONGITUDE_CELLS
+    lat = (lat_grid / LATITUDE_CELLS) * 180 - 90 + (180 / LATITUDE_CELLS) / 2
+    lng = (lng_grid / LONGITUDE_CELLS) * 360 - 180 + (360 / LONGITUDE_CELLS) / 2
+    return max(-90, min(90, lat)), max(-180, min(180, lng))
+
+def run(number: int = 200_000) -> dict:
+    """Time each variant; returns {name: nanoseconds per call}."""
+    codec = get_codec("global")
+    lat, lng = 51.5074, -0.1278
+    words = codec.encode(lat, lng)
+    cases = {
+        "encode legacy": lambda: legacy_lat_lng_to_words(lat, lng),
+        "encode lat_lng_to_words": lambda: geocoding.lat_lng_to_words(lat, lng),
+        "encode Codec.encode": lambda: codec.encode(lat, lng),
+        "encode Codec.encode_index": lambda: codec.encode_index(123_456_789_012),
+        "decode legacy": lambda: legacy_words_to_lat_lng(*words),
+        "decode words_to_lat_lng": lambda: geocoding.words_to_lat_lng(*words),
+        "decode Codec.decode": lambda: codec.decode(*words),
+        "decode Codec.decode_index": lambda: codec.decode_index(5, 9, 3),
+    }
+    results = {}
+    for name, func in cases.items():
+        # Best of 3 to damp scheduler noise
+        best = min(timeit.repeat(func, number=number, repeat=3))
+        results[name] = best / number * 1e9
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=200_000, help="calls per timing run")
+    args = parser.parse_args()
+
+    results = run(args.number)
+    for name, ns in results.items():
+        print(f"{name:28s} {ns:8.0f} ns/call")
+    print(f"\nencode speedup vs legacy: {results['encode legacy'] / results['encode Codec.encode']:.2f}x")
+    print(f"decode speedup vs legacy: {results['decode legacy'] / results['decode Codec.decode']:.2f}x")
@@ -0,0 +1,50 @@
+"""
+Request throughput of /convert-coords with the write-behind conversion log off and on, and
+the rate at which the log's bulk inserts drain into SQLite.
+
+The benchmark points the app at a throwaway database, so run it from backend/:
+
+    python -m benchmarks.bench_conversion_log
+"""
+import os
+import random
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="w3w-bench-"), "bench.db"))
+
+from fastapi.testclient import TestClient
+
+import main
+from conversion_log import ConversionLog
+
+def run(requests: int = 3000, seed: int = 0) -> dict:
+    """Returns {"off_rps", "on_rps", "insert_rows_per_s"}."""
+    rng = random.Random(seed)
+    payloads = [{"latitude": rng.uniform(-90, 90), "longitude": rng.uniform(-180, 180)} for _ in range(requests)]
+    client = TestClient(main.app)
+    # Every request converts a fresh point, so the result cache never hides the conversion
+    main.result_cache.maxsize = 0
+    results = {}
+    for name, enabled in (("off", False), ("on", True)):
+        main.conversion_log = ConversionLog(enabled=enabled)
+        start = time.perf_counter()
+        for payload in payloads:
+            client.post("/convert-coords", json=payload)
+        results[f"{name}_rps"] = requests / (time.perf_counter() - start)
+
+    # Bulk insert rate, measured on a log whose thread never gets to flush on its own
+    log = ConversionLog(enabled=True, flush_size=requests, flush_interval=3600, max_backlog=requests)
+    for payload in payloads:
+        log.record("coords", "global", payload["latitude"], payload["longitude"], "apple", "banana", "cherry")
+    start = time.perf_counter()
+    log.flush()
+    results["insert_rows_per_s"] = requests / (time.perf_counter() - start)
+    return results
+
+if __name__ == "__main__":
+    r = run()
+    print(
+        f"/convert-coords: log off {r['off_rps']:.0f} req/s, log on {r['on_rps']:.0f} req/s "
+        f"({r['on_rps'] / r['off_rps'] * 100:.0f}%); bulk inserts {r['insert_rows_per_s']:.0f} rows/s"
+    )
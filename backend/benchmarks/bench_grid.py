@@ -0,0 +1,76 @@
+"""
+Equirectangular versus equal-area grid (GRID=equal_area): cell indices, vocabulary size,
+word table memory, artifact size and index <-> cell mapping speed.
+
+Each grid runs in its own interpreter, because the grid (and the vocabulary size it needs)
+is fixed at import. Run from backend/:
+
+    python -m benchmarks.bench_grid
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_MEASURE = r"""
+import json, os, timeit
+import numpy as np
+import geocoding
+from geocoding import GRID, load_vocabulary, artifact_path, _read_source_words
+from word_table import compact_words
+from benchmarks.bench_memory import _measure
+
+words = load_vocabulary("global")
+encoded = "\n".join(words).encode("ascii")
+_, list_bytes = _measure(lambda: (lambda w: (w, {x: i for i, x in enumerate(w)}))(encoded.decode("ascii").split("\n")))
+_, compact_bytes = _measure(lambda: compact_words(encoded.decode("ascii").split("\n")))
+
+rng = np.random.default_rng(0)
+lats, lngs = rng.uniform(-90, 90, 1_000_000), rng.uniform(-180, 180, 1_000_000)
+number = 200_000
+cells = GRID.cells(lats, lngs)
+print(json.dumps({
+    "total_cells": GRID.total_cells,
+    "required_words": geocoding.REQUIRED_MIN_WORDS,
+    "synthetic_words": len(words) - len(_read_source_words("words.txt", "global")),
+    "list_bytes": list_bytes,
+    "compact_bytes": compact_bytes,
+    "artifact_bytes": os.path.getsize(artifact_path("global")),
+    "cell_ns": min(timeit.repeat(lambda: GRID.cell(51.5074, -0.1278), number=number, repeat=3)) / number * 1e9,
+    "center_ns": min(timeit.repeat(lambda: GRID.center(123456789012345), number=number, repeat=3)) / number * 1e9,
+    "cells_per_s": len(lats) / min(timeit.repeat(lambda: GRID.cells(lats, lngs), number=1, repeat=3)),
+    "centers_per_s": len(cells) / min(timeit.repeat(lambda: GRID.centers(cells), number=1, repeat=3)),
+}))
+"""
+
+def measure(kind: str) -> dict:
+    env = dict(os.environ, GRID=kind, VOCAB_ARTIFACT_DIR=tempfile.mkdtemp(prefix="w3w-grid-"))
+    output = subprocess.run([sys.executable, "-c", _MEASURE], cwd=BACKEND_DIR, env=env, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main() -> None:
+    results = {kind: measure(kind) for kind in ("equirectangular", "equal_area")}
+    rows = (
+        ("cell indices", "total_cells", "{:,.0f}"),
+        ("vocabulary words", "required_words", "{:,.0f}"),
+        ("synthetic words", "synthetic_words", "{:,.0f}"),
+        ("list+dict table MB", "list_bytes", "{:.2f}"),
+        ("compact table MB", "compact_bytes", "{:.2f}"),
+        ("artifact MB", "artifact_bytes", "{:.2f}"),
+        ("cell() ns", "cell_ns", "{:.0f}"),
+        ("center() ns", "center_ns", "{:.0f}"),
+        ("cells() rows/s", "cells_per_s", "{:,.0f}"),
+        ("centers() rows/s", "centers_per_s", "{:,.0f}"),
+    )
+    print(f"{'':22s} {'equirectangular':>20s} {'equal_area':>20s} {'change':>8s}")
+    for label, key, fmt in rows:
+        scale = 1e6 if key.endswith("bytes") else 1
+        old, new = results["equirectangular"][key] / scale, results["equal_area"][key] / scale
+        print(f"{label:22s} {fmt.format(old):>20s} {fmt.format(new):>20s} {new / old - 1:>+8.1%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Per-mode resident memory of the word tables: list[str] + dict versus CompactWordTable.
+
+Allocations are measured with tracemalloc while each representation is built from the
+already-loaded vocabulary, so only the table itself is counted. Lookup latency for both
+backends is reported alongside.
+
+Run from backend/:
+
+    python -m benchmarks.bench_memory
+"""
+import gc
+import timeit
+import tracemalloc
+
+from geocoding import load_vocabulary
+from word_table import compact_words
+
+def _measure(build):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+def run(modes=("global", "india")) -> dict:
+    """Returns {mode: {"list_bytes", "compact_bytes", "list_lookup_ns", "compact_lookup_ns"}}."""
+    results = {}
+    for mode in modes:
+        source = load_vocabulary(mode)
+        # Fresh str objects so the list representation is charged for its words
+        encoded = "\n".join(source).encode("ascii")
+
+        def build_list():
+            words = encoded.decode("ascii").split("\n")
+            return words, {w: i for i, w in enumerate(words)}
+
+        def build_compact():
+            return compact_words(encoded.decode("ascii").split("\n"))
+
+        (words, index), list_bytes = _measure(build_list)
+        (table, compact_index), compact_bytes = _measure(build_compact)
+
+        probe = source[len(source) // 2]
+        number = 200_000
+        results[mode] = {
+            "words": len(words),
+            "list_bytes": list_bytes,
+            "compact_bytes": compact_bytes,
+            "list_lookup_ns": min(timeit.repeat(lambda: index[probe], number=number, repeat=3)) / number * 1e9,
+            "compact_lookup_ns": min(timeit.repeat(lambda: compact_index[probe], number=number, repeat=3)) / number * 1e9,
+        }
+    return results
+
+if __name__ == "__main__":
+    for mode, r in run().items():
+        print(
+            f"{mode:6s} {r['words']} words: list+dict {r['list_bytes'] / 1e6:.2f} MB, "
+            f"compact {r['compact_bytes'] / 1e6:.2f} MB ({r['list_bytes'] / r['compact_bytes']:.1f}x smaller); "
+            f"lookup {r['list_lookup_ns']:.0f} ns vs {r['compact_lookup_ns']:.0f} ns"
+        )
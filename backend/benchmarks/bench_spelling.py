@@ -0,0 +1,63 @@
+"""
+Build time, memory and query latency of the per-mode spelling (deletion) index.
+
+Run from backend/:
+
+    python -m benchmarks.bench_spelling
+"""
+import gc
+import random
+import time
+import tracemalloc
+
+from geocoding import get_codec
+from spelling import SpellingIndex, suggest
+
+def _typo(word: str, rng: random.Random) -> str:
+    i = rng.randrange(len(word))
+    return word[:i] + rng.choice("abcdefghijklmnopqrstuvwxyz") + word[i + 1:]
+
+def run(modes=("global", "india"), queries: int = 200, seed: int = 0) -> dict:
+    """Returns {mode: {"build_s", "index_bytes", "suggest_p50_ms", "suggest_p99_ms"}}."""
+    rng = random.Random(seed)
+    results = {}
+    for mode in modes:
+        codec = get_codec(mode)
+        codec.word_bytes  # built lazily; keep it out of the index measurement
+
+        start = time.perf_counter()
+        SpellingIndex(codec)
+        build_s = time.perf_counter() - start
+
+        # Memory is measured on a second build; tracemalloc slows allocation-heavy code down
+        gc.collect()
+        tracemalloc.start()
+        index = SpellingIndex(codec)
+        index_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del index
+
+        # Warm the cached index used by suggest(), then time typo'd triples
+        suggest("a", "b", "c", mode)
+        words = list(codec.word_list)
+        latencies = []
+        for _ in range(queries):
+            triple = [_typo(w, rng) for w in rng.sample(words, 3)]
+            start = time.perf_counter()
+            suggest(*triple, mode=mode)
+            latencies.append(time.perf_counter() - start)
+        latencies.sort()
+        results[mode] = {
+            "build_s": build_s,
+            "index_bytes": index_bytes,
+            "suggest_p50_ms": latencies[len(latencies) // 2] * 1e3,
+            "suggest_p99_ms": latencies[int(len(latencies) * 0.99)] * 1e3,
+        }
+    return results
+
+if __name__ == "__main__":
+    for mode, r in run().items():
+        print(
+            f"{mode:6s} build {r['build_s']:.2f} s, index {r['index_bytes'] / 1e6:.1f} MB, "
+            f"suggest p50 {r['suggest_p50_ms']:.1f} ms p99 {r['suggest_p99_ms']:.1f} ms"
+        )
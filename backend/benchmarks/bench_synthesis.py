@@ -0,0 +1,43 @@
+"""
+Synthetic word generation (synthesis.py) per mode and synthesis style.
+
+For each mode's curated words and each style (the default and INDIA_ONLY_WORDS), times topping
+the vocabulary up to REQUIRED_MIN_WORDS as build_vocabulary does, producing only its last 100
+words with start=, and generating the style's whole candidate space. Run from backend/:
+
+    python -m benchmarks.bench_synthesis
+"""
+import argparse
+import time
+
+from geocoding import REQUIRED_MIN_WORDS, _read_source_words
+from synthesis import GLOBAL_SPACE, INDIA_SPACE, generate
+
+STYLES = (("default", GLOBAL_SPACE), ("india_only", INDIA_SPACE))
+
+def _best(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for mode in ("global", "india"):
+        existing = set(_read_source_words("words.txt", mode))
+        for style, space in STYLES:
+            count = len(generate(space, REQUIRED_MIN_WORDS, existing))
+            full = _best(lambda: generate(space, REQUIRED_MIN_WORDS, existing), args.repeat)
+            tail = _best(lambda: generate(space, REQUIRED_MIN_WORDS, existing, start=count - 100), args.repeat)
+            print(f"{mode:6s} {style:10s} {count:>7,} words {full * 1e3:7.1f} ms   last 100 only {tail * 1e3:6.1f} ms")
+    for style, space in STYLES:
+        seconds = _best(lambda: generate(space, space.total, ()), 1)
+        print(f"{style:10s} whole space: {space.total:,} candidates in {seconds * 1e3:.1f} ms")
+
+if __name__ == "__main__":
+    main()
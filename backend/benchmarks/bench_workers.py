@@ -0,0 +1,130 @@
+"""
+Memory and startup of multi-worker deployments per WORD_TABLE_BACKEND.
+
+For each backend, starts `uvicorn main:app --workers WORKERS` (all workers sharing one
+VOCAB_ARTIFACT_DIR), sends a batch to every worker so the batch word arrays exist, then sums
+the proportional set size (PSS, shared pages split between the processes that map them) of
+the server's processes from /proc. Separately times loading the word tables in a fresh
+interpreter: the per-worker startup cost. Linux only. Run from backend/:
+
+    python -m benchmarks.bench_workers
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.load_offload import _free_port
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKENDS = ("list", "compact", "shared")
+
+# Imports the modules geocoding depends on first, so only the word table work is timed
+_STARTUP = r"""
+import time, numpy, grid, metrics, word_table
+start = time.perf_counter()
+import geocoding
+codec = geocoding.get_codec("global")
+codec.word_array, codec.word_bytes
+print(time.perf_counter() - start)
+"""
+
+def _descendants(pid: int) -> list:
+    children = {}
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+            children.setdefault(ppid, []).append(int(entry))
+    found, pending = [], [pid]
+    while pending:
+        current = pending.pop()
+        found.append(current)
+        pending.extend(children.get(current, []))
+    return found
+
+def _pss_bytes(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+def startup_seconds(backend: str, artifact_dir: str, repeat: int = 3) -> float:
+    env = dict(os.environ, WORD_TABLE_BACKEND=backend, VOCAB_ARTIFACT_DIR=artifact_dir)
+    times = [
+        float(subprocess.run([sys.executable, "-c", _STARTUP], cwd=BACKEND_DIR, env=env, check=True,
+                             capture_output=True, text=True).stdout.split()[-1])
+        for _ in range(repeat)
+    ]
+    return min(times)
+
+def server_pss(backend: str, workers: int, artifact_dir: str) -> tuple:
+    """(total PSS of the server's processes, number of processes) with every worker warmed up."""
+    port = _free_port()
+    env = dict(
+        os.environ,
+        WORD_TABLE_BACKEND=backend,
+        VOCAB_ARTIFACT_DIR=artifact_dir,
+        PROCESS_POOL_WORKERS="0",
+        CONVERSION_LOG="0",
+        DATABASE_URL="sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="w3w-workers-"), "bench.db"),
+    )
+    # Create the schema up front; workers migrating a fresh SQLite file at once can collide
+    subprocess.run([sys.executable, "-c", "import database, models; database.migrate()"], cwd=BACKEND_DIR, env=env, check=True)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--workers", str(workers),
+         "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 120
+        while True:
+            try:
+                httpx.get(base + "/", timeout=1)
+                break
+            except httpx.HTTPError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError("server did not start")
+                time.sleep(0.2)
+        # Connections are spread over the workers; fresh ones reach all of them
+        items = [{"latitude": i / 10, "longitude": i / 5} for i in range(100)]
+        for _ in range(workers * 10):
+            with httpx.Client(base_url=base, timeout=30) as client:
+                client.post("/convert-coords/batch", json={"items": items}).raise_for_status()
+                client.post("/convert-words/batch", json={"items": [
+                    {"word1": "apple", "word2": "banana", "word3": "cherry"}
+                ]}).raise_for_status()
+        pids = _descendants(process.pid)
+        return sum(_pss_bytes(pid) for pid in pids), len(pids)
+    finally:
+        process.terminate()
+        process.wait()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    artifact_dir = tempfile.mkdtemp(prefix="w3w-workers-")
+    print(f"{'backend':10s} {'startup ms':>12s} {f'PSS MB ({args.workers} workers)':>22s} {'per process MB':>15s}")
+    for backend in BACKENDS:
+        # The first start builds the artifact (and, for shared, the table file); time later ones
+        startup_seconds(backend, artifact_dir, repeat=1)
+        startup = startup_seconds(backend, artifact_dir)
+        pss, processes = server_pss(backend, args.workers, artifact_dir)
+        print(f"{backend:10s} {startup * 1e3:>12.1f} {pss / 1e6:>22.1f} {pss / 1e6 / processes:>15.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Load test: single-conversion latency while large batch jobs are running, with the process
+pool disabled (PROCESS_POOL_WORKERS=0, batches run on the server's threadpool) and enabled.
+
+Each configuration starts its own uvicorn server, measures /convert-coords latency on its
+own, then again while BATCH_CLIENTS clients keep posting 10000-item batches. Run from backend/:
+
+    python -m benchmarks.load_offload
+"""
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+BATCH_ITEMS = 10000
+BATCH_CLIENTS = 2
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def _start_server(workers: int):
+    port = _free_port()
+    env = dict(
+        os.environ,
+        PROCESS_POOL_WORKERS=str(workers),
+        CONVERSION_LOG="0",
+        DATABASE_URL="sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="w3w-load-"), "load.db"),
+    )
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    base = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(base + "/", timeout=1)
+            return process, base
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError("server did not start")
+
+async def _single_latencies(client: httpx.AsyncClient, count: int, rng: random.Random):
+    latencies = []
+    for _ in range(count):
+        payload = {"latitude": rng.uniform(-90, 90), "longitude": rng.uniform(-180, 180)}
+        start = time.perf_counter()
+        response = await client.post("/convert-coords", json=payload)
+        latencies.append(time.perf_counter() - start)
+        response.raise_for_status()
+        await asyncio.sleep(0.005)
+    latencies.sort()
+    return latencies[len(latencies) // 2] * 1e3, latencies[int(len(latencies) * 0.99)] * 1e3
+
+async def _batch_load(client: httpx.AsyncClient, stop: asyncio.Event, rng: random.Random, counts: dict):
+    items = [{"latitude": rng.uniform(-90, 90), "longitude": rng.uniform(-180, 180)} for _ in range(BATCH_ITEMS)]
+    # Encoded once, so the load generator does not stall the latency probe sharing its event loop
+    body = json.dumps({"items": items}).encode()
+    headers = {"content-type": "application/json"}
+    while not stop.is_set():
+        response = await client.post("/convert-coords/batch", content=body, headers=headers, timeout=120)
+        counts[response.status_code] = counts.get(response.status_code, 0) + 1
+
+async def _measure(base: str, singles: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    async with httpx.AsyncClient(base_url=base, timeout=30) as client:
+        idle_p50, idle_p99 = await _single_latencies(client, singles, rng)
+        stop = asyncio.Event()
+        counts = {}
+        loaders = [asyncio.create_task(_batch_load(client, stop, rng, counts)) for _ in range(BATCH_CLIENTS)]
+        await asyncio.sleep(0.5)
+        busy_p50, busy_p99 = await _single_latencies(client, singles, rng)
+        stop.set()
+        await asyncio.gather(*loaders)
+    return {"idle_p50_ms": idle_p50, "idle_p99_ms": idle_p99,
+            "busy_p50_ms": busy_p50, "busy_p99_ms": busy_p99, "batch_status": counts}
+
+def run(singles: int = 300, seed: int = 0) -> dict:
+    """Returns {"inline": {...}, "pool": {...}} latency summaries."""
+    results = {}
+    for name, workers in (("inline", 0), ("pool", min(4, os.cpu_count() or 1))):
+        process, base = _start_server(workers)
+        try:
+            results[name] = asyncio.run(_measure(base, singles, seed))
+        finally:
+            process.terminate()
+            process.wait()
+    return results
+
+if __name__ == "__main__":
+    for name, r in run().items():
+        print(
+            f"{name:6s} single p50/p99 idle {r['idle_p50_ms']:.1f}/{r['idle_p99_ms']:.1f} ms, "
+            f"under batch load {r['busy_p50_ms']:.1f}/{r['busy_p99_ms']:.1f} ms; batch responses {r['batch_status']}"
+        )
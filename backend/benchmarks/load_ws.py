@@ -0,0 +1,107 @@
+"""
+Load test of the /ws conversion channel against a local uvicorn server.
+
+Measures how fast connections are opened, how many messages per second CLIENTS connections
+get answered when each waits for its reply (request/response), how a client that fires
+updates without waiting (a map drag) is coalesced, and, for comparison, /convert-coords
+requests per second over keep-alive HTTP. Needs the websockets package. Run from backend/:
+
+    python -m benchmarks.load_ws
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import httpx
+import websockets
+
+from benchmarks.load_offload import _start_server
+
+CLIENTS = 20
+
+def _coords_message(i: int, rng: random.Random) -> str:
+    return json.dumps({"id": i, "type": "coords", "latitude": rng.uniform(-90, 90), "longitude": rng.uniform(-180, 180)})
+
+async def bench_connections(url: str, count: int) -> float:
+    """Connections opened, used for one conversion and closed per second, CLIENTS at a time."""
+    rng = random.Random(0)
+
+    async def connect_many(n):
+        for i in range(n):
+            async with websockets.connect(url) as ws:
+                await ws.send(_coords_message(i, rng))
+                await ws.recv()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(connect_many(count // CLIENTS) for _ in range(CLIENTS)))
+    return count // CLIENTS * CLIENTS / (time.perf_counter() - start)
+
+async def bench_request_response(url: str, messages: int) -> float:
+    """Answered messages per second, CLIENTS connections each sending one message at a time."""
+    async def client(seed):
+        rng = random.Random(seed)
+        async with websockets.connect(url) as ws:
+            for i in range(messages // CLIENTS):
+                await ws.send(_coords_message(i, rng))
+                await ws.recv()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(seed) for seed in range(CLIENTS)))
+    return messages // CLIENTS * CLIENTS / (time.perf_counter() - start)
+
+async def bench_drag(url: str, messages: int) -> tuple:
+    """One client firing updates without waiting: (messages sent per second, fraction answered)."""
+    rng = random.Random(1)
+    async with websockets.connect(url) as ws:
+        start = time.perf_counter()
+        for i in range(messages):
+            await ws.send(_coords_message(i, rng))
+        sent_s = time.perf_counter() - start
+        answered = 0
+        while True:
+            answered += 1
+            if json.loads(await ws.recv())["id"] == messages - 1:
+                break
+    return messages / sent_s, answered / messages
+
+async def bench_http(base: str, requests: int) -> float:
+    """/convert-coords requests per second over CLIENTS keep-alive connections, for comparison."""
+    async def client(seed, http):
+        rng = random.Random(seed)
+        for _ in range(requests // CLIENTS):
+            response = await http.post("/convert-coords", json={
+                "latitude": rng.uniform(-90, 90), "longitude": rng.uniform(-180, 180),
+            })
+            response.raise_for_status()
+
+    limits = httpx.Limits(max_connections=CLIENTS)
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=30) as http:
+        start = time.perf_counter()
+        await asyncio.gather(*(client(seed, http) for seed in range(CLIENTS)))
+        return requests // CLIENTS * CLIENTS / (time.perf_counter() - start)
+
+async def _run(base: str, connections: int, messages: int) -> None:
+    url = base.replace("http://", "ws://") + "/ws"
+    print(f"connections/s (connect, convert, close): {await bench_connections(url, connections):,.0f}")
+    print(f"ws messages/s ({CLIENTS} clients, request/response): {await bench_request_response(url, messages):,.0f}")
+    sent_rate, answered = await bench_drag(url, messages)
+    print(f"ws drag: {sent_rate:,.0f} updates/s sent, {answered:.1%} answered (rest coalesced)")
+    print(f"http requests/s ({CLIENTS} keep-alive clients): {await bench_http(base, messages):,.0f}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--connections", type=int, default=1000)
+    parser.add_argument("--messages", type=int, default=20000)
+    args = parser.parse_args()
+
+    process, base = _start_server(workers=0)
+    try:
+        asyncio.run(_run(base, args.connections, args.messages))
+    finally:
+        process.terminate()
+        process.wait()
+
+if __name__ == "__main__":
+    main()
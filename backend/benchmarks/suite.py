@@ -0,0 +1,185 @@
+"""
+Reproducible benchmark suite: startup, vocabulary synthesis, single-call encode/decode,
+batch throughput and in-process ASGI request throughput.
+
+Results are written as JSON ({"meta": {...}, "metrics": {name: {"value", "unit", "better"}}})
+and can be checked against a stored baseline; the run fails (exit status 1) when any metric
+is worse than the baseline by more than --tolerance. Run from backend/:
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --compare benchmarks/baseline.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from typing import Optional
+
+# The ASGI benchmark imports the app, which migrates and logs into its database
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="w3w-bench-"), "bench.db"))
+
+import httpx
+import numpy as np
+
+import geocoding
+from geocoding import REQUIRED_MIN_WORDS, build_vocabulary, generate_synthetic_words
+
+MODES = ("global", "india")
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _metric(value: float, unit: str, better: str) -> dict:
+    return {"value": value, "unit": unit, "better": better}
+
+def bench_import(mode: Optional[str], repeat: int = 3) -> float:
+    """
+    Seconds for a fresh interpreter to import geocoding and load the mode's codec; with mode
+    None, to import it alone (which loads no vocabulary).
+    """
+    load = f"geocoding.get_codec({mode!r}); " if mode else ""
+    code = f"import time; start = time.perf_counter(); import geocoding; {load}print(time.perf_counter() - start)"
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, check=True,
+                                capture_output=True, text=True).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return min(timings)
+
+def bench_vocabulary_build(mode: str, repeat: int = 3) -> float:
+    """Seconds to build the mode's vocabulary from the source lists (what a stale artifact costs)."""
+    return min(timeit.repeat(lambda: build_vocabulary(mode), number=1, repeat=repeat))
+
+def bench_synthesis(mode: str, repeat: int = 3) -> float:
+    """Seconds to synthesize a full REQUIRED_MIN_WORDS vocabulary with no curated words to build on."""
+    return min(timeit.repeat(
+        lambda: generate_synthetic_words(REQUIRED_MIN_WORDS, set(), mode), number=1, repeat=repeat,
+    ))
+
+def bench_single(mode: str, number: int) -> tuple:
+    """Nanoseconds per lat_lng_to_words and words_to_lat_lng call."""
+    lat, lng = 51.5074, -0.1278
+    words = geocoding.lat_lng_to_words(lat, lng, mode)
+    encode = min(timeit.repeat(lambda: geocoding.lat_lng_to_words(lat, lng, mode), number=number, repeat=3))
+    decode = min(timeit.repeat(lambda: geocoding.words_to_lat_lng(*words, mode), number=number, repeat=3))
+    return encode / number * 1e9, decode / number * 1e9
+
+def bench_batch(mode: str, rows: int, seed: int) -> tuple:
+    """Rows per second through lat_lng_to_words_batch and words_to_lat_lng_batch."""
+    rng = np.random.default_rng(seed)
+    lats = rng.uniform(-90, 90, rows)
+    lngs = rng.uniform(-180, 180, rows)
+    start = time.perf_counter()
+    words, _ = geocoding.lat_lng_to_words_batch(lats, lngs, mode, return_words=True)
+    encode_s = time.perf_counter() - start
+    start = time.perf_counter()
+    geocoding.words_to_lat_lng_batch(words[:, 0], words[:, 1], words[:, 2], mode)
+    decode_s = time.perf_counter() - start
+    return rows / encode_s, rows / decode_s
+
+async def _http_throughput(app, path: str, payloads: list) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post(path, json=payloads[0])
+        start = time.perf_counter()
+        for payload in payloads:
+            response = await client.post(path, json=payload)
+            response.raise_for_status()
+        return len(payloads) / (time.perf_counter() - start)
+
+def bench_http(requests: int, seed: int) -> tuple:
+    """Requests per second for /convert-coords and /convert-words through the ASGI app in-process."""
+    import main
+
+    rng = random.Random(seed)
+    points = [(rng.uniform(-90, 90), rng.uniform(-180, 180)) for _ in range(requests)]
+    coords = [{"latitude": lat, "longitude": lng} for lat, lng in points]
+    words = [dict(zip(("word1", "word2", "word3"), geocoding.lat_lng_to_words(lat, lng))) for lat, lng in points]
+    # Distinct points, so every request misses the result cache and measures the full path
+    coords_rps = asyncio.run(_http_throughput(main.app, "/convert-coords", coords))
+    words_rps = asyncio.run(_http_throughput(main.app, "/convert-words", words))
+    return coords_rps, words_rps
+
+def run(quick: bool = False, seed: int = 0) -> dict:
+    number = 20_000 if quick else 200_000
+    rows = 100_000 if quick else 1_000_000
+    requests = 500 if quick else 3000
+    repeat = 1 if quick else 3
+
+    metrics = {"import_s": _metric(bench_import(None, repeat), "s", "lower")}
+    for mode in MODES:
+        metrics[f"import_{mode}_s"] = _metric(bench_import(mode, repeat), "s", "lower")
+        metrics[f"vocabulary_build_{mode}_s"] = _metric(bench_vocabulary_build(mode, repeat), "s", "lower")
+        metrics[f"synthesis_{mode}_s"] = _metric(bench_synthesis(mode, repeat), "s", "lower")
+        encode_ns, decode_ns = bench_single(mode, number)
+        metrics[f"encode_{mode}_ns"] = _metric(encode_ns, "ns/call", "lower")
+        metrics[f"decode_{mode}_ns"] = _metric(decode_ns, "ns/call", "lower")
+        encode_rps, decode_rps = bench_batch(mode, rows, seed)
+        metrics[f"batch_encode_{mode}_rows_per_s"] = _metric(encode_rps, "rows/s", "higher")
+        metrics[f"batch_decode_{mode}_rows_per_s"] = _metric(decode_rps, "rows/s", "higher")
+    coords_rps, words_rps = bench_http(requests, seed)
+    metrics["http_convert_coords_req_per_s"] = _metric(coords_rps, "req/s", "higher")
+    metrics["http_convert_words_req_per_s"] = _metric(words_rps, "req/s", "higher")
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "quick": quick,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "metrics": metrics,
+    }
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Metrics worse than the baseline by more than tolerance, as (name, baseline, current, change)."""
+    regressions = []
+    for name, current in results["metrics"].items():
+        base = baseline.get("metrics", {}).get(name)
+        if base is None or not base["value"]:
+            continue
+        change = current["value"] / base["value"] - 1
+        worse = change > tolerance if current["better"] == "lower" else change < -tolerance
+        if worse:
+            regressions.append((name, base["value"], current["value"], change))
+    return regressions
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="fail if results regress against this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed relative regression per metric (default: 0.25)")
+    parser.add_argument("--quick", action="store_true", help="smaller workloads, for smoke runs")
+    args = parser.parse_args()
+
+    results = run(quick=args.quick)
+    for name, metric in results["metrics"].items():
+        print(f"{name:40s} {metric['value']:>14,.3f} {metric['unit']}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("meta", {}).get("quick") != results["meta"]["quick"]:
+            print("warning: baseline and this run use different workload sizes (--quick)", file=sys.stderr)
+        regressions = compare(results, baseline, args.tolerance)
+        for name, base, current, change in regressions:
+            print(f"REGRESSION {name}: {base:,.3f} -> {current:,.3f} ({change:+.0%})", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.compare}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
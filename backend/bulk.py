@@ -0,0 +1,216 @@
+"""
+Offline bulk conversion of CSV and Parquet files.
+
+The input is read in chunks of CHUNK_ROWS rows; only the columns being converted are sent to
+a pool of worker processes, which run the vectorized batch functions. At most
+IN_FLIGHT_PER_WORKER chunks per worker are outstanding at any time and results are written
+in input order as soon as they arrive, so memory stays bounded by the chunk size whatever the
+file size. Output has the input's columns plus the converted ones and an "error" column, in
+the same format as the input.
+
+Used through the geocoding CLI:
+
+    python geocoding.py convert addresses.csv out.csv --to words
+    python geocoding.py convert drops.parquet out.parquet --to coords --mode india
+"""
+import csv
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Support both package import (backend.*) and direct module import during tests
+try:
+    from .geocoding import lat_lng_to_words_batch, warmup, words_to_lat_lng_batch
+except ImportError:
+    from geocoding import lat_lng_to_words_batch, warmup, words_to_lat_lng_batch
+
+CHUNK_ROWS = 50_000
+IN_FLIGHT_PER_WORKER = 2
+
+COORD_COLUMNS = ("latitude", "longitude")
+WORD_COLUMNS = ("word1", "word2", "word3")
+
+def _to_float(values: Sequence) -> np.ndarray:
+    """Column values (str from CSV, numbers or None from Parquet) as float64; unparsable -> NaN."""
+    try:
+        return np.array([np.nan if v is None or v == "" else v for v in values], dtype=np.float64)
+    except ValueError:
+        result = np.empty(len(values), dtype=np.float64)
+        for i, v in enumerate(values):
+            try:
+                result[i] = float(v)
+            except (TypeError, ValueError):
+                result[i] = np.nan
+        return result
+
+def convert_columns(direction: str, mode: str, columns: List[list]) -> Tuple[List[list], List[Optional[str]]]:
+    """
+    Convert one chunk. For direction "words" the input columns are latitude and longitude and
+    the output columns word1..word3; for "coords" the reverse. Returns the output columns and a
+    per-row error (None when the row converted).
+    """
+    if direction == "words":
+        lats, lngs = _to_float(columns[0]), _to_float(columns[1])
+        words, valid = lat_lng_to_words_batch(lats, lngs, mode, return_words=True)
+        output = [words[:, k].tolist() for k in range(3)]
+        error = "Invalid coordinates"
+    else:
+        w1, w2, w3 = ([("" if v is None else str(v)) for v in column] for column in columns)
+        lats, lngs, valid = words_to_lat_lng_batch(w1, w2, w3, mode)
+        output = [
+            [float(x) if ok else None for x, ok in zip(lats.tolist(), valid.tolist())],
+            [float(x) if ok else None for x, ok in zip(lngs.tolist(), valid.tolist())],
+        ]
+        error = "Invalid words"
+    return output, [None if ok else error for ok in valid.tolist()]
+
+def _warm(mode: str) -> None:
+    """Worker initializer: load the mode's codec and batch arrays before the first chunk."""
+    warmup((mode,))
+
+class _CSVFormat:
+    def __init__(self, input_path: str, output_path: str, chunk_rows: int):
+        self._in = open(input_path, newline="", encoding="utf-8")
+        self._reader = csv.reader(self._in)
+        self.columns = next(self._reader, None)
+        if self.columns is None:
+            raise ValueError(f"{input_path} is empty")
+        self._out = open(output_path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._out)
+        self.chunk_rows = chunk_rows
+
+    def chunks(self) -> Iterator[Tuple[list, List[list]]]:
+        """Yields (rows, columns) per chunk; rows is whatever write() needs to rebuild the output."""
+        width = len(self.columns)
+        while True:
+            rows = [row for _, row in zip(range(self.chunk_rows), self._reader)]
+            if not rows:
+                return
+            # Short rows are padded so a missing trailing field is converted as empty
+            rows = [row + [""] * (width - len(row)) if len(row) < width else row for row in rows]
+            yield rows, [list(column) for column in zip(*rows)]
+
+    def write_header(self, new_columns: Sequence[str]) -> None:
+        self._writer.writerow(list(self.columns) + list(new_columns))
+
+    def write(self, rows: list, output: List[list], errors: List[Optional[str]]) -> None:
+        self._writer.writerows(
+            row + ["" if v is None else v for v in values] + [error or ""]
+            for row, *values, error in zip(rows, *output, errors)
+        )
+
+    def close(self) -> None:
+        self._in.close()
+        self._out.close()
+
+class _ParquetFormat:
+    def __init__(self, input_path: str, output_path: str, chunk_rows: int):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Parquet input needs pyarrow: pip install pyarrow")
+        self._pa = pa
+        self._pq = pq
+        self._file = pq.ParquetFile(input_path)
+        self.columns = self._file.schema_arrow.names
+        self._output_path = output_path
+        self._writer = None
+        self.chunk_rows = chunk_rows
+
+    def chunks(self) -> Iterator[Tuple[object, List[list]]]:
+        for batch in self._file.iter_batches(batch_size=self.chunk_rows):
+            yield batch, [column.to_pylist() for column in batch.columns]
+
+    def write_header(self, new_columns: Sequence[str]) -> None:
+        self._new_columns = list(new_columns)
+
+    def write(self, batch, output: List[list], errors: List[Optional[str]]) -> None:
+        pa = self._pa
+        table = pa.Table.from_batches([batch])
+        for name, values in zip(self._new_columns, output + [errors]):
+            column_type = pa.float64() if name in COORD_COLUMNS else pa.string()
+            table = table.append_column(name, pa.array(values, type=column_type))
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self._output_path, table.schema)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+def _open(input_path: str, output_path: str, chunk_rows: int):
+    if input_path.lower().endswith((".parquet", ".pq")):
+        return _ParquetFormat(input_path, output_path, chunk_rows)
+    return _CSVFormat(input_path, output_path, chunk_rows)
+
+def _print_progress(rows: int, elapsed: float) -> None:
+    rate = rows / elapsed if elapsed else 0.0
+    print(f"\r{rows:,} rows, {rate:,.0f} rows/s", end="", file=sys.stderr, flush=True)
+
+def convert_file(input_path: str, output_path: str, to: str = "words", mode: str = "global",
+                 input_columns: Optional[Sequence[str]] = None, workers: Optional[int] = None,
+                 chunk_rows: int = CHUNK_ROWS,
+                 progress: Optional[Callable[[int, float], None]] = _print_progress) -> dict:
+    """
+    Convert a CSV or Parquet file: to="words" reads latitude/longitude columns and adds
+    word1..word3; to="coords" reads word1..word3 and adds latitude/longitude. input_columns
+    overrides the names of the columns read. workers=0 converts in this process.
+    Returns {"rows", "errors", "seconds"}.
+    """
+    if to not in ("words", "coords"):
+        raise ValueError("to must be 'words' or 'coords'")
+    wanted = list(input_columns or (COORD_COLUMNS if to == "words" else WORD_COLUMNS))
+    new_columns = list(WORD_COLUMNS if to == "words" else COORD_COLUMNS) + ["error"]
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    source = _open(input_path, output_path, chunk_rows)
+    pool = None
+    start = time.perf_counter()
+    rows_done = errors = 0
+    try:
+        missing = [name for name in wanted if name not in source.columns]
+        if missing:
+            raise ValueError(f"Input has no column(s) {', '.join(missing)}; columns are {', '.join(source.columns)}")
+        positions = [source.columns.index(name) for name in wanted]
+        source.write_header(new_columns)
+
+        if workers > 0:
+            pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm, initargs=(mode,),
+            )
+        pending = deque()
+
+        def drain_one():
+            nonlocal rows_done, errors
+            rows, result = pending.popleft()
+            output, row_errors = result.result() if pool is not None else result
+            source.write(rows, output, row_errors)
+            rows_done += len(row_errors)
+            errors += sum(e is not None for e in row_errors)
+            if progress is not None:
+                progress(rows_done, time.perf_counter() - start)
+
+        for rows, columns in source.chunks():
+            selected = [columns[p] for p in positions]
+            if pool is None:
+                pending.append((rows, convert_columns(to, mode, selected)))
+            else:
+                pending.append((rows, pool.submit(convert_columns, to, mode, selected)))
+            while len(pending) >= max(1, workers) * IN_FLIGHT_PER_WORKER:
+                drain_one()
+        while pending:
+            drain_one()
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        source.close()
+    return {"rows": rows_done, "errors": errors, "seconds": time.perf_counter() - start}
@@ -0,0 +1,110 @@
+"""
+Bounded result cache for the single-conversion endpoints.
+
+Traffic is skewed towards a small set of repeatedly converted places, so /convert-coords and
+/convert-words keep their results in an in-process LRU: coordinates are keyed by
+("coords", mode, cell index), so every point inside a cell shares one entry, and word triples
+by ("words", mode, word1, word2, word3) after lowercasing. A shared backend (e.g. a Redis or
+memcached client) can sit behind the local LRU; it is consulted on a local miss and written
+through on every store. InMemorySharedBackend is the local stand-in used in tests.
+"""
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+class SharedCacheBackend(ABC):
+    """Interface for a cache shared between processes. Values must round-trip unchanged."""
+
+    @abstractmethod
+    def get(self, key: Hashable) -> Optional[Any]:
+        """The value stored under key, or None."""
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key; the backend applies its own eviction policy."""
+
+class InMemorySharedBackend(SharedCacheBackend):
+    """Dict-backed SharedCacheBackend for tests and single-process deployments."""
+
+    def __init__(self):
+        self._data: Dict[Hashable, Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            return self._data.get(key)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+
+class LRUCache:
+    """Thread-safe LRU cache with hit, miss and eviction counters. maxsize 0 disables it."""
+
+    def __init__(self, maxsize: int, backend: Optional[SharedCacheBackend] = None):
+        if maxsize < 0:
+            raise ValueError("Cache size must be non-negative")
+        self.maxsize = maxsize
+        self.backend = backend
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """The cached value for key (refreshing its recency), or None on a miss."""
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+        if self.backend is not None:
+            value = self.backend.get(key)
+            if value is not None:
+                with self._lock:
+                    self.shared_hits += 1
+                self._store(key, value)
+                return value
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Cache value under key locally and in the shared backend."""
+        self._store(key, value)
+        if self.backend is not None:
+            self.backend.set(key, value)
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        if self.maxsize == 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every local entry and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.shared_hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        """Counters for sizing the cache; hit_rate counts shared-backend hits as hits."""
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits + self.shared_hits) / lookups if lookups else 0.0,
+            }
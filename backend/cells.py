@@ -0,0 +1,191 @@
+"""
+Integer cell IDs for spatial joins and group-bys.
+
+A cell ID is the grid index lat_lng_to_words encodes: cells are numbered row by row, south to
+north and west to east within a row (see grid.py). Bucketing points by cell ID, or joining on
+it, needs neither the word strings nor the cell coordinates.
+
+Cells roll up into square blocks: the level-L block of a cell holds the 2**L x 2**L cells whose
+row and column agree with it above the lowest L bits. A block is identified by the ID of its
+south-west cell, so block IDs are cell IDs too and cell_parent / cell_children are integer
+operations. The level is not encoded in the ID; pass it along with block IDs.
+"""
+import operator
+from typing import List, Tuple
+
+import numpy as np
+
+# Support both package import (backend.*) and direct module import during tests
+try:
+    from . import geocoding
+except ImportError:
+    import geocoding
+
+def _row_col(cell_id: int) -> Tuple[int, int]:
+    grid = geocoding.GRID
+    cell_id = operator.index(cell_id)
+    if not 0 <= cell_id < grid.total_cells:
+        raise ValueError(f"Cell ID must be between 0 and {grid.total_cells - 1}")
+    return grid.row_col(cell_id)
+
+def _check_level(level: int, minimum: int = 0) -> int:
+    max_level = geocoding.GRID.max_level
+    if not minimum <= level <= max_level:
+        raise ValueError(f"Level must be between {minimum} and {max_level}")
+    return level
+
+def cell_id(lat: float, lng: float) -> int:
+    """ID of the cell containing a coordinate; the cell lat_lng_to_words encodes."""
+    return geocoding.lat_lng_to_cell(lat, lng)
+
+def cell_ids(lats, lngs) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized cell_id over arrays of coordinates. Returns (ids, valid): int64 IDs, -1 for
+    out-of-range or NaN rows, which are flagged False in `valid` instead of raising.
+    """
+    grid = geocoding.GRID
+    lats = np.asarray(lats, dtype=np.float64)
+    lngs = np.asarray(lngs, dtype=np.float64)
+    if lats.shape != lngs.shape:
+        raise ValueError("Latitude and longitude arrays must have the same shape")
+    valid = (lats >= -90) & (lats <= 90) & (lngs >= -180) & (lngs <= 180)
+    ids = grid.cells(np.where(valid, lats, 0.0).ravel(), np.where(valid, lngs, 0.0).ravel())
+    ids[~valid.ravel()] = -1
+    return ids.reshape(lats.shape), valid
+
+def cell_bounds(cell_id: int, level: int = 0) -> Tuple[float, float, float, float]:
+    """
+    (south, west, north, east) of a cell, or with level > 0 of the level-`level` block
+    starting at it (clipped at the north edge and at the end of the row).
+    """
+    grid = geocoding.GRID
+    row, column = _row_col(cell_id)
+    size = 1 << _check_level(level)
+    _, columns = grid.row_layout(row)
+    south = (row / grid.rows) * 180 - 90
+    west = (column / columns) * 360 - 180
+    return (
+        south,
+        west,
+        south + min(size, grid.rows - row) * (180 / grid.rows),
+        west + min(size, columns - column) * (360 / columns),
+    )
+
+def cell_bounds_batch(ids, level: int = 0) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Vectorized cell_bounds; (south, west, north, east) arrays, NaN for out-of-range IDs."""
+    grid = geocoding.GRID
+    ids = np.asarray(ids, dtype=np.int64)
+    size = 1 << _check_level(level)
+    valid = (ids >= 0) & (ids < grid.total_cells)
+    rows, columns = grid.rows_cols(np.where(valid, ids, 0))
+    _, row_columns = grid.rows_layout(rows)
+    south = (rows / grid.rows) * 180 - 90
+    west = (columns / row_columns) * 360 - 180
+    north = south + np.minimum(size, grid.rows - rows) * (180 / grid.rows)
+    east = west + np.minimum(size, row_columns - columns) * (360 / row_columns)
+    for bound in (south, west, north, east):
+        bound[~valid] = np.nan
+    return south, west, north, east
+
+def cell_id_to_words(cell_id: int, mode: str = "global") -> Tuple[str, str, str]:
+    """The three words of a cell."""
+    _row_col(cell_id)
+    return geocoding.cell_to_words(operator.index(cell_id), mode)
+
+def cell_ids_to_words(ids, mode: str = "global") -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized cell_id_to_words. Returns (words, valid): a unicode array of shape
+    ids.shape + (3,), with empty words for out-of-range IDs.
+    """
+    grid = geocoding.GRID
+    codec = geocoding.get_codec(mode)
+    ids = np.asarray(ids, dtype=np.int64)
+    valid = (ids >= 0) & (ids < grid.total_cells)
+    flat_valid = valid.ravel()
+    word_array = codec.word_array
+    words = np.empty(flat_valid.shape + (3,), dtype=word_array.dtype)
+    for column, indices in enumerate(codec.encode_index_batch(np.where(flat_valid, ids.ravel(), 0))):
+        words[:, column] = np.where(flat_valid, word_array[indices], "")
+    return words.reshape(ids.shape + (3,)), valid
+
+def words_to_cell_id(word1: str, word2: str, word3: str, mode: str = "global") -> int:
+    """
+    ID of the cell three words address. Raises ValueError like words_to_lat_lng, and also for
+    valid word triples past the last cell (which words_to_lat_lng clamps to the poles).
+    """
+    grid_index = geocoding.get_codec(mode).decode_cell(word1, word2, word3)
+    if grid_index >= geocoding.GRID.total_cells:
+        raise ValueError("Words do not address a grid cell")
+    return grid_index
+
+def words_to_cell_ids(words1, words2, words3, mode: str = "global") -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized words_to_cell_id over columns of words (lists, NumPy arrays, pandas Series or
+    Arrow arrays). Returns (ids, valid); rows words_to_cell_id would reject get -1.
+    """
+    ids, valid = geocoding.get_codec(mode).decode_cell_batch(words1, words2, words3)
+    valid &= ids < geocoding.GRID.total_cells
+    ids[~valid] = -1
+    return ids, valid
+
+def cell_neighbours(cell_id: int) -> List[int]:
+    """
+    IDs of the cells sharing an edge or a corner with a cell (8-connected), south to north and
+    west to east. Rows wrap around the antimeridian; cells in the first or last row have no
+    neighbours beyond the pole. With GRID=equal_area, a row with a different column count
+    contributes every cell whose longitude span touches the cell's, which may be more or
+    fewer than three.
+    """
+    grid = geocoding.GRID
+    row, column = _row_col(cell_id)
+    _, columns = grid.row_layout(row)
+    neighbours: List[int] = []
+    for other_row in (row - 1, row, row + 1):
+        if not 0 <= other_row < grid.rows:
+            continue
+        offset, other_columns = grid.row_layout(other_row)
+        # Columns whose closed longitude span [j, j + 1] / other_columns meets the cell's
+        first = -(-column * other_columns // columns) - 1
+        last = (column + 1) * other_columns // columns
+        if last - first + 1 >= other_columns:
+            first, last = 0, other_columns - 1
+        for other_column in range(first, last + 1):
+            neighbour = offset + other_column % other_columns
+            if neighbour != cell_id and neighbour not in neighbours:
+                neighbours.append(neighbour)
+    return neighbours
+
+def cell_parent(cell_id: int, level: int) -> int:
+    """ID of the level-`level` block containing a cell (or a finer block); level 0 is the cell."""
+    grid = geocoding.GRID
+    row, column = _row_col(cell_id)
+    mask = -1 << _check_level(level)
+    return grid.row_layout(row & mask)[0] + (column & mask)
+
+def cell_parents(ids, level: int) -> np.ndarray:
+    """Vectorized cell_parent over an array of cell IDs; -1 for out-of-range IDs."""
+    grid = geocoding.GRID
+    ids = np.asarray(ids, dtype=np.int64)
+    mask = -1 << _check_level(level)
+    valid = (ids >= 0) & (ids < grid.total_cells)
+    rows, columns = grid.rows_cols(np.where(valid, ids, 0))
+    offsets, _ = grid.rows_layout(rows & mask)
+    return np.where(valid, offsets + (columns & mask), -1)
+
+def cell_children(block_id: int, level: int) -> List[int]:
+    """
+    IDs of the up to four level-(level - 1) blocks that make up a level-`level` block, south
+    to north and west to east. Blocks at the north edge or the end of a row have fewer.
+    """
+    grid = geocoding.GRID
+    row, column = _row_col(block_id)
+    size = 1 << _check_level(level, minimum=1)
+    if row % size or column % size:
+        raise ValueError(f"Cell {block_id} does not start a level-{level} block")
+    half = size >> 1
+    children = []
+    for child_row in (row, row + half):
+        if child_row < grid.rows:
+            offset, columns = grid.row_layout(child_row)
+            children.extend(offset + child_column for child_column in (column, column + half) if child_column < columns)
+    return children
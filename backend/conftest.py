@@ -0,0 +1,7 @@
+import os
+import tempfile
+
+# Keep compiled vocabulary artifacts written during the test run out of backend/build
+os.environ.setdefault("VOCAB_ARTIFACT_DIR", tempfile.mkdtemp(prefix="w3w-vocab-"))
+# Same for the SQLite database, which the app migrates and writes the conversion log into
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="w3w-db-"), "test.db"))
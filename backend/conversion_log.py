@@ -0,0 +1,178 @@
+"""
+Write-behind audit log of conversions into the Geocode table.
+
+Request handlers only append a record to a bounded in-memory queue; a background thread
+drains it and writes rows with one bulk INSERT per batch, flushing once FLUSH_SIZE records
+are waiting or FLUSH_INTERVAL seconds after the first one arrived. When the database cannot
+keep up and the queue is full, new records are dropped and counted instead of blocking the
+request. A batch whose INSERT fails is retried WRITE_ATTEMPTS times before its rows are
+dropped; failures are logged, at most once per FAILURE_LOG_INTERVAL seconds.
+"""
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Iterable, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
+
+# Support both package import (backend.*) and direct module import during tests
+try:
+    from .database import SessionLocal
+    from .models import Geocode
+except ImportError:
+    from database import SessionLocal
+    from models import Geocode
+
+CONVERSION_LOG_ENABLED = os.getenv("CONVERSION_LOG", "1") != "0"
+# Records written per bulk INSERT
+FLUSH_SIZE = int(os.getenv("CONVERSION_LOG_FLUSH_SIZE", "500"))
+# Longest a record waits in the queue before it is written
+FLUSH_INTERVAL = float(os.getenv("CONVERSION_LOG_FLUSH_INTERVAL", "1.0"))
+# Records held in memory before new ones are dropped
+MAX_BACKLOG = int(os.getenv("CONVERSION_LOG_MAX_BACKLOG", "100000"))
+
+# Tries per batch when the database reports a transient error (e.g. "database is locked")
+WRITE_ATTEMPTS = int(os.getenv("CONVERSION_LOG_WRITE_ATTEMPTS", "3"))
+# Seconds before the second try; doubled for each further one
+RETRY_DELAY = 0.1
+FAILURE_LOG_INTERVAL = 60.0
+
+logger = logging.getLogger(__name__)
+
+# Queued by flush() to make the writer thread write its current batch immediately
+_FLUSH = object()
+
+def coarse_cell_key(latitude: float, longitude: float) -> int:
+    """0.01 degree (~1 km) bucket of a coordinate, for grouping log rows by area."""
+    row = min(int((latitude + 90) * 100), 17999)
+    column = min(int((longitude + 180) * 100), 35999)
+    return row * 36000 + column
+
+def conversion_record(direction: str, mode: str, latitude: float, longitude: float,
+                      word1: str, word2: str, word3: str) -> dict:
+    """A Geocode row for one conversion."""
+    return {
+        "latitude": latitude,
+        "longitude": longitude,
+        "word1": word1,
+        "word2": word2,
+        "word3": word3,
+        "mode": mode,
+        "direction": direction,
+        "cell_key": coarse_cell_key(latitude, longitude),
+        "created_at": time.time(),
+    }
+
+class ConversionLog:
+    """Bounded queue of conversion records flushed to Geocode by a daemon thread."""
+
+    def __init__(self, session_factory=SessionLocal, enabled: bool = CONVERSION_LOG_ENABLED,
+                 flush_size: int = FLUSH_SIZE, flush_interval: float = FLUSH_INTERVAL,
+                 max_backlog: int = MAX_BACKLOG):
+        self.session_factory = session_factory
+        self.enabled = enabled
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue(maxsize=max_backlog)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self._last_failure_log = float("-inf")
+        self._unlogged_failures = 0
+
+    def record(self, direction: str, mode: str, latitude: float, longitude: float,
+               word1: str, word2: str, word3: str) -> None:
+        """Queue one conversion; never blocks."""
+        if self.enabled:
+            self._put(conversion_record(direction, mode, latitude, longitude, word1, word2, word3))
+
+    def record_many(self, records: Iterable[dict]) -> None:
+        """Queue records built with conversion_record; never blocks."""
+        if self.enabled:
+            for record in records:
+                self._put(record)
+
+    def _put(self, record: dict) -> None:
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _ensure_started(self) -> None:
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="conversion-log", daemon=True)
+                    self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while batch[-1] is not _FLUSH and len(batch) < self.flush_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            self._write(batch)
+
+    def _write(self, batch: list) -> None:
+        rows = [record for record in batch if record is not _FLUSH]
+        if rows:
+            try:
+                self._insert(rows)
+                self.written += len(rows)
+            except Exception:
+                self.failed += len(rows)
+                self._log_failure(len(rows))
+        for _ in batch:
+            self._queue.task_done()
+
+    def _insert(self, rows: list) -> None:
+        for attempt in range(1, WRITE_ATTEMPTS + 1):
+            try:
+                with self.session_factory() as session:
+                    session.execute(insert(Geocode), rows)
+                    session.commit()
+                return
+            except OperationalError:
+                if attempt == WRITE_ATTEMPTS:
+                    raise
+                time.sleep(RETRY_DELAY * 2 ** (attempt - 1))
+
+    def _log_failure(self, rows: int) -> None:
+        # Called from the except block in _write, so logger.exception has the current error
+        now = time.monotonic()
+        if now - self._last_failure_log < FAILURE_LOG_INTERVAL:
+            self._unlogged_failures += 1
+            return
+        suppressed = f"; {self._unlogged_failures} more batches failed since the last report" if self._unlogged_failures else ""
+        logger.exception("Conversion log dropped %d rows after %d attempts%s", rows, WRITE_ATTEMPTS, suppressed)
+        self._last_failure_log = now
+        self._unlogged_failures = 0
+
+    def flush(self) -> None:
+        """Block until every record queued so far has been written."""
+        if self._thread is None:
+            return
+        # The marker makes the writer thread write its partial batch without waiting out FLUSH_INTERVAL
+        self._queue.put(_FLUSH)
+        self._queue.join()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "backlog": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
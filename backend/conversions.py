@@ -0,0 +1,190 @@
+"""
+Conversion work shared by the batch, stream and grid endpoints.
+
+Everything here is a plain module-level function over picklable arguments, so the
+execution layer can run it inline or ship it to a worker process unchanged. Jobs take the
+vocabulary versions the server is serving ({mode: version}); a worker process that loaded an
+older or newer vocabulary reloads to match before converting, and each job reports the
+versions it actually used.
+"""
+import json
+from typing import Dict, List, Optional, Tuple, Union
+
+from pydantic import BaseModel, ValidationError
+
+# Support both package import (backend.*) and direct module import during tests
+try:
+    from .schemas import CoordsRequest, WordsRequest
+    from .conversion_log import conversion_record
+    from .geocoding import (
+        Codec, cells_in_bbox, get_codec, lat_lng_to_words_batch, sync_vocabulary, words_to_lat_lng_batch,
+    )
+except ImportError:
+    from schemas import CoordsRequest, WordsRequest
+    from conversion_log import conversion_record
+    from geocoding import (
+        Codec, cells_in_bbox, get_codec, lat_lng_to_words_batch, sync_vocabulary, words_to_lat_lng_batch,
+    )
+
+# Longest NDJSON line accepted; longer lines get a per-line error instead of being buffered
+MAX_NDJSON_LINE_BYTES = 64 * 1024
+
+def coords_error(latitude: float, longitude: float) -> str:
+    """Error message lat_lng_to_words would raise for a row rejected by the batch encoder."""
+    if not (-90 <= latitude <= 90):
+        return "Latitude must be between -90 and 90"
+    return "Longitude must be between -180 and 180"
+
+def resolve_codecs(modes, versions: Optional[Dict[str, str]] = None) -> Dict[str, Codec]:
+    """The Codec of each mode, synced to versions[mode] when given, else the current one."""
+    return {
+        mode: sync_vocabulary(mode, versions[mode]) if versions and mode in versions else get_codec(mode)
+        for mode in modes
+    }
+
+def _used_versions(codecs: Dict[str, Codec]) -> Dict[str, str]:
+    return {mode: codec.version for mode, codec in codecs.items()}
+
+def convert_coords_items(items: List[Union[CoordsRequest, str]],
+                         codecs: Optional[Dict[str, Codec]] = None) -> Tuple[List[dict], List[dict]]:
+    """
+    Convert parsed coordinate items to word results, one vectorized call per mode, with the
+    Codec from codecs (default: the mode's current one). Items that failed to parse are passed
+    through as their error message. Returns the results and the conversion log records of the
+    successful items.
+    """
+    results: List[dict] = [None] * len(items)
+    by_mode = {}
+    for i, item in enumerate(items):
+        if isinstance(item, str):
+            results[i] = {"word1": None, "word2": None, "word3": None, "error": item}
+        else:
+            by_mode.setdefault(item.mode, []).append(i)
+
+    records = []
+    for mode, positions in by_mode.items():
+        lats = [items[i].latitude for i in positions]
+        lngs = [items[i].longitude for i in positions]
+        codec = codecs.get(mode) if codecs else None
+        words, valid = lat_lng_to_words_batch(lats, lngs, mode, return_words=True, codec=codec)
+        for k, i in enumerate(positions):
+            if valid[k]:
+                word1, word2, word3 = words[k].tolist()
+                results[i] = {"word1": word1, "word2": word2, "word3": word3, "error": None}
+                records.append(conversion_record("coords", mode, lats[k], lngs[k], word1, word2, word3))
+            else:
+                error = coords_error(lats[k], lngs[k])
+                results[i] = {"word1": None, "word2": None, "word3": None, "error": error}
+    return results, records
+
+def convert_words_items(items: List[Union[WordsRequest, str]],
+                        codecs: Optional[Dict[str, Codec]] = None) -> Tuple[List[dict], List[dict]]:
+    """
+    Convert parsed word items to coordinate results, one vectorized call per mode, with the
+    Codec from codecs (default: the mode's current one). Items that failed to parse are passed
+    through as their error message. Returns the results and the conversion log records of the
+    successful items.
+    """
+    results: List[dict] = [None] * len(items)
+    by_mode = {}
+    for i, item in enumerate(items):
+        if isinstance(item, str):
+            results[i] = {"latitude": None, "longitude": None, "error": item}
+        else:
+            by_mode.setdefault(item.mode, []).append(i)
+
+    records = []
+    for mode, positions in by_mode.items():
+        lats, lngs, valid = words_to_lat_lng_batch(
+            [items[i].word1 for i in positions],
+            [items[i].word2 for i in positions],
+            [items[i].word3 for i in positions],
+            mode,
+            codec=codecs.get(mode) if codecs else None,
+        )
+        for k, i in enumerate(positions):
+            if valid[k]:
+                lat, lng = float(lats[k]), float(lngs[k])
+                results[i] = {"latitude": lat, "longitude": lng, "error": None}
+                item = items[i]
+                records.append(conversion_record(
+                    "words", mode, lat, lng, item.word1.lower(), item.word2.lower(), item.word3.lower(),
+                ))
+            else:
+                results[i] = {"latitude": None, "longitude": None, "error": "Invalid words provided"}
+    return results, records
+
+def parse_item(model: type, raw) -> Union[BaseModel, str]:
+    """Validate one batch item (a JSON value or an NDJSON line), returning the model or its error message."""
+    try:
+        if isinstance(raw, bytes):
+            return model.model_validate_json(raw)
+        return model.model_validate(raw)
+    except ValidationError as e:
+        error = e.errors()[0]
+        location = ".".join(str(part) for part in error["loc"])
+        return f"Invalid item: {location}: {error['msg']}" if location else f"Invalid item: {error['msg']}"
+
+_CONVERTERS = {CoordsRequest: convert_coords_items, WordsRequest: convert_words_items}
+
+def _convert(model: type, items: list, versions: Optional[Dict[str, str]]):
+    codecs = resolve_codecs(sorted({item.mode for item in items if not isinstance(item, str)}), versions)
+    results, records = _CONVERTERS[model](items, codecs)
+    return results, records, _used_versions(codecs)
+
+def convert_batch_json(model: type, raw_items: list,
+                       versions: Optional[Dict[str, str]] = None) -> Tuple[bytes, List[dict], Dict[str, str]]:
+    """
+    Validate and convert the raw items of a JSON batch request. Returns the serialized
+    response body, so a worker process does the JSON encoding too, the log records and the
+    vocabulary versions used.
+    """
+    results, records, used = _convert(model, [parse_item(model, raw) for raw in raw_items], versions)
+    return json.dumps({"results": results}).encode(), records, used
+
+def convert_ndjson_lines(model: type, lines: List[Optional[bytes]],
+                         versions: Optional[Dict[str, str]] = None) -> Tuple[bytes, List[dict], Dict[str, str]]:
+    """
+    Validate and convert a chunk of NDJSON lines (None for a line that exceeded
+    MAX_NDJSON_LINE_BYTES). Returns the NDJSON result lines, the log records and the
+    vocabulary versions used.
+    """
+    items = [
+        f"Invalid item: line exceeds {MAX_NDJSON_LINE_BYTES} bytes" if line is None else parse_item(model, line)
+        for line in lines
+    ]
+    results, records, used = _convert(model, items, versions)
+    return "".join(json.dumps(r) + "\n" for r in results).encode(), records, used
+
+# Features serialized per chunk written by /grid
+GRID_CHUNK_CELLS = 500
+
+def grid_geojson(south: float, west: float, north: float, east: float, mode: str,
+                 codec: Optional[Codec] = None):
+    """Serialize cells_in_bbox as a GeoJSON FeatureCollection, chunk by chunk."""
+    yield '{"type": "FeatureCollection", "features": ['
+    separator = ""
+    features = []
+    for cell in cells_in_bbox(south, west, north, east, mode, codec):
+        w, s, e, n = cell["west"], cell["south"], cell["east"], cell["north"]
+        features.append(json.dumps({
+            "type": "Feature",
+            "geometry": {"type": "Polygon", "coordinates": [[[w, s], [e, s], [e, n], [w, n], [w, s]]]},
+            "properties": {"cell_id": cell["cell_id"], "words": ".".join(cell["words"])},
+        }))
+        if len(features) >= GRID_CHUNK_CELLS:
+            yield separator + ",".join(features)
+            separator = ","
+            features = []
+    if features:
+        yield separator + ",".join(features)
+    yield "]}"
+
+def grid_geojson_text(south: float, west: float, north: float, east: float, mode: str,
+                      version: Optional[str] = None) -> Tuple[str, str]:
+    """
+    The whole grid_geojson document as one string, for jobs run in a worker process, rendered
+    with the vocabulary at version (default: current). Returns the document and the version used.
+    """
+    codec = resolve_codecs([mode], {mode: version} if version else None)[mode]
+    return "".join(grid_geojson(south, west, north, east, mode, codec)), codec.version
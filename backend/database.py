@@ -1,18 +1,55 @@
-from sqlalchemy import create_engine
+import os
+
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./what3words.db"
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./what3words.db")
+# Seconds a SQLite connection waits for another process's write lock before "database is locked"
+SQLITE_BUSY_TIMEOUT = float(os.getenv("SQLITE_BUSY_TIMEOUT", "30"))
 
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT}
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# DEFAULT clause for each column with a server default that migrate() may add to an existing
+# table, written out as a fixed literal rather than rendered from the model
+ADDED_COLUMN_DEFAULTS = {
+    ("geocodes", "mode"): "DEFAULT 'global'",
+}
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def migrate(bind=engine):
+    """
+    Create missing tables, then bring existing ones up to date: create_all never alters a
+    table that already exists, so columns added to a model since are added with ALTER TABLE
+    (they must be nullable or have a server default) and missing indexes are created.
+    """
+    Base.metadata.create_all(bind=bind)
+    inspector = inspect(bind)
+    preparer = bind.dialect.identifier_preparer
+    with bind.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    parts = [
+                        "ALTER TABLE", preparer.format_table(table), "ADD COLUMN", preparer.format_column(column),
+                        column.type.compile(dialect=bind.dialect),
+                    ]
+                    if column.server_default is not None:
+                        default = ADDED_COLUMN_DEFAULTS.get((table.name, column.name))
+                        if default is None:
+                            raise ValueError(f"No DEFAULT in ADDED_COLUMN_DEFAULTS for new column {table.name}.{column.name}")
+                        parts.append(default)
+                    connection.execute(text(" ".join(parts)))
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
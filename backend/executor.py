@@ -0,0 +1,100 @@
+"""
+Execution layer for conversion work.
+
+Small jobs run inline on FastAPI's threadpool. Jobs with at least OFFLOAD_MIN_ITEMS items
+(large batches, stream chunks, big grid requests) go to a ProcessPoolExecutor, so their
+NumPy and JSON work does not hold the server's GIL while single conversions are answered.
+Workers are spawned up front and pre-warmed with the word tables of WARMUP_MODES. At most
+MAX_PENDING_JOBS jobs may be queued or running in the pool; beyond that submit() raises
+PoolSaturated (which the API reports as 429) unless the caller asks to wait for a slot.
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+# Support both package import (backend.*) and direct module import during tests
+try:
+    from .geocoding import WARMUP_MODES, warmup
+except ImportError:
+    from geocoding import WARMUP_MODES, warmup
+
+# Worker processes; 0 runs everything inline
+PROCESS_POOL_WORKERS = int(os.getenv("PROCESS_POOL_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Jobs allowed in the pool (queued or running) before new ones are rejected
+MAX_PENDING_JOBS = int(os.getenv("MAX_PENDING_JOBS", str(max(1, PROCESS_POOL_WORKERS) * 2)))
+# Smallest job, in items or grid cells, that is worth the cost of pickling it to a worker
+OFFLOAD_MIN_ITEMS = int(os.getenv("OFFLOAD_MIN_ITEMS", "1000"))
+
+class PoolSaturated(Exception):
+    """Raised when the process pool already holds MAX_PENDING_JOBS jobs."""
+
+def _warm(modes=WARMUP_MODES) -> None:
+    """Worker initializer: load the warm-up modes' codecs and batch arrays before the first job."""
+    warmup(modes)
+
+class JobExecutor:
+    """Runs conversion jobs inline or in a process pool, with bounded backpressure."""
+
+    def __init__(self, workers: int = PROCESS_POOL_WORKERS, max_pending: int = MAX_PENDING_JOBS,
+                 offload_min_items: int = OFFLOAD_MIN_ITEMS):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.offload_min_items = offload_min_items
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self.rejected = 0
+
+    def should_offload(self, size: int) -> bool:
+        return self.workers > 0 and size >= self.offload_min_items
+
+    def start(self) -> None:
+        """Spawn and pre-warm every worker. Called at startup; submit() also starts the pool lazily."""
+        if self.workers <= 0:
+            return
+        with self._pool_lock:
+            if self._pool is not None:
+                return
+            # spawn: forking a process that already runs the server's threads is unsafe
+            pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm,
+            )
+            # One concurrent no-op per worker makes the pool spawn all of them now
+            for future in [pool.submit(os.getpid) for _ in range(self.workers)]:
+                future.result()
+            self._pool = pool
+
+    def shutdown(self) -> None:
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+                self._pool = None
+
+    async def submit(self, fn, *args, size: int, wait: bool = False):
+        """
+        Run fn(*args) and return its result. Jobs of at least offload_min_items go to the
+        process pool; when it is full, raise PoolSaturated, or with wait=True block until a
+        slot frees up (used by the stream endpoints, whose clients already get backpressure
+        from the unread request body).
+        """
+        if not self.should_offload(size):
+            return await run_in_threadpool(fn, *args)
+
+        if not self._slots.acquire(blocking=False):
+            if not wait:
+                self.rejected += 1
+                raise PoolSaturated(f"{self.max_pending} jobs already queued")
+            await run_in_threadpool(self._slots.acquire)
+        try:
+            if self._pool is None:
+                await run_in_threadpool(self.start)
+            return await asyncio.get_running_loop().run_in_executor(self._pool, fn, *args)
+        finally:
+            self._slots.release()
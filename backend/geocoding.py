@@ -1,14 +1,67 @@
+import hashlib
+import inspect
+import logging
 import math
-from typing import Tuple, List
+import mmap
+import struct
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from itertools import islice
+from typing import Callable, Dict, Tuple, List, Optional
 import os
 
+import numpy as np
+
+# Support both package import (backend.*) and direct module import during tests
+try:
+    from . import synthesis
+    from .grid import make_grid
+    from .metrics import timed
+    from .word_table import CompactWordIndex, SharedWordTable, TABLE_FORMAT_VERSION, compact_words, write_table_file
+except ImportError:
+    import synthesis
+    from grid import make_grid
+    from metrics import timed
+    from word_table import CompactWordIndex, SharedWordTable, TABLE_FORMAT_VERSION, compact_words, write_table_file
+
 from typing import Set
+
+logger = logging.getLogger(__name__)
+
 INDIA_ONLY = os.getenv("INDIA_ONLY_WORDS", "").lower() in ("1", "true", "yes", "on")
 
+# Storage for per-mode word tables: "list" (list[str] + dict), "compact" (see word_table.py)
+# or "shared" (compact tables mapped read-only from a file that all workers share)
+WORD_TABLE_BACKEND = os.getenv("WORD_TABLE_BACKEND", "list").lower()
+if WORD_TABLE_BACKEND not in ("list", "compact", "shared"):
+    raise ValueError(
+        f"Unknown WORD_TABLE_BACKEND: {WORD_TABLE_BACKEND!r} (expected 'list', 'compact' or 'shared')"
+    )
+
 # Cache for different modes
 WORD_LIST_CACHE = {}
 WORD_TO_INDEX_CACHE = {}
 WORD_COMBINATIONS_CACHE = {}
+CODEC_CACHE = {}
+# mode -> (word_list, word_to_index, combinations, version); see get_word_data
+WORD_DATA = {}
+# mode -> (_source_signature, source_hash) of the word list files, taken just before the
+# loaded vocabulary read them; the watcher and reload_vocabulary compare against it
+SOURCE_STATE: Dict[str, Tuple[tuple, bytes]] = {}
+# Serializes first loads and reloads; readers of the caches never take it
+_load_lock = threading.RLock()
+# Called with each freshly built Codec before it is swapped in (see reload_vocabulary)
+_reload_hooks: List[Callable[["Codec"], None]] = []
+# Seconds between checks of the word list files for changes; 0 disables the watcher
+VOCAB_RELOAD_INTERVAL = float(os.getenv("VOCAB_RELOAD_INTERVAL", "0"))
+
+MODES = ("global", "india")
+# Modes warmup() loads when a server starts (comma-separated; empty loads nothing up front).
+# Nothing is loaded at import; any other mode is loaded by its first request.
+WARMUP_MODES = tuple(mode.strip() for mode in os.getenv("WARMUP_MODES", ",".join(MODES)).split(",") if mode.strip())
 
 # Target 3m resolution across Earth's surface (approx 3m x 3m squares)
 # We'll size the grid independently of dictionary size and then ensure
@@ -31,9 +84,38 @@ def min_words_for_total(total: int) -> int:
         n += 1
     return n
 
-REQUIRED_MIN_WORDS = min_words_for_total(TARGET_TOTAL_SQUARES)
+# Define a ~3m grid targeting what3words-like resolution using a 2:1 aspect (lon:lat)
+LATITUDE_CELLS = int(math.sqrt(TARGET_TOTAL_SQUARES / 2))
+LONGITUDE_CELLS = LATITUDE_CELLS * 2
 
-def generate_synthetic_words(min_count: int, existing: Set[str], mode: str = "global") -> List[str]:
+# Cell layout (see grid.py): "equirectangular" (default) gives every latitude row
+# LONGITUDE_CELLS columns; "equal_area" scales the columns with cos(latitude), which needs
+# about 2/pi of the cell indices and so a smaller vocabulary. Changing it changes every address.
+GRID = make_grid(os.getenv("GRID", "equirectangular").lower(), LATITUDE_CELLS, LONGITUDE_CELLS)
+TOTAL_GRID_SQUARES = GRID.total_cells
+
+if GRID.kind == "equirectangular":
+    REQUIRED_MIN_WORDS = min_words_for_total(TARGET_TOTAL_SQUARES)
+else:
+    REQUIRED_MIN_WORDS = min_words_for_total(TOTAL_GRID_SQUARES)
+
+# Compiled vocabulary artifacts (see write_artifact / `python geocoding.py build`).
+# Bump ARTIFACT_FORMAT_VERSION when the binary layout changes and SYNTHESIS_VERSION when
+# synthetic word generation (synthesis.py) changes its output; either invalidates existing artifacts.
+ARTIFACT_FORMAT_VERSION = 1
+SYNTHESIS_VERSION = 1
+# Version of the cell and permutation math (grid.py, Codec.encode_index) published in
+# vocabulary manifests; bump it whenever the same vocabulary would map to different cells.
+ALGORITHM_VERSION = 1
+ARTIFACT_MAGIC = b"W3WVOCAB"
+# magic, format version, mode, source sha256, lat cells, lng cells, min words, word count, blob length
+ARTIFACT_HEADER = struct.Struct("<8sI16s32sQQQIQ")
+ARTIFACT_DIR = os.getenv(
+    "VOCAB_ARTIFACT_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "build"),
+)
+
+def generate_synthetic_words(min_count: int, existing: Set[str], mode: str = "global", start: int = 0) -> List[str]:
     """
     Deterministically generate pronounceable ASCII alphabetic tokens to extend the vocabulary
     up to at least min_count items. Only letters a-z, lowercase. No numbers, no punctuation.
@@ -41,176 +123,54 @@ def generate_synthetic_words(min_count: int, existing: Set[str], mode: str = "gl
     If INDIA_ONLY is enabled (env INDIA_ONLY_WORDS=1/true/yes/on), synthesize tokens using
     Indian phonotactics and common morphemes (e.g., pr/kr/sh/bh/kh... with vowels a/aa/ee/... and
     suffixes like raj, deep, jeet, preet, veer, kumar, nath, dev, pal, das, jit, kant, ish, esh, indra).
-    """
-    seen = set(existing)
-    out: List[str] = []
-
-    def add_word(w: str):
-        if len(seen) >= min_count:
-            return
-        if w.isalpha() and w.encode("ascii", "ignore").decode() == w and w not in seen:
-            seen.add(w)
-            out.append(w)
-
-    if INDIA_ONLY:
-        # Indian-style synthesis
-        vowels = ["a", "aa", "i", "ee", "u", "oo", "e", "ai", "o", "au"]
-        onsets = [
-            "k","kh","g","gh","ch","j","jh","t","th","d","dh","n","p","ph","b","bh","m",
-            "y","r","l","v","w","s","sh","h",
-            "tr","dr","pr","br","kr","gr","vr","sr","shr","sri","sk","st","sp","kl","gl","pl","bl"
-        ]
-        codas = [
-            "n","m","r","l","sh","th","dh","nd","nt","nk","mp","rk","rt","rd","rm","rv","rs","rl",
-            "an","in","it","ik","il","ir","ar","al","am","as","at","ash"
-        ]
-        suffixes = [
-            "raj","deep","jeet","preet","veer","kumar","nath","dev","pal","das","jit","kant",
-            "ish","esh","eshwar","indra","anand","inder","jeev","prasad","lal","bai","ben"
-        ]
-
-        # 1) onset + vowel + coda
-        for o in onsets:
-            for v in vowels:
-                for c in codas:
-                    add_word(o + v + c)
-                    if len(seen) >= min_count:
-                        return out
-
-        # 2) onset + vowel + onset2 + vowel2
-        for o1 in onsets:
-            for v1 in vowels:
-                for o2 in onsets:
-                    for v2 in vowels:
-                        add_word(o1 + v1 + o2 + v2)
-                        if len(seen) >= min_count:
-                            return out
-
-        # 3) onset + vowel + suffix
-        for o in onsets:
-            for v in vowels:
-                for sfx in suffixes:
-                    add_word(o + v + sfx)
-                    if len(seen) >= min_count:
-                        return out
-
-        # 4) Common standalone suffix-morpheme words
-        for sfx in suffixes:
-            add_word(sfx)
-            if len(seen) >= min_count:
-                return out
-
-        # 5) Small fallback CV/CVC if still needed
-        basic_v = ["a","e","i","o","u"]
-        basic_c = list("bcdfghjklmnpqrstvwxyz")
-        for c1 in basic_c:
-            for v1 in basic_v:
-                add_word(c1 + v1)
-                if len(seen) >= min_count:
-                    return out
-        for c1 in basic_c:
-            for v1 in basic_v:
-                for c2 in basic_c:
-                    add_word(c1 + v1 + c2)
-                    if len(seen) >= min_count:
-                        return out
-
-        return out
-    else:
-        # Generic pronounceable synthesis (previous behavior)
-        vowels = ["a", "e", "i", "o", "u"]
-        cons = list("bcdfghjklmnpqrstvwxyz")  # 21 consonants
-
-        # 1) CVCV
-        for c1 in cons:
-            for v1 in vowels:
-                for c2 in cons:
-                    for v2 in vowels:
-                        add_word(c1 + v1 + c2 + v2)
-                        if len(seen) >= min_count:
-                            return out
-
-        # 2) CVCVC
-        for c1 in cons:
-            for v1 in vowels:
-                for c2 in cons:
-                    for v2 in vowels:
-                        for c3 in cons:
-                            add_word(c1 + v1 + c2 + v2 + c3)
-                            if len(seen) >= min_count:
-                                return out
-
-        # 2b) CVCCV
-        for c1 in cons:
-            for v1 in vowels:
-                for c2 in cons:
-                    for c3 in cons:
-                        for v2 in vowels:
-                            add_word(c1 + v1 + c2 + c3 + v2)
-                            if len(seen) >= min_count:
-                                return out
-
-        # 3) Fallbacks
-        for c1 in cons:
-            for v1 in vowels:
-                for c2 in cons:
-                    add_word(c1 + v1 + c2)
-                    if len(seen) >= min_count:
-                        return out
-        for c1 in cons:
-            for v1 in vowels:
-                add_word(c1 + v1)
-                if len(seen) >= min_count:
-                    return out
-
-        return out
-def load_word_list(filename: str, mode: str = "global") -> List[str]:
-    """Load a word list strictly filtering to lowercase ASCII alphabetic words.
 
-    mode="india":
-      - Load exclusively from backend/wordlists/india_only/*.txt
-    mode="global":
-      - Load base filename and merge backend/wordlists/*.txt
+    start resumes the sequence at its start-th token without generating the ones before it:
+    the result equals generate_synthetic_words(min_count, existing, mode)[start:]. See synthesis.py.
     """
-    if mode in WORD_LIST_CACHE:
-        return WORD_LIST_CACHE[mode]
+    return synthesis.generate(synthesis.INDIA_SPACE if INDIA_ONLY else synthesis.GLOBAL_SPACE, min_count, existing, start)
 
+def _source_files(filename: str, mode: str = "global") -> List[str]:
+    """Return the word list files that make up the vocabulary for a mode, in load order."""
     current_dir = os.path.dirname(os.path.abspath(__file__))
-    words: List[str] = []
+    paths: List[str] = []
 
     if mode == "india":
         india_dir = os.path.join(current_dir, "wordlists", "india_only")
         if not os.path.isdir(india_dir):
             raise FileNotFoundError(f"India mode enabled but directory not found: {india_dir}")
-        for name in os.listdir(india_dir):
+        for name in sorted(os.listdir(india_dir)):
             if name.lower().endswith(".txt"):
-                extra_path = os.path.join(india_dir, name)
-                try:
-                    with open(extra_path, "r") as ef:
-                        words.extend([line.strip().lower() for line in ef if line.strip()])
-                except Exception:
-                    # Skip unreadable files silently to avoid breaking startup
-                    pass
+                paths.append(os.path.join(india_dir, name))
     else:
         # Base file
         file_path = os.path.join(current_dir, filename)
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"The word list file was not found at: {file_path}")
-        with open(file_path, "r") as f:
-            words = [line.strip().lower() for line in f if line.strip()]
+        paths.append(file_path)
 
         # Merge in additional curated wordlists
         extra_dir = os.path.join(current_dir, "wordlists")
         if os.path.isdir(extra_dir):
-            for name in os.listdir(extra_dir):
+            for name in sorted(os.listdir(extra_dir)):
                 if name.lower().endswith(".txt"):
-                    extra_path = os.path.join(extra_dir, name)
-                    try:
-                        with open(extra_path, "r") as ef:
-                            words.extend([line.strip().lower() for line in ef if line.strip()])
-                    except Exception:
-                        # Skip unreadable files silently to avoid breaking startup
-                        pass
+                    paths.append(os.path.join(extra_dir, name))
+
+    return paths
+
+def _read_source_words(filename: str, mode: str = "global") -> List[str]:
+    """Read and filter the curated word lists for a mode, without synthetic augmentation."""
+    words: List[str] = []
+    for index, path in enumerate(_source_files(filename, mode)):
+        # The base words.txt must be readable; extra lists are best-effort
+        required = mode != "india" and index == 0
+        try:
+            with open(path, "r") as f:
+                words.extend([line.strip().lower() for line in f if line.strip()])
+        except Exception:
+            if required:
+                raise
+            # Skip unreadable files silently to avoid breaking startup
+            pass
 
     # Keep only a-z letters; drop any item containing non-letters (digits, hyphens, accents, punctuation)
     alpha_words = [
@@ -224,166 +184,826 @@ def load_word_list(filename: str, mode: str = "global") -> List[str]:
     if any(any(c.isdigit() for c in w) for w in unique_words):
         raise ValueError("Filtered word list still contains digits; aborting load.")
 
-    WORD_LIST_CACHE[mode] = unique_words
     return unique_words
 
-def get_word_data(mode: str = "global"):
-    """Get word list, word_to_index, and combinations for the given mode."""
-    if mode not in WORD_LIST_CACHE:
-        load_word_list('words.txt', mode)
+def load_word_list(filename: str, mode: str = "global") -> List[str]:
+    """Load a word list strictly filtering to lowercase ASCII alphabetic words.
 
-    word_list = WORD_LIST_CACHE[mode]
+    mode="india":
+      - Load exclusively from backend/wordlists/india_only/*.txt
+    mode="global":
+      - Load base filename and merge backend/wordlists/*.txt
+    """
+    if mode in WORD_LIST_CACHE:
+        return WORD_LIST_CACHE[mode]
+
+    unique_words = _read_source_words(filename, mode)
+    WORD_LIST_CACHE[mode] = unique_words
+    return unique_words
+
+def build_vocabulary(mode: str = "global") -> List[str]:
+    """Build the full sorted vocabulary for a mode: curated lists plus synthetic words."""
+    word_list = _read_source_words('words.txt', mode)
 
     # Ensure vocabulary can uniquely address ~3m squares globally
     if len(word_list) < REQUIRED_MIN_WORDS:
         extras = generate_synthetic_words(REQUIRED_MIN_WORDS, set(word_list), mode)
         word_list = sorted(set(word_list).union(extras))
-        WORD_LIST_CACHE[mode] = word_list
-
-    word_count = len(word_list)
-    if word_count < 3:
-        raise ValueError("Word list must contain at least 3 words after augmentation.")
-
-    if mode not in WORD_TO_INDEX_CACHE:
-        WORD_TO_INDEX_CACHE[mode] = {w: i for i, w in enumerate(word_list)}
-        WORD_COMBINATIONS_CACHE[mode] = word_count * (word_count - 1) * (word_count - 2)
-
-    return word_list, WORD_TO_INDEX_CACHE[mode], WORD_COMBINATIONS_CACHE[mode]
-
-# For backward compatibility, load default mode
-try:
-    WORD_LIST = load_word_list('words.txt', "global")
-    if not WORD_LIST:
-        raise ValueError("The word list is empty or could not be loaded.")
-except (FileNotFoundError, ValueError) as e:
-    print(f"Error loading word list: {e}")
-    WORD_LIST = ["apple", "banana", "cherry"]
-
-# Ensure vocabulary can uniquely address ~3m squares globally
-if len(WORD_LIST) < REQUIRED_MIN_WORDS:
-    extras = generate_synthetic_words(REQUIRED_MIN_WORDS, set(WORD_LIST), "global")
-    WORD_LIST = sorted(set(WORD_LIST).union(extras))
-
-word_count = len(WORD_LIST)
-if word_count < 3:
-    raise ValueError("Word list must contain at least 3 words after augmentation.")
-
-# Fast lookup for reverse conversion
-WORD_TO_INDEX = {w: i for i, w in enumerate(WORD_LIST)}
-WORD_COMBINATIONS = word_count * (word_count - 1) * (word_count - 2)
-
-# Define a ~3m grid targeting what3words-like resolution using a 2:1 aspect (lon:lat)
-LATITUDE_CELLS = int(math.sqrt(TARGET_TOTAL_SQUARES / 2))
-LONGITUDE_CELLS = LATITUDE_CELLS * 2
-TOTAL_GRID_SQUARES = LATITUDE_CELLS * LONGITUDE_CELLS
 
-# Final safety check: permutations capacity must be >= total grid squares
-if WORD_COMBINATIONS < TOTAL_GRID_SQUARES:
-    raise ValueError("Insufficient vocabulary size for 3m resolution grid.")
+    return word_list
 
-def lat_lng_to_words(lat: float, lng: float, mode: str = "global") -> Tuple[str, str, str]:
-    """Convert latitude and longitude to three unique alphabetic words."""
-    if not (-90 <= lat <= 90):
-        raise ValueError("Latitude must be between -90 and 90")
-    if not (-180 <= lng <= 180):
-        raise ValueError("Longitude must be between -180 and 180")
-
-    word_list, word_to_index, word_combinations = get_word_data(mode)
-    word_count = len(word_list)
-
-    lat_grid = int((lat + 90) / 180 * LATITUDE_CELLS)
-    lng_grid = int((lng + 180) / 360 * LONGITUDE_CELLS)
-
-    lat_grid = max(0, min(lat_grid, LATITUDE_CELLS - 1))
-    lng_grid = max(0, min(lng_grid, LONGITUDE_CELLS - 1))
-
-    grid_index = (lat_grid * LONGITUDE_CELLS + lng_grid)
+def source_hash(mode: str = "global") -> bytes:
+    """
+    SHA-256 over everything the compiled vocabulary of a mode depends on: the source word
+    lists, the synthesis code and settings, and the grid constants. A compiled artifact is only reused
+    while this digest matches the one stored in its header.
+    """
+    h = hashlib.sha256()
+    # The synthesis and filtering code is hashed too, so editing it without bumping
+    # SYNTHESIS_VERSION still invalidates existing artifacts.
+    for func in (generate_synthetic_words, _read_source_words):
+        try:
+            h.update(inspect.getsource(func).encode())
+        except (OSError, TypeError):
+            h.update(func.__code__.co_code)
+    try:
+        h.update(inspect.getsource(synthesis).encode())
+    except (OSError, TypeError):
+        h.update(repr((synthesis.GLOBAL_STAGES, synthesis.INDIA_STAGES)).encode())
+    h.update(
+        f"v{ARTIFACT_FORMAT_VERSION}:s{SYNTHESIS_VERSION}:{mode}:india_only={INDIA_ONLY}:"
+        f"{REQUIRED_MIN_WORDS}:{LATITUDE_CELLS}x{LONGITUDE_CELLS}:{GRID.signature}\n".encode()
+    )
+    for path in _source_files('words.txt', mode):
+        try:
+            with open(path, "rb") as f:
+                content = f.read()
+        except OSError:
+            continue
+        h.update(os.path.basename(path).encode() + b"\0")
+        h.update(hashlib.sha256(content).digest())
+    return h.digest()
+
+def artifact_path(mode: str = "global") -> str:
+    """Location of the compiled vocabulary artifact for a mode."""
+    return os.path.join(ARTIFACT_DIR, f"vocab-{mode}.v{ARTIFACT_FORMAT_VERSION}.bin")
+
+def table_path(mode: str = "global") -> str:
+    """Location of the shared word table file for a mode (WORD_TABLE_BACKEND=shared)."""
+    return os.path.join(ARTIFACT_DIR, f"tables-{mode}.v{TABLE_FORMAT_VERSION}.bin")
+
+def write_artifact(mode: str, word_list: List[str], digest: bytes, path: Optional[str] = None) -> str:
+    """
+    Serialize a vocabulary into the binary artifact format:
 
-    # Encode grid_index into a unique permutation of 3 distinct indices without building large arrays
-    p_base2 = (word_count - 1) * (word_count - 2)
+        header   ARTIFACT_HEADER (magic, format version, mode, source hash, grid constants, counts)
+        offsets  uint32[word_count + 1], start of each word in the blob (last entry = blob length)
+        blob     ASCII words joined by "\\n"
 
-    a = grid_index // p_base2
-    r = grid_index % p_base2
-    b = r // (word_count - 2)
-    c = r % (word_count - 2)
+    The file is written to a temporary name and renamed into place so readers never see a
+    partially written artifact.
+    """
+    path = path or artifact_path(mode)
+    blob = "\n".join(word_list).encode("ascii")
+    offsets = array("I", [0] * (len(word_list) + 1))
+    pos = 0
+    for i, w in enumerate(word_list):
+        offsets[i] = pos
+        pos += len(w) + 1
+    offsets[len(word_list)] = len(blob) + 1
+    if sys.byteorder != "little":
+        offsets.byteswap()
+
+    header = ARTIFACT_HEADER.pack(
+        ARTIFACT_MAGIC,
+        ARTIFACT_FORMAT_VERSION,
+        mode.encode("ascii"),
+        digest,
+        LATITUDE_CELLS,
+        LONGITUDE_CELLS,
+        REQUIRED_MIN_WORDS,
+        len(word_list),
+        len(blob),
+    )
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(offsets.tobytes())
+        f.write(blob)
+    os.replace(tmp_path, path)
+    return path
+
+def read_artifact(mode: str, digest: bytes, path: Optional[str] = None) -> Optional[List[str]]:
+    """
+    Load a compiled vocabulary via mmap. Returns None when the artifact is missing, was built
+    by a different format version, or its source hash / grid constants no longer match.
+    """
+    path = path or artifact_path(mode)
+    try:
+        f = open(path, "rb")
+    except OSError:
+        return None
+    with f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+    with mm:
+        if len(mm) < ARTIFACT_HEADER.size:
+            return None
+        (magic, version, stored_mode, stored_digest, lat_cells, lng_cells,
+         min_words, word_count, blob_len) = ARTIFACT_HEADER.unpack_from(mm, 0)
+        if (
+            magic != ARTIFACT_MAGIC
+            or version != ARTIFACT_FORMAT_VERSION
+            or stored_mode.rstrip(b"\0") != mode.encode("ascii")
+            or stored_digest != digest
+            or (lat_cells, lng_cells, min_words) != (LATITUDE_CELLS, LONGITUDE_CELLS, REQUIRED_MIN_WORDS)
+        ):
+            return None
+        blob_start = ARTIFACT_HEADER.size + 4 * (word_count + 1)
+        if word_count == 0 or len(mm) != blob_start + blob_len:
+            return None
+        offsets = array("I")
+        offsets.frombytes(mm[ARTIFACT_HEADER.size:blob_start])
+        text = mm[blob_start:blob_start + blob_len].decode("ascii", "replace")
+    if sys.byteorder != "little":
+        offsets.byteswap()
+
+    # Offsets must start at 0 and end one past the blob (the implicit final separator); every
+    # word is non-empty and followed by the only "\n" separators in the blob.
+    if offsets[0] != 0 or offsets[word_count] != blob_len + 1 or text.count("\n") != word_count - 1:
+        return None
+    word_list: List[str] = []
+    for start, end in zip(offsets, offsets[1:]):
+        if end - start < 2 or text[end - 1:end] not in ("\n", ""):
+            return None
+        word_list.append(text[start:end - 1])
+    return word_list
+
+def load_vocabulary(mode: str = "global", digest: Optional[bytes] = None) -> List[str]:
+    """
+    Return the full vocabulary for a mode, preferring the compiled artifact. The artifact is
+    rebuilt (best-effort; a read-only filesystem just skips the write) when missing or stale.
+    Pass the mode's source_hash as digest when it has already been computed.
+    """
+    if digest is None:
+        digest = source_hash(mode)
+    word_list = read_artifact(mode, digest)
+    if word_list is not None:
+        return word_list
 
-    # Map second index b from [0..n-2] to actual index skipping a
-    i1 = a
-    i2 = b + (1 if b >= i1 else 0)
+    word_list = build_vocabulary(mode)
+    try:
+        write_artifact(mode, word_list, digest)
+    except OSError:
+        pass
+    return word_list
 
-    # Map third index c from [0..n-3] to actual index skipping {i1, i2}
-    x = c
-    lo = i1 if i1 < i2 else i2
-    hi = i2 if i2 > i1 else i1
-    if x >= lo:
-        x += 1
-    if x >= hi:
-        x += 1
-    i3 = x
+def vocabulary_version(word_list) -> str:
+    """
+    Short public identifier of a vocabulary: a hash of the ordered words, the grid layout and
+    ALGORITHM_VERSION, which together decide every word <-> cell mapping. It only changes when
+    a mapping does; source_hash, the artifact rebuild key, also changes with the code and
+    files that produced the words.
+    """
+    h = hashlib.sha256("\n".join(word_list).encode("ascii"))
+    h.update(f"\n{GRID.signature}:a{ALGORITHM_VERSION}".encode())
+    return h.hexdigest()[:12]
 
-    selected = (word_list[i1], word_list[i2], word_list[i3])
+def load_shared_table(mode: str, digest: bytes) -> Optional[SharedWordTable]:
+    """
+    Map the shared word table file of a mode, writing it first when it is missing or stale.
+    The first worker to start builds it; the rest map the same pages. None when the file
+    cannot be written or mapped (e.g. a read-only ARTIFACT_DIR without a prebuilt file).
+    """
+    path = table_path(mode)
+    table = SharedWordTable.open(path, digest)
+    if table is None:
+        try:
+            write_table_file(path, load_vocabulary(mode, digest), digest)
+        except OSError:
+            return None
+        table = SharedWordTable.open(path, digest)
+    return table
+
+def _combinations(word_count: int) -> int:
+    """Ordered triples of distinct words; checked against the grid so every cell has an address."""
+    if word_count < 3:
+        raise ValueError("Word list must contain at least 3 words after augmentation.")
+    combinations = word_count * (word_count - 1) * (word_count - 2)
+    if combinations < TOTAL_GRID_SQUARES:
+        raise ValueError("Insufficient vocabulary size for 3m resolution grid.")
+    return combinations
 
-    # Defensive validation to guarantee alphabetic-only and uniqueness
-    if not all(w.isalpha() for w in selected):
-        raise ValueError("Internal error: non-alphabetic word produced.")
-    if len(set(selected)) != 3:
-        raise ValueError("Internal error: duplicate words produced.")
+@timed("load_word_data", mode_index=0)
+def _build_word_data(mode: str, digest: Optional[bytes] = None):
+    """
+    Load a mode's vocabulary and build its lookup tables; returns a WORD_DATA entry. Pass the
+    mode's source_hash as digest when it has already been computed.
+    """
+    if digest is None:
+        digest = source_hash(mode)
+    if WORD_TABLE_BACKEND == "shared":
+        table = load_shared_table(mode, digest)
+        if table is not None:
+            return table, CompactWordIndex(table), _combinations(len(table)), vocabulary_version(table)
+    word_list = load_vocabulary(mode, digest)
+    combinations = _combinations(len(word_list))
+    version = vocabulary_version(word_list)
+
+    if WORD_TABLE_BACKEND in ("compact", "shared"):
+        word_list, word_to_index = compact_words(word_list)
+    else:
+        word_to_index = {w: i for i, w in enumerate(word_list)}
+    return word_list, word_to_index, combinations, version
+
+def _source_state(mode: str) -> Tuple[tuple, bytes]:
+    # The signature is taken first, so a file edited while it is read shows up as a change
+    signature = _source_signature(mode)
+    return signature, source_hash(mode)
+
+def _install_word_data(mode: str, data, sources: Tuple[tuple, bytes]) -> None:
+    # WORD_DATA holds each mode's tables as one tuple, so replacing the entry is the atomic
+    # swap; the per-table caches are kept in step for code that still reads them directly.
+    SOURCE_STATE[mode] = sources
+    WORD_DATA[mode] = data
+    WORD_LIST_CACHE[mode], WORD_TO_INDEX_CACHE[mode], WORD_COMBINATIONS_CACHE[mode], _ = data
+    if mode == "global":
+        globals().update(WORD_LIST=data[0], WORD_TO_INDEX=data[1], WORD_COMBINATIONS=data[2])
 
-    return selected
+def get_word_data(mode: str = "global"):
+    """
+    Get word list, word_to_index, and combinations for the given mode.
 
-def words_to_lat_lng(word1: str, word2: str, word3: str, mode: str = "global") -> Tuple[float, float]:
-    """Convert three unique words back to latitude and longitude."""
-    word1, word2, word3 = word1.lower(), word2.lower(), word3.lower()
+    With WORD_TABLE_BACKEND=compact the word list is a CompactWordTable and word_to_index a
+    CompactWordIndex (same sequence / mapping interface, a fraction of the memory). With
+    WORD_TABLE_BACKEND=shared it is a SharedWordTable mapped from table_path(mode).
+    """
+    data = WORD_DATA.get(mode)
+    if data is None:
+        with _load_lock:
+            data = WORD_DATA.get(mode)
+            if data is None:
+                sources = _source_state(mode)
+                data = _build_word_data(mode, sources[1])
+                _install_word_data(mode, data, sources)
+    return data[0], data[1], data[2]
+
+# Global mode's tables, once loaded eagerly at import and still importable from here
+_GLOBAL_WORD_DATA = {"WORD_LIST": 0, "WORD_TO_INDEX": 1, "WORD_COMBINATIONS": 2}
+
+def __getattr__(name: str):
+    # Only reached before global mode is loaded: _install_word_data then sets the names as
+    # plain module globals
+    if name in _GLOBAL_WORD_DATA:
+        return get_word_data("global")[_GLOBAL_WORD_DATA[name]]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def _as_word_array(column) -> np.ndarray:
+    """Coerce a column of words (list, NumPy array, pandas Series or Arrow array) to a unicode array."""
+    if hasattr(column, "to_pylist"):
+        # pyarrow Array / ChunkedArray; nulls come back as None
+        column = column.to_pylist()
+    arr = np.asarray(column)
+    if arr.dtype.kind == "U":
+        return arr
+    if arr.dtype.kind == "S":
+        return np.char.decode(arr, "ascii", "replace")
+    return np.array(["" if w is None else str(w) for w in arr.ravel()], dtype=str).reshape(arr.shape)
+
+def _lowercase_lookup_keys(words: np.ndarray, width: int) -> np.ndarray:
+    """
+    Lowercase a unicode word array into fixed-width ASCII byte strings comparable with the
+    vocabulary bytes array. ASCII rows are lowercased on the raw code points; the rare
+    non-ASCII rows go through str.lower like the scalar path. Words that cannot be in the
+    vocabulary (longer than its longest word, or non-ASCII after lowering) become b"".
+    """
+    words = np.ascontiguousarray(words).ravel()
+    count = words.size
+    in_width = max(words.dtype.itemsize // 4, 1)
+    code_points = words.view(np.uint32).reshape(count, in_width)
+
+    codes = np.zeros((count, width), dtype=np.uint32)
+    shared = min(width, in_width)
+    codes[:, :shared] = code_points[:, :shared]
+    codes[(codes >= 65) & (codes <= 90)] += 32
+    keys = codes.astype(np.uint8).view(f"S{width}").ravel()
+
+    if in_width > width:
+        keys[code_points[:, width:].any(axis=1)] = b""
+    for i in np.flatnonzero((code_points > 127).any(axis=1)):
+        lowered = str(words[i]).lower()
+        keys[i] = lowered.encode("ascii") if lowered.isascii() and len(lowered) <= width else b""
+    return keys
+
+class Codec:
+    """
+    Encoder/decoder for one mode's vocabulary with every per-mode constant precomputed.
 
-    if not (word1.isalpha() and word2.isalpha() and word3.isalpha()):
-        raise ValueError("Words must contain only alphabetic characters.")
-    if len(set([word1, word2, word3])) != 3:
-        raise ValueError("Words must be unique.")
+    The vocabulary is validated once at construction (sorted, unique, ASCII alphabetic), so
+    the per-call paths skip the isalpha/uniqueness re-checks: three distinct indices into a
+    list of unique words always give three distinct alphabetic words. Tables that were
+    validated when written (SharedWordTable) skip the check, and their mapped word arrays are
+    used as is. Build instances through get_codec(mode), which caches one per mode.
+    """
 
-    word_list, word_to_index, word_combinations = get_word_data(mode)
-    word_count = len(word_list)
+    __slots__ = (
+        "mode", "word_list", "word_to_index", "word_count", "word_combinations", "version",
+        "_n2", "_p_base2", "_word_array", "_word_bytes",
+    )
+
+    def __init__(self, mode: str, word_list: List[str], word_to_index: Optional[dict] = None, version: str = ""):
+        word_count = len(word_list)
+        if word_count < 3:
+            raise ValueError("Word list must contain at least 3 words after augmentation.")
+        if not getattr(word_list, "validated", False):
+            if any(a >= b for a, b in zip(word_list, islice(word_list, 1, None))):
+                raise ValueError("Word list must be sorted and free of duplicates.")
+            if not all(w.isalpha() and w.isascii() for w in word_list):
+                raise ValueError("Word list must contain only ASCII alphabetic words.")
+
+        self.mode = mode
+        self.word_list = word_list
+        self.word_to_index = word_to_index if word_to_index is not None else {w: i for i, w in enumerate(word_list)}
+        self.word_count = word_count
+        self.word_combinations = word_count * (word_count - 1) * (word_count - 2)
+        # Identifies the word <-> cell mapping; changes whenever the vocabulary does
+        self.version = version
+        self._n2 = word_count - 2
+        self._p_base2 = (word_count - 1) * (word_count - 2)
+        self._word_array = getattr(word_list, "word_array", None)
+        self._word_bytes = getattr(word_list, "word_bytes", None)
+
+    @property
+    def word_array(self) -> np.ndarray:
+        """NumPy unicode array of the sorted vocabulary, used by the batch encoder."""
+        if self._word_array is None:
+            self._word_array = np.array(list(self.word_list))
+        return self._word_array
+
+    @property
+    def word_bytes(self) -> np.ndarray:
+        """Fixed-width ASCII bytes array of the sorted vocabulary, used for bulk word lookups."""
+        if self._word_bytes is None:
+            width = max(len(w) for w in self.word_list)
+            self._word_bytes = np.array(list(self.word_list), dtype=f"S{width}")
+        return self._word_bytes
+
+    def encode_index(self, grid_index: int) -> Tuple[int, int, int]:
+        """Map a grid index to a permutation of three distinct word indices."""
+        a, r = divmod(grid_index, self._p_base2)
+        b, c = divmod(r, self._n2)
+
+        # Second index skips a; third index skips {a, second}
+        i2 = b + 1 if b >= a else b
+        if a < i2:
+            lo, hi = a, i2
+        else:
+            lo, hi = i2, a
+        if c >= lo:
+            c += 1
+        if c >= hi:
+            c += 1
+        return a, i2, c
+
+    def decode_index(self, i1: int, i2: int, i3: int) -> int:
+        """Inverse of encode_index: three distinct word indices back to the grid index."""
+        b = i2 - 1 if i2 > i1 else i2
+        if i1 < i2:
+            lo, hi = i1, i2
+        else:
+            lo, hi = i2, i1
+        c = i3
+        if c > hi:
+            c -= 1
+        if c > lo:
+            c -= 1
+        return i1 * self._p_base2 + b * self._n2 + c
+
+    def encode(self, lat: float, lng: float) -> Tuple[str, str, str]:
+        """Convert latitude and longitude to three unique alphabetic words."""
+        return self.cell_words(lat_lng_to_cell(lat, lng))
+
+    def cell_words(self, grid_index: int) -> Tuple[str, str, str]:
+        """The three words of a grid cell."""
+        i1, i2, i3 = self.encode_index(grid_index)
+        word_list = self.word_list
+        return word_list[i1], word_list[i2], word_list[i3]
+
+    def decode(self, word1: str, word2: str, word3: str) -> Tuple[float, float]:
+        """Convert three unique words back to latitude and longitude (cell center)."""
+        return GRID.center(self.decode_cell(word1, word2, word3))
+
+    def decode_cell(self, word1: str, word2: str, word3: str) -> int:
+        """Grid index encoded by three unique words (may lie past the last cell)."""
+        word1, word2, word3 = word1.lower(), word2.lower(), word3.lower()
+
+        if not (word1.isalpha() and word2.isalpha() and word3.isalpha()):
+            raise ValueError("Words must contain only alphabetic characters.")
+        if word1 == word2 or word1 == word3 or word2 == word3:
+            raise ValueError("Words must be unique.")
+
+        word_to_index = self.word_to_index
+        try:
+            return self.decode_index(word_to_index[word1], word_to_index[word2], word_to_index[word3])
+        except KeyError:
+            raise ValueError("One or more words not found in the dictionary")
+
+    def complete(self, prefix: str, limit: int = 10) -> List[str]:
+        """
+        Up to `limit` vocabulary words starting with prefix, in sorted order. Binary search
+        over the sorted word list finds the first candidate, so only matching words are read.
+        """
+        prefix = prefix.lower()
+        if not (prefix.isalpha() and prefix.isascii()) or limit <= 0:
+            return []
+        word_list = self.word_list
+        start = bisect_left(word_list, prefix)
+        matches: List[str] = []
+        for i in range(start, min(start + limit, self.word_count)):
+            word = word_list[i]
+            if not word.startswith(prefix):
+                break
+            matches.append(word)
+        return matches
+
+    def encode_batch(self, lats, lngs, return_words: bool = False):
+        """Vectorized encode; see lat_lng_to_words_batch."""
+        lats = np.asarray(lats, dtype=np.float64)
+        lngs = np.asarray(lngs, dtype=np.float64)
+        if lats.shape != lngs.shape:
+            raise ValueError("Latitude and longitude arrays must have the same shape")
+        # Work on flat arrays (0-d input included) and restore the input shape on return
+        shape = lats.shape
+        lats = lats.ravel()
+        lngs = lngs.ravel()
+
+        valid = (lats >= -90) & (lats <= 90) & (lngs >= -180) & (lngs <= 180)
+
+        # Invalid rows are computed on a dummy coordinate and masked out afterwards
+        grid_index = GRID.cells(np.where(valid, lats, 0.0), np.where(valid, lngs, 0.0))
+        i1, i2, i3 = self.encode_index_batch(grid_index)
+
+        invalid = ~valid
+        i1[invalid] = -1
+        i2[invalid] = -1
+        i3[invalid] = -1
+
+        if not return_words:
+            return i1.reshape(shape), i2.reshape(shape), i3.reshape(shape), valid.reshape(shape)
+
+        word_array = self.word_array
+        words = np.empty(lats.shape + (3,), dtype=word_array.dtype)
+        for column, indices in enumerate((i1, i2, i3)):
+            words[:, column] = np.where(valid, word_array[np.where(valid, indices, 0)], "")
+        return words.reshape(shape + (3,)), valid.reshape(shape)
+
+    def encode_index_batch(self, grid_index: np.ndarray):
+        """Vectorized encode_index over an int64 array of grid indices."""
+        a, r = np.divmod(grid_index, self._p_base2)
+        b, c = np.divmod(r, self._n2)
+
+        i2 = b + (b >= a)
+
+        lo = np.minimum(a, i2)
+        hi = np.maximum(a, i2)
+        i3 = c + (c >= lo)
+        i3 += i3 >= hi
+        return a, i2, i3
+
+    def decode_index_batch(self, i1: np.ndarray, i2: np.ndarray, i3: np.ndarray) -> np.ndarray:
+        """Vectorized decode_index over int64 arrays of word indices."""
+        b = i2 - (i2 > i1)
+
+        lo = np.minimum(i1, i2)
+        hi = np.maximum(i1, i2)
+        c = i3 - (i3 > hi)
+        c -= c > lo
+        return i1 * self._p_base2 + b * self._n2 + c
+
+    def lookup_batch(self, words) -> Tuple[np.ndarray, np.ndarray]:
+        """Map a column of words to vocabulary indices by binary search; returns (indices, found)."""
+        words = _as_word_array(words)
+        word_bytes = self.word_bytes
+        keys = _lowercase_lookup_keys(words, word_bytes.dtype.itemsize)
+        positions = np.searchsorted(word_bytes, keys)
+        np.minimum(positions, len(word_bytes) - 1, out=positions)
+        found = word_bytes[positions] == keys
+        return positions.astype(np.int64).reshape(words.shape), found.reshape(words.shape)
+
+    def decode_batch(self, words1, words2, words3):
+        """Vectorized decode; see words_to_lat_lng_batch."""
+        grid_index, valid = self.decode_cell_batch(words1, words2, words3)
+        lat, lng = GRID.centers(grid_index.ravel())
+
+        invalid = ~valid.ravel()
+        lat[invalid] = np.nan
+        lng[invalid] = np.nan
+        return lat.reshape(valid.shape), lng.reshape(valid.shape), valid
+
+    def decode_cell_batch(self, words1, words2, words3) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized decode_cell; returns (grid indices, valid), see words_to_lat_lng_batch."""
+        w1 = _as_word_array(words1)
+        w2 = _as_word_array(words2)
+        w3 = _as_word_array(words3)
+        if not (w1.shape == w2.shape == w3.shape):
+            raise ValueError("Word columns must have the same length")
+        # Work on flat arrays (0-d input included) and restore the input shape on return
+        shape = w1.shape
+
+        # Every vocabulary word is alphabetic, so a successful lookup also implies isalpha()
+        a, found1 = self.lookup_batch(w1.ravel())
+        b, found2 = self.lookup_batch(w2.ravel())
+        c, found3 = self.lookup_batch(w3.ravel())
+        valid = found1 & found2 & found3
+        valid &= (a != b) & (a != c) & (b != c)
+        return self.decode_index_batch(a, b, c).reshape(shape), valid.reshape(shape)
+
+def get_codec(mode: str = "global") -> Codec:
+    """Return the current Codec for a mode, building it on first use."""
+    codec = CODEC_CACHE.get(mode)
+    if codec is None:
+        with _load_lock:
+            codec = CODEC_CACHE.get(mode)
+            if codec is None:
+                word_list, word_to_index, _ = get_word_data(mode)
+                codec = Codec(mode, word_list, word_to_index, WORD_DATA[mode][3])
+                CODEC_CACHE[mode] = codec
+    return codec
+
+def loaded_codec(mode: str = "global") -> Optional[Codec]:
+    """The mode's current Codec if it is already loaded, else None; never loads anything."""
+    return CODEC_CACHE.get(mode)
+
+def warmup(modes=WARMUP_MODES) -> None:
+    """
+    Load the Codec and batch arrays of each mode now rather than in its first request. Safe
+    to call from several threads: each mode is built once and the other callers wait for it.
+    With WORD_TABLE_BACKEND=compact the batch arrays stay lazy, since building them would bring
+    back the per-word memory that backend avoids in processes that never run a batch.
+    """
+    for mode in modes:
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode: {mode!r} (expected one of {', '.join(MODES)})")
+    for mode in modes:
+        codec = get_codec(mode)
+        if WORD_TABLE_BACKEND != "compact":
+            codec.word_array
+            codec.word_bytes
+
+def vocabulary_versions() -> Dict[str, str]:
+    """Version of every mode loaded in this process."""
+    return {mode: codec.version for mode, codec in list(CODEC_CACHE.items())}
+
+def register_reload_hook(hook: Callable[[Codec], None]) -> None:
+    """
+    Call hook(codec) with every Codec built by reload_vocabulary, before it is swapped in, so
+    derived structures (e.g. the spelling index) can be prepared off the request path.
+    """
+    _reload_hooks.append(hook)
 
-    try:
-        w1_val = word_to_index[word1]
-        w2_val = word_to_index[word2]
-        w3_val = word_to_index[word3]
-    except KeyError:
-        raise ValueError("One or more words not found in the dictionary")
+def reload_vocabulary(mode: str = "global") -> bool:
+    """
+    Rebuild a mode's vocabulary from the current word list files and swap it in. Returns
+    False when the sources are unchanged, or when they changed but produce the same
+    vocabulary version (e.g. after a comment-only edit), in which case only the artifacts are
+    rebuilt.
+
+    Everything is built on the side (tables, Codec, its batch arrays, reload hooks) and then
+    published with two dict assignments, so a request that already holds the old Codec keeps a
+    complete, consistent table and the next get_codec call sees the complete new one.
+    """
+    with _load_lock:
+        current = CODEC_CACHE.get(mode)
+        sources = _source_state(mode)
+        if current is not None and SOURCE_STATE.get(mode, (None, None))[1] == sources[1]:
+            SOURCE_STATE[mode] = sources
+            return False
+        data = _build_word_data(mode, sources[1])
+        if current is not None and current.version == data[3]:
+            SOURCE_STATE[mode] = sources
+            return False
+        codec = Codec(mode, data[0], data[1], data[3])
+        # Build the lazily created arrays now rather than in the first batch request after the swap
+        codec.word_array
+        codec.word_bytes
+        for hook in _reload_hooks:
+            hook(codec)
+        _install_word_data(mode, data, sources)
+        CODEC_CACHE[mode] = codec
+        return True
+
+def sync_vocabulary(mode: str, version: str) -> Codec:
+    """
+    The mode's Codec, reloaded first if it is not at version. Used by worker processes, which
+    load vocabularies independently of the server process that sent them work.
+    """
+    codec = get_codec(mode)
+    if codec.version != version:
+        reload_vocabulary(mode)
+        codec = get_codec(mode)
+    return codec
+
+def _source_signature(mode: str) -> tuple:
+    """Cheap change detector for a mode's word list files: names, sizes and mtimes."""
+    signature = []
+    for path in _source_files('words.txt', mode):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        signature.append((path, stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+def check_vocabulary_sources(failed: Optional[Dict[str, tuple]] = None) -> List[str]:
+    """
+    One pass of the vocabulary watcher: reload every loaded mode whose word list files differ
+    from the ones it was loaded from. Returns the modes reloaded. A failed reload is logged and
+    recorded in failed, and not tried again until the files change again.
+    """
+    failed = {} if failed is None else failed
+    reloaded = []
+    for mode, (loaded_signature, _) in list(SOURCE_STATE.items()):
+        signature = _source_signature(mode)
+        if signature == loaded_signature or failed.get(mode) == signature:
+            continue
+        try:
+            if reload_vocabulary(mode):
+                reloaded.append(mode)
+                logger.info("Reloaded %s vocabulary: version %s", mode, get_codec(mode).version)
+            failed.pop(mode, None)
+        except Exception:
+            # A half-edited or invalid word list keeps the current vocabulary in service
+            failed[mode] = signature
+            logger.exception("Vocabulary reload for %s failed", mode)
+    return reloaded
+
+def start_vocabulary_watcher(interval: float = VOCAB_RELOAD_INTERVAL) -> Optional[threading.Thread]:
+    """
+    Poll the word list files of every loaded mode every interval seconds and reload modes whose
+    files changed since they were loaded, on a daemon thread. Returns the thread, or None when
+    interval is 0.
+    """
+    if interval <= 0:
+        return None
+
+    def watch():
+        # Signature of a mode's files when its last reload failed; retried once they change again
+        failed = {}
+        while True:
+            check_vocabulary_sources(failed)
+            time.sleep(interval)
+
+    thread = threading.Thread(target=watch, name="vocabulary-watcher", daemon=True)
+    thread.start()
+    return thread
+
+def get_word_array(mode: str = "global") -> np.ndarray:
+    """NumPy unicode array of the sorted vocabulary, used by the batch encoder."""
+    return get_codec(mode).word_array
+
+def get_word_bytes(mode: str = "global") -> np.ndarray:
+    """Fixed-width ASCII bytes array of the sorted vocabulary, used for bulk word lookups."""
+    return get_codec(mode).word_bytes
+
+def lat_lng_to_cell(lat: float, lng: float) -> int:
+    """Grid index of the cell containing a coordinate (row * LONGITUDE_CELLS + column by default)."""
+    if not (-90 <= lat <= 90):
+        raise ValueError("Latitude must be between -90 and 90")
+    if not (-180 <= lng <= 180):
+        raise ValueError("Longitude must be between -180 and 180")
+    return GRID.cell(lat, lng)
 
-    # Decode the permutation back to the grid_index using inverse mapping
-    p_base2 = (word_count - 1) * (word_count - 2)
+def cell_to_words(grid_index: int, mode: str = "global", codec: Optional[Codec] = None) -> Tuple[str, str, str]:
+    """
+    The three words of a grid cell, as returned by lat_lng_to_words for any point inside it.
+    Pass codec to use a Codec already taken for mode instead of the current one.
+    """
+    return (codec or get_codec(mode)).cell_words(grid_index)
 
-    a = w1_val
-    # Inverse of i2 mapping (skip a)
-    b = w2_val - (1 if w2_val > a else 0)
+def lat_lng_to_words(lat: float, lng: float, mode: str = "global") -> Tuple[str, str, str]:
+    """Convert latitude and longitude to three unique alphabetic words."""
+    return get_codec(mode).encode(lat, lng)
+
+def words_to_lat_lng(word1: str, word2: str, word3: str, mode: str = "global",
+                     codec: Optional[Codec] = None) -> Tuple[float, float]:
+    """Convert three unique words back to latitude and longitude (with codec, if given)."""
+    return (codec or get_codec(mode)).decode(word1, word2, word3)
+
+def _bbox_rows(south: float, west: float, north: float, east: float) -> Tuple[int, int]:
+    """First and last grid row covered by a bounding box, after validating it."""
+    if not (-90 <= south <= north <= 90):
+        raise ValueError("Bounding box latitudes must satisfy -90 <= south <= north <= 90")
+    if not (-180 <= west <= 180 and -180 <= east <= 180):
+        raise ValueError("Bounding box longitudes must be between -180 and 180")
+    return GRID.row_of(south), GRID.row_of(north)
+
+def _column_ranges(columns: int, west: float, east: float) -> List[Tuple[int, int]]:
+    """
+    Column ranges [(col_lo, col_hi), ...] of a row with `columns` columns covered by west..east.
+    A box with west > east crosses the antimeridian and yields two ranges, or the whole row
+    when both ends fall in the same column.
+    """
+    def column(lng):
+        return min(int((lng + 180) / 360 * columns), columns - 1)
+
+    if west <= east:
+        return [(column(west), column(east))]
+    col_west, col_east = column(west), column(east)
+    if col_east >= col_west:
+        return [(0, columns - 1)]
+    return [(col_west, columns - 1), (0, col_east)]
+
+def count_cells_in_bbox(south: float, west: float, north: float, east: float) -> int:
+    """Number of grid cells cells_in_bbox would yield, computed without enumerating them."""
+    row_lo, row_hi = _bbox_rows(south, west, north, east)
+    return sum(
+        (last - first + 1) * sum(hi - lo + 1 for lo, hi in _column_ranges(columns, west, east))
+        for first, last, columns in GRID.row_segments(row_lo, row_hi)
+    )
+
+def cells_in_bbox(south: float, west: float, north: float, east: float, mode: str = "global",
+                  codec: Optional[Codec] = None):
+    """
+    Lazily yield every grid cell intersecting a bounding box, south to north, west to east.
 
-    # Inverse of i3 mapping (skip {a, w2_val})
-    c = w3_val
-    lo = a if a < w2_val else w2_val
-    hi = w2_val if w2_val > a else a
-    if c > hi:
-        c -= 1
-    if c > lo:
-        c -= 1
+    Each row is encoded in one vectorized call. Items are dicts with the cell's grid index
+    ("cell_id"), its bounds and its three words. Use count_cells_in_bbox to cap the size of a
+    request before iterating. Pass codec to pin the vocabulary for the whole iteration.
+    """
+    if codec is None:
+        codec = get_codec(mode)
+    word_array = codec.word_array
+    row_lo, row_hi = _bbox_rows(south, west, north, east)
+    lat_step = 180 / LATITUDE_CELLS
+
+    for row in range(row_lo, row_hi + 1):
+        cell_south = (row / LATITUDE_CELLS) * 180 - 90
+        cell_north = cell_south + lat_step
+        offset, columns = GRID.row_layout(row)
+        lng_step = 360 / columns
+        for col_lo, col_hi in _column_ranges(columns, west, east):
+            cols = np.arange(col_lo, col_hi + 1, dtype=np.int64)
+            grid_index = offset + cols
+            i1, i2, i3 = codec.encode_index_batch(grid_index)
+            wests = (cols / columns) * 360 - 180
+            for cell_id, cell_west, w1, w2, w3 in zip(
+                grid_index.tolist(), wests.tolist(),
+                word_array[i1].tolist(), word_array[i2].tolist(), word_array[i3].tolist(),
+            ):
+                yield {
+                    "cell_id": cell_id,
+                    "south": cell_south,
+                    "west": cell_west,
+                    "north": cell_north,
+                    "east": cell_west + lng_step,
+                    "words": (w1, w2, w3),
+                }
+
+def autocomplete(prefix: str, mode: str = "global", limit: int = 10) -> List[str]:
+    """Vocabulary words starting with prefix (case-insensitive), at most limit, in sorted order."""
+    return get_codec(mode).complete(prefix, limit)
+
+@timed("encode_batch", mode_index=2)
+def lat_lng_to_words_batch(lats, lngs, mode: str = "global", return_words: bool = False,
+                           codec: Optional[Codec] = None):
+    """
+    Vectorized lat_lng_to_words over arrays of coordinates.
 
-    grid_index = a * p_base2 + b * (word_count - 2) + c
+    Uses the same grid and permutation math as the scalar function, so every valid row is
+    bit-identical to lat_lng_to_words(lat, lng, mode). Out-of-range (or NaN) rows do not raise;
+    they are flagged False in the returned `valid` mask and get index -1 / empty words.
 
-    lat_grid = grid_index // LONGITUDE_CELLS
-    lng_grid = grid_index % LONGITUDE_CELLS
+    Returns (i1, i2, i3, valid) as int64 index arrays into the mode's word list, or
+    (words, valid) with a unicode array of shape input.shape + (3,) when return_words=True.
+    Pass codec to use a Codec already taken for mode instead of the current one.
+    """
+    return (codec or get_codec(mode)).encode_batch(lats, lngs, return_words)
 
-    lat = (lat_grid / LATITUDE_CELLS) * 180 - 90
-    lng = (lng_grid / LONGITUDE_CELLS) * 360 - 180
+@timed("decode_batch", mode_index=3)
+def words_to_lat_lng_batch(words1, words2, words3, mode: str = "global", codec: Optional[Codec] = None):
+    """
+    Vectorized words_to_lat_lng over columns of word triples.
 
-    # Center the coordinates in the middle of the square
-    lat += (180 / LATITUDE_CELLS) / 2
-    lng += (360 / LONGITUDE_CELLS) / 2
+    Accepts lists, NumPy string arrays, pandas Series or Arrow arrays. Words are lowercased
+    and mapped to indices in bulk by binary search over the sorted vocabulary bytes array, then
+    the inverse permutation and cell-centering run vectorized, matching the scalar function
+    exactly for valid rows.
 
-    return max(-90, min(90, lat)), max(-180, min(180, lng))
+    Returns (lats, lngs, valid): float64 arrays plus a mask that is False for rows the scalar
+    function would reject (non-alphabetic, repeated or unknown words). Invalid rows are NaN.
+    Pass codec to use a Codec already taken for mode instead of the current one.
+    """
+    return (codec or get_codec(mode)).decode_batch(words1, words2, words3)
 
-if __name__ == "__main__":
-    print(f"Word list size: {len(WORD_LIST)}")
-    print(f"Word combinations: {WORD_COMBINATIONS}")
-    print(f"Grid dimension: {LATITUDE_CELLS}x{LONGITUDE_CELLS}")
+def _demo() -> None:
+    word_list, _, combinations = get_word_data("global")
+    print(f"Word list size: {len(word_list)}")
+    print(f"Word combinations: {combinations}")
+    print(f"Grid: {GRID.kind}, {LATITUDE_CELLS} rows, {TOTAL_GRID_SQUARES} cells")
 
     test_lat, test_lng = 51.5074, -0.1278
     words = lat_lng_to_words(test_lat, test_lng)
@@ -392,3 +1012,55 @@ if __name__ == "__main__":
     back_lat, back_lng = words_to_lat_lng(*words)
     print(f"Reverse: {words} -> {back_lat}, {back_lng}")
     print(f"Accuracy: lat={abs(test_lat - back_lat):.6f}, lng={abs(test_lng - back_lng):.6f}")
+
+def _build(modes: List[str]) -> None:
+    """
+    Compile the vocabulary artifact and shared word table file for each mode, e.g. as a
+    deploy/build step.
+    """
+    for mode in modes:
+        word_list = build_vocabulary(mode)
+        digest = source_hash(mode)
+        path = write_artifact(mode, word_list, digest)
+        tables = write_table_file(table_path(mode), word_list, digest)
+        print(f"{mode}: {len(word_list)} words -> {path}, {tables}")
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="What3Words clone geocoding utilities")
+    subcommands = parser.add_subparsers(dest="command")
+    build_parser = subcommands.add_parser("build", help="compile vocabulary artifacts and shared word tables")
+    build_parser.add_argument("--mode", action="append", choices=MODES,
+                              help="mode to compile (repeatable; default: all modes)")
+    convert_parser = subcommands.add_parser("convert", help="bulk convert a CSV or Parquet file")
+    convert_parser.add_argument("input", help="CSV or Parquet (.parquet) file")
+    convert_parser.add_argument("output", help="output file, written in the input's format")
+    convert_parser.add_argument("--to", choices=["words", "coords"], default="words",
+                                help="words: latitude/longitude -> word1..word3 (default); coords: the reverse")
+    convert_parser.add_argument("--mode", choices=MODES, default="global")
+    convert_parser.add_argument("--columns", help="comma-separated input column names "
+                                "(default: latitude,longitude or word1,word2,word3)")
+    convert_parser.add_argument("--workers", type=int, help="worker processes (default: CPU count; 0: none)")
+    convert_parser.add_argument("--chunk-rows", type=int, default=50_000, help="rows per chunk (default: 50000)")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        _build(args.mode or list(MODES))
+    elif args.command == "convert":
+        try:
+            from .bulk import convert_file
+        except ImportError:
+            from bulk import convert_file
+        summary = convert_file(
+            args.input, args.output, to=args.to, mode=args.mode,
+            input_columns=args.columns.split(",") if args.columns else None,
+            workers=args.workers, chunk_rows=args.chunk_rows,
+        )
+        print(
+            f"\n{summary['rows']:,} rows converted ({summary['errors']:,} errors) in {summary['seconds']:.1f} s, "
+            f"{summary['rows'] / max(summary['seconds'], 1e-9):,.0f} rows/s",
+            file=sys.stderr,
+        )
+    else:
+        _demo()
@@ -0,0 +1,230 @@
+"""
+Grid layouts: how coordinates map to cell indices and back.
+
+Both layouts cut the globe into `rows` latitude rows of equal height, numbered south to north,
+and number cells row by row, west to east, so a cell index is `row_offset(row) + column`.
+
+EquirectangularGrid gives every row the same number of columns. Cells near the poles are then
+a sliver of their equatorial width, yet each uses up an index.
+
+EqualAreaGrid groups rows into bands of BAND_ROWS rows and gives each band only as many
+columns as cos(latitude) needs at its equatorward edge, so cells stay roughly as wide as at
+the equator everywhere. That needs about 2/pi of the indices. A cumulative table of band
+offsets makes cell -> index O(1) and index -> cell a binary search over the bands.
+
+Both also expose the integer (row, column) of a cell and the per-row layout that cells.py
+builds its cell-ID API (neighbours, parent/child blocks) on.
+"""
+import math
+from bisect import bisect_right
+from typing import Iterator, List, Tuple
+
+import numpy as np
+
+# Rows per equal-area band (~3.9 km of latitude at the default resolution)
+BAND_ROWS = 1024
+
+class EquirectangularGrid:
+    """rows x columns cells of equal angular size (2:1 aspect for the default grid)."""
+
+    kind = "equirectangular"
+
+    def __init__(self, rows: int, columns: int):
+        self.rows = rows
+        self.columns = columns
+        self.total_cells = rows * columns
+
+    @property
+    def signature(self) -> str:
+        """Identifies the layout; part of the vocabulary source hash."""
+        return f"{self.kind}:{self.rows}x{self.columns}"
+
+    def row_of(self, lat: float) -> int:
+        row = int((lat + 90) / 180 * self.rows)
+        return row if row < self.rows else self.rows - 1
+
+    @property
+    def max_level(self) -> int:
+        """Deepest block level (blocks of 2**level x 2**level cells, see cells.py)."""
+        return self.rows.bit_length() - 1
+
+    def row_layout(self, row: int) -> Tuple[int, int]:
+        """(index of the row's first cell, number of columns in the row)."""
+        return row * self.columns, self.columns
+
+    def rows_layout(self, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized row_layout() over an int64 array of rows."""
+        return rows * self.columns, np.full_like(rows, self.columns)
+
+    def row_col(self, index: int) -> Tuple[int, int]:
+        """(row, column) of a cell index (which must be in range)."""
+        return divmod(index, self.columns)
+
+    def rows_cols(self, indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized row_col() over an int64 array of in-range cell indices."""
+        return np.divmod(indices, self.columns)
+
+    def row_segments(self, row_lo: int, row_hi: int) -> Iterator[Tuple[int, int, int]]:
+        """(first row, last row, columns) runs of rows with the same column count."""
+        yield row_lo, row_hi, self.columns
+
+    def cell(self, lat: float, lng: float) -> int:
+        """Index of the cell containing a coordinate (which must be in range)."""
+        rows, columns = self.rows, self.columns
+        lat_grid = int((lat + 90) / 180 * rows)
+        lng_grid = int((lng + 180) / 360 * columns)
+        if lat_grid >= rows:
+            lat_grid = rows - 1
+        if lng_grid >= columns:
+            lng_grid = columns - 1
+        return lat_grid * columns + lng_grid
+
+    def center(self, index: int) -> Tuple[float, float]:
+        """Center of a cell; indices past the last cell are clamped to the poles."""
+        lat_grid, lng_grid = divmod(index, self.columns)
+
+        lat = (lat_grid / self.rows) * 180 - 90
+        lng = (lng_grid / self.columns) * 360 - 180
+
+        # Center the coordinates in the middle of the square
+        lat += (180 / self.rows) / 2
+        lng += (360 / self.columns) / 2
+
+        return max(-90, min(90, lat)), max(-180, min(180, lng))
+
+    def cells(self, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+        """Vectorized cell() over float64 arrays of in-range coordinates."""
+        lat_grid = ((lats + 90) / 180 * self.rows).astype(np.int64)
+        lng_grid = ((lngs + 180) / 360 * self.columns).astype(np.int64)
+
+        np.clip(lat_grid, 0, self.rows - 1, out=lat_grid)
+        np.clip(lng_grid, 0, self.columns - 1, out=lng_grid)
+        return lat_grid * self.columns + lng_grid
+
+    def centers(self, indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized center() over an int64 array of cell indices."""
+        lat_grid, lng_grid = np.divmod(indices, self.columns)
+
+        lat = (lat_grid / self.rows) * 180 - 90
+        lng = (lng_grid / self.columns) * 360 - 180
+
+        # Center the coordinates in the middle of the square
+        lat += (180 / self.rows) / 2
+        lng += (360 / self.columns) / 2
+
+        np.clip(lat, -90, 90, out=lat)
+        np.clip(lng, -180, 180, out=lng)
+        return lat, lng
+
+class EqualAreaGrid(EquirectangularGrid):
+    """
+    Rows of the equirectangular grid's height, with per-band column counts scaled by
+    cos(latitude) so cells keep the equatorial cell width (rounded up, so never wider).
+    """
+
+    kind = "equal_area"
+
+    def __init__(self, rows: int, equator_columns: int, band_rows: int = BAND_ROWS):
+        self.rows = rows
+        self.columns = equator_columns
+        self.band_rows = band_rows
+        bands = -(-rows // band_rows)
+        band_columns: List[int] = []
+        band_offsets: List[int] = [0]
+        for band in range(bands):
+            first, last = band * band_rows, min(rows, (band + 1) * band_rows)
+            # Equatorward edge of the band: 0 for the band that straddles the equator
+            south, north = first / rows * 180 - 90, last / rows * 180 - 90
+            edge = 0.0 if south < 0 < north else min(abs(south), abs(north))
+            band_columns.append(max(1, math.ceil(equator_columns * math.cos(math.radians(edge)))))
+            band_offsets.append(band_offsets[-1] + (last - first) * band_columns[-1])
+        self.band_columns = band_columns
+        self.band_offsets = band_offsets
+        self.total_cells = band_offsets[-1]
+        self._band_columns = np.array(band_columns, dtype=np.int64)
+        self._band_offsets = np.array(band_offsets, dtype=np.int64)
+
+    @property
+    def signature(self) -> str:
+        return f"{self.kind}:{self.rows}x{self.columns}:b{self.band_rows}"
+
+    @property
+    def max_level(self) -> int:
+        # Blocks must not straddle bands, whose rows have different column counts
+        return min(self.rows, self.band_rows).bit_length() - 1
+
+    def row_layout(self, row: int) -> Tuple[int, int]:
+        band, local_row = divmod(row, self.band_rows)
+        columns = self.band_columns[band]
+        return self.band_offsets[band] + local_row * columns, columns
+
+    def rows_layout(self, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        band, local_row = np.divmod(rows, self.band_rows)
+        columns = self._band_columns[band]
+        return self._band_offsets[band] + local_row * columns, columns
+
+    def row_col(self, index: int) -> Tuple[int, int]:
+        band = bisect_right(self.band_offsets, index) - 1
+        local_row, column = divmod(index - self.band_offsets[band], self.band_columns[band])
+        return band * self.band_rows + local_row, column
+
+    def rows_cols(self, indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        band = np.searchsorted(self._band_offsets, indices, side="right") - 1
+        local_row, column = np.divmod(indices - self._band_offsets[band], self._band_columns[band])
+        return band * self.band_rows + local_row, column
+
+    def row_segments(self, row_lo: int, row_hi: int) -> Iterator[Tuple[int, int, int]]:
+        for band in range(row_lo // self.band_rows, row_hi // self.band_rows + 1):
+            first = max(row_lo, band * self.band_rows)
+            last = min(row_hi, (band + 1) * self.band_rows - 1)
+            yield first, last, self.band_columns[band]
+
+    def cell(self, lat: float, lng: float) -> int:
+        row = int((lat + 90) / 180 * self.rows)
+        if row >= self.rows:
+            row = self.rows - 1
+        band, local_row = divmod(row, self.band_rows)
+        columns = self.band_columns[band]
+        column = int((lng + 180) / 360 * columns)
+        if column >= columns:
+            column = columns - 1
+        return self.band_offsets[band] + local_row * columns + column
+
+    def center(self, index: int) -> Tuple[float, float]:
+        """Center of a cell; indices past the last cell are clamped to the last cell."""
+        index = min(index, self.total_cells - 1)
+        band = bisect_right(self.band_offsets, index) - 1
+        columns = self.band_columns[band]
+        local_row, column = divmod(index - self.band_offsets[band], columns)
+        row = band * self.band_rows + local_row
+        lat = (row + 0.5) / self.rows * 180 - 90
+        lng = (column + 0.5) / columns * 360 - 180
+        return lat, lng
+
+    def cells(self, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+        rows = ((lats + 90) / 180 * self.rows).astype(np.int64)
+        np.clip(rows, 0, self.rows - 1, out=rows)
+        band, local_row = np.divmod(rows, self.band_rows)
+        columns = self._band_columns[band]
+        column = ((lngs + 180) / 360 * columns).astype(np.int64)
+        np.clip(column, 0, columns - 1, out=column)
+        return self._band_offsets[band] + local_row * columns + column
+
+    def centers(self, indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        indices = np.minimum(indices, self.total_cells - 1)
+        band = np.searchsorted(self._band_offsets, indices, side="right") - 1
+        columns = self._band_columns[band]
+        local_row, column = np.divmod(indices - self._band_offsets[band], columns)
+        rows = band * self.band_rows + local_row
+        lat = (rows + 0.5) / self.rows * 180 - 90
+        lng = (column + 0.5) / columns * 360 - 180
+        return lat, lng
+
+GRID_KINDS = {"equirectangular": EquirectangularGrid, "equal_area": EqualAreaGrid}
+
+def make_grid(kind: str, rows: int, equator_columns: int):
+    """The grid layout named kind ("equirectangular" or "equal_area")."""
+    try:
+        return GRID_KINDS[kind](rows, equator_columns)
+    except KeyError:
+        raise ValueError(f"Unknown GRID: {kind!r} (expected one of {', '.join(GRID_KINDS)})")
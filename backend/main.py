@@ -1,23 +1,77 @@
-from fastapi import FastAPI, Depends, HTTPException
+import asyncio
+import json
+import os
+from contextlib import asynccontextmanager
+from typing import Dict, Literal
+
+from fastapi import FastAPI, Depends, Header, HTTPException, Query, Response, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
 # Support running as a package (uvicorn backend.main:app) and as a module in tests (pytest from backend/)
 try:
-    from .database import SessionLocal, engine
-    from . import models
-    from .schemas import CoordsRequest, WordsRequest, WordsResponse, CoordsResponse
-    from .geocoding import lat_lng_to_words, words_to_lat_lng
+    from .database import migrate
+    from .schemas import (
+        CoordsRequest, WordsRequest, WordsResponse, CoordsResponse,
+        CoordsBatchRequest, WordsBatchRequest, WordsBatchResponse, CoordsBatchResponse,
+        AutocompleteResponse, SuggestRequest, SuggestResponse, CacheStatsResponse,
+    )
+    from .manifest import get_manifest
+    from .spelling import get_spelling_index, suggest
+    from .cache import LRUCache
+    from .conversion_log import ConversionLog
+    from .conversions import (
+        MAX_NDJSON_LINE_BYTES, convert_batch_json, convert_ndjson_lines, grid_geojson, grid_geojson_text,
+    )
+    from .executor import JobExecutor, PoolSaturated
+    from .metrics import CONTENT_TYPE, METRICS_ENABLED, REGISTRY, MetricsMiddleware, label_mode
+    from .geocoding import (
+        Codec, cell_to_words, count_cells_in_bbox, get_codec, lat_lng_to_cell, loaded_codec,
+        start_vocabulary_watcher, vocabulary_versions, warmup, words_to_lat_lng,
+    )
 except ImportError:
     # Fallback for direct execution/import without package context
-    from database import SessionLocal, engine
-    import models
-    from schemas import CoordsRequest, WordsRequest, WordsResponse, CoordsResponse
-    from geocoding import lat_lng_to_words, words_to_lat_lng
+    from database import migrate
+    from schemas import (
+        CoordsRequest, WordsRequest, WordsResponse, CoordsResponse,
+        CoordsBatchRequest, WordsBatchRequest, WordsBatchResponse, CoordsBatchResponse,
+        AutocompleteResponse, SuggestRequest, SuggestResponse, CacheStatsResponse,
+    )
+    from manifest import get_manifest
+    from spelling import get_spelling_index, suggest
+    from cache import LRUCache
+    from conversion_log import ConversionLog
+    from conversions import (
+        MAX_NDJSON_LINE_BYTES, convert_batch_json, convert_ndjson_lines, grid_geojson, grid_geojson_text,
+    )
+    from executor import JobExecutor, PoolSaturated
+    from metrics import CONTENT_TYPE, METRICS_ENABLED, REGISTRY, MetricsMiddleware, label_mode
+    from geocoding import (
+        Codec, cell_to_words, count_cells_in_bbox, get_codec, lat_lng_to_cell, loaded_codec,
+        start_vocabulary_watcher, vocabulary_versions, warmup, words_to_lat_lng,
+    )
+
+migrate()
 
-models.Base.metadata.create_all(bind=engine)
+conversion_log = ConversionLog()
+executor = JobExecutor()
 
-app = FastAPI(title="What3Words Clone API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the WARMUP_MODES vocabularies, then spawn and pre-warm the worker processes,
+    # before taking traffic
+    await run_in_threadpool(warmup)
+    await run_in_threadpool(executor.start)
+    start_vocabulary_watcher()
+    yield
+    await run_in_threadpool(executor.shutdown)
+    # Write whatever the conversion log still holds before the process exits
+    await run_in_threadpool(conversion_log.flush)
+
+app = FastAPI(title="What3Words Clone API", version="1.0.0", lifespan=lifespan)
 
 # Configure CORS
 app.add_middleware(
@@ -28,6 +82,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # The CORSMiddleware will handle OPTIONS requests automatically.
 # Explicitly defining them can sometimes cause issues.
 # @app.options("/convert-coords")
@@ -38,26 +95,507 @@ app.add_middleware(
 # def options_convert_words():
 #     return {"message": "OK"}
 
+# Entries kept by the single-conversion result cache (0 disables it)
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "100000"))
+result_cache = LRUCache(RESULT_CACHE_SIZE)
+
+# Response header naming the vocabulary version(s) an answer was computed with
+VERSION_HEADER = "X-Vocabulary-Version"
+
+def _version_header(versions: Dict[str, str]) -> str:
+    """"global=1a2b3c4d5e6f,india=..." for the modes a response used, sorted by mode."""
+    return ",".join(f"{mode}={version}" for mode, version in sorted(versions.items()))
+
+async def _codec(mode: str) -> Codec:
+    """
+    The mode's Codec. A mode that is not loaded yet (one outside WARMUP_MODES, on its first
+    request) is loaded on the threadpool, so the event loop never waits for a vocabulary.
+    """
+    codec = loaded_codec(mode)
+    if codec is None:
+        codec = await run_in_threadpool(get_codec, mode)
+    return codec
+
+# Single conversions are a cache probe plus a few microseconds of arithmetic, so they run
+# directly on the event loop; only batch, stream and grid work goes through the executor.
+# Each conversion takes one Codec and uses it throughout, so a vocabulary reload mid-request
+# cannot mix versions; the version is part of the cache key, so a reload never serves stale
+# results from the cache.
+def _coords_to_words(latitude: float, longitude: float, mode: str, codec: Codec):
+    """Cached, logged single conversion; returns (words, vocabulary version). Raises ValueError."""
+    cell = lat_lng_to_cell(latitude, longitude)
+    key = ("coords", mode, codec.version, cell)
+    words = result_cache.get(key)
+    if words is None:
+        words = cell_to_words(cell, mode, codec)
+        result_cache.set(key, words)
+    conversion_log.record("coords", mode, latitude, longitude, *words)
+    return words, codec.version
+
+def _words_to_coords(word1: str, word2: str, word3: str, mode: str, codec: Codec):
+    """Cached, logged single conversion; returns ((lat, lng), vocabulary version). Raises ValueError."""
+    words = (word1.lower(), word2.lower(), word3.lower())
+    key = ("words", mode, codec.version) + words
+    coords = result_cache.get(key)
+    if coords is None:
+        coords = words_to_lat_lng(*words, mode, codec)
+        result_cache.set(key, coords)
+    conversion_log.record("words", mode, *coords, *words)
+    return coords, codec.version
+
 @app.post("/convert-coords", response_model=WordsResponse)
-def convert_coords_to_words(request: CoordsRequest):
+async def convert_coords_to_words(request: CoordsRequest, response: Response):
     """Convert latitude and longitude to three words"""
+    label_mode(request.mode)
+    codec = await _codec(request.mode)
     try:
-        word1, word2, word3 = lat_lng_to_words(request.latitude, request.longitude, request.mode)
+        (word1, word2, word3), version = _coords_to_words(request.latitude, request.longitude, request.mode, codec)
+        response.headers[VERSION_HEADER] = _version_header({request.mode: version})
         return WordsResponse(word1=word1, word2=word2, word3=word3)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/convert-words", response_model=CoordsResponse)
-def convert_words_to_coords(request: WordsRequest):
+async def convert_words_to_coords(request: WordsRequest, response: Response):
     """Convert three words to latitude and longitude"""
+    label_mode(request.mode)
+    codec = await _codec(request.mode)
     try:
-        lat, lng = words_to_lat_lng(request.word1, request.word2, request.word3, request.mode)
+        (lat, lng), version = _words_to_coords(request.word1, request.word2, request.word3, request.mode, codec)
+        response.headers[VERSION_HEADER] = _version_header({request.mode: version})
         return CoordsResponse(latitude=lat, longitude=lng)
     except ValueError as e:
         raise HTTPException(status_code=400, detail="Invalid words provided")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Cache-Control max-age of the GET conversion routes. Answers only change when a vocabulary is
+# reloaded, which also changes their ETag, so caches can keep them long and revalidate cheaply.
+GET_CACHE_MAX_AGE = int(os.getenv("GET_CACHE_MAX_AGE", "86400"))
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 specifies for GET)."""
+    if if_none_match.strip() == "*":
+        return True
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in if_none_match.split(","))
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """
+    Whether an Accept-Encoding header allows gzip: its q-value, or that of "*" when gzip is not
+    listed, is above 0 (RFC 9110). An unparseable q-value counts as 0.
+    """
+    qualities = {}
+    for element in accept_encoding.lower().split(","):
+        coding, *params = (part.strip() for part in element.split(";"))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            qualities[coding] = quality
+    quality = qualities.get("gzip", qualities.get("x-gzip", qualities.get("*", 0.0)))
+    return quality > 0
+
+def _cacheable_response(body: bytes, etag: str, version_header: str, if_none_match: str,
+                        content_encoding: str = "") -> Response:
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={GET_CACHE_MAX_AGE}",
+        VERSION_HEADER: version_header,
+    }
+    if content_encoding:
+        # Set for the identity response too: caches must not hand it to gzip clients or vice versa
+        headers["Vary"] = "Accept-Encoding"
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    if content_encoding and content_encoding != "identity":
+        headers["Content-Encoding"] = content_encoding
+    return Response(body, media_type="application/json", headers=headers)
+
+# GET variants of the single conversions for browsers and CDNs. Bodies are serialized once per
+# (mode, version, cell) and kept in the result cache with their ETag, skipping the response model.
+@app.get("/c/{coords}", response_model=WordsResponse)
+async def get_coords_words(
+    coords: str,
+    mode: Literal["global", "india"] = "global",
+    if_none_match: str = Header(""),
+):
+    """Three words of "lat,lng", e.g. /c/51.5074,-0.1278; every point in a cell shares one ETag"""
+    label_mode(mode)
+    try:
+        lat, lng = (float(part) for part in coords.split(","))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Expected /c/{latitude},{longitude}")
+    try:
+        cell = lat_lng_to_cell(lat, lng)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    codec = await _codec(mode)
+    key = ("get-coords", mode, codec.version, cell)
+    cached = result_cache.get(key)
+    if cached is None:
+        words = cell_to_words(cell, mode, codec)
+        body = json.dumps(dict(zip(("word1", "word2", "word3"), words))).encode()
+        cached = (words, body, f'"{mode}-{codec.version}-c{cell}"')
+        result_cache.set(key, cached)
+    words, body, etag = cached
+    conversion_log.record("coords", mode, lat, lng, *words)
+    return _cacheable_response(body, etag, _version_header({mode: codec.version}), if_none_match)
+
+@app.get("/w/{words}", response_model=CoordsResponse)
+async def get_words_coords(
+    words: str,
+    mode: Literal["global", "india"] = "global",
+    if_none_match: str = Header(""),
+):
+    """Cell center of "word1.word2.word3", e.g. /w/apple.banana.cherry (case-insensitive)"""
+    label_mode(mode)
+    triple = tuple(words.lower().split("."))
+    if len(triple) != 3:
+        raise HTTPException(status_code=400, detail="Expected /w/{word1}.{word2}.{word3}")
+    codec = await _codec(mode)
+    key = ("get-words", mode, codec.version) + triple
+    cached = result_cache.get(key)
+    if cached is None:
+        try:
+            lat, lng = words_to_lat_lng(*triple, mode, codec)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid words provided")
+        body = json.dumps({"latitude": lat, "longitude": lng}).encode()
+        cached = (lat, lng, body, f'"{mode}-{codec.version}-w{lat_lng_to_cell(lat, lng)}"')
+        result_cache.set(key, cached)
+    lat, lng, body, etag = cached
+    conversion_log.record("words", mode, lat, lng, *triple)
+    return _cacheable_response(body, etag, _version_header({mode: codec.version}), if_none_match)
+
+# Counters of the /ws conversion channel, exported by /metrics
+ws_stats = {"connections": 0, "messages": 0, "coalesced": 0}
+
+_WS_TYPES = ("coords", "words")
+
+async def _ws_reply(kind: str, message: dict) -> dict:
+    """Result message for one /ws request message, or its error."""
+    reply = {"id": message.get("id"), "type": kind}
+    try:
+        if kind == "coords":
+            request = CoordsRequest.model_validate(message)
+            words, version = _coords_to_words(
+                request.latitude, request.longitude, request.mode, await _codec(request.mode),
+            )
+            reply.update(zip(("word1", "word2", "word3"), words))
+        else:
+            request = WordsRequest.model_validate(message)
+            (reply["latitude"], reply["longitude"]), version = _words_to_coords(
+                request.word1, request.word2, request.word3, request.mode, await _codec(request.mode),
+            )
+    except ValidationError as e:
+        error = e.errors()[0]
+        reply["error"] = f"Invalid message: {'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+        return reply
+    except ValueError as e:
+        reply["error"] = str(e) if kind == "coords" else "Invalid words provided"
+        return reply
+    reply["mode"] = request.mode
+    reply["version"] = version
+    return reply
+
+@app.websocket("/ws")
+async def conversion_socket(websocket: WebSocket):
+    """
+    One long-lived connection per client for continuous (e.g. map-driven) conversions.
+
+    Clients send JSON messages {"id", "type": "coords" | "words", ...request fields} and get
+    {"id", "type", ...result fields, "mode", "version"} or {"id", "type", "error"} back
+    ({"id", "error"} for a message that is not a JSON object with a known type).
+    Updates are latest-wins per type: a message that arrives while an older one of the same
+    type is still waiting replaces it, and only the newest is answered, so a client dragging
+    the map never builds up a queue of stale conversions.
+    """
+    await websocket.accept()
+    ws_stats["connections"] += 1
+    # Newest unanswered message per type; "error" holds a ready reply to a malformed message
+    pending: Dict[str, dict] = {}
+    ready = asyncio.Event()
+
+    # Only this task writes to the socket; the receive loop just fills pending
+    async def answer():
+        try:
+            while True:
+                await ready.wait()
+                ready.clear()
+                while pending:
+                    kind = next(iter(pending))
+                    item = pending.pop(kind)
+                    reply = item if kind == "error" else await _ws_reply(kind, item)
+                    await websocket.send_text(json.dumps(reply))
+        except WebSocketDisconnect:
+            pass
+
+    sender = asyncio.create_task(answer())
+    try:
+        while True:
+            text = await websocket.receive_text()
+            ws_stats["messages"] += 1
+            try:
+                message = json.loads(text)
+                kind = message.get("type")
+                if kind not in _WS_TYPES:
+                    message, kind = {"id": message.get("id"), "error": 'type must be "coords" or "words"'}, "error"
+            except (ValueError, AttributeError):
+                message, kind = {"id": None, "error": "Messages must be JSON objects"}, "error"
+            if kind in pending:
+                ws_stats["coalesced"] += 1
+            pending[kind] = message
+            ready.set()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        ws_stats["connections"] -= 1
+
+# Lines converted per vectorized call by the NDJSON streaming endpoints
+STREAM_CHUNK_ITEMS = 1000
+
+async def _run_job(fn, *args, size: int):
+    """Run a conversion job through the executor, answering 429 when the process pool is full."""
+    try:
+        return await executor.submit(fn, *args, size=size)
+    except PoolSaturated:
+        raise HTTPException(status_code=429, detail="Server busy, retry later", headers={"Retry-After": "1"})
+
+@app.post("/convert-coords/batch", response_model=WordsBatchResponse)
+async def convert_coords_to_words_batch(request: CoordsBatchRequest):
+    """Convert a batch of coordinates to three words; each item carries its own error"""
+    body, records, versions = await _run_job(
+        convert_batch_json, CoordsRequest, request.items, vocabulary_versions(), size=len(request.items),
+    )
+    conversion_log.record_many(records)
+    return Response(body, media_type="application/json", headers={VERSION_HEADER: _version_header(versions)})
+
+@app.post("/convert-words/batch", response_model=CoordsBatchResponse)
+async def convert_words_to_coords_batch(request: WordsBatchRequest):
+    """Convert a batch of word triples to coordinates; each item carries its own error"""
+    body, records, versions = await _run_job(
+        convert_batch_json, WordsRequest, request.items, vocabulary_versions(), size=len(request.items),
+    )
+    conversion_log.record_many(records)
+    return Response(body, media_type="application/json", headers={VERSION_HEADER: _version_header(versions)})
+
+async def _ndjson_lines(receive):
+    """
+    Yield the non-empty lines of an NDJSON request body as they arrive. Only newly received
+    bytes are searched for newlines, and a line longer than MAX_NDJSON_LINE_BYTES is dropped
+    while it streams in and yielded as None so the caller can report it.
+    """
+    buffer = bytearray()
+    oversized = False
+    more_body = True
+    while more_body:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return
+        chunk = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            if end < 0:
+                break
+            if oversized or len(buffer) + end - start > MAX_NDJSON_LINE_BYTES:
+                yield None
+            else:
+                buffer += chunk[start:end]
+                if buffer.strip():
+                    yield bytes(buffer)
+            buffer.clear()
+            oversized = False
+            start = end + 1
+
+        if not oversized:
+            if len(buffer) + len(chunk) - start > MAX_NDJSON_LINE_BYTES:
+                oversized = True
+                buffer.clear()
+            else:
+                buffer += chunk[start:]
+
+    if oversized:
+        yield None
+    elif buffer.strip():
+        yield bytes(buffer)
+
+class NDJSONConversionEndpoint:
+    """
+    Raw ASGI endpoint that reads NDJSON items and writes NDJSON results, one line per input
+    line, converting in chunks of STREAM_CHUNK_ITEMS through the executor. A full process pool
+    makes the stream wait for a slot rather than fail halfway through the response.
+
+    It owns `receive` for the whole exchange: a StreamingResponse would listen for client
+    disconnects on `receive` concurrently and swallow the request body it is still reading.
+
+    Headers go out before any item is read, so the stream is pinned to the vocabulary versions
+    loaded when it started (reported in X-Vocabulary-Version) even if one is reloaded meanwhile.
+    """
+
+    def __init__(self, model: type):
+        self.model = model
+
+    async def __call__(self, scope, receive, send) -> None:
+        versions = vocabulary_versions()
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"application/x-ndjson"),
+                (VERSION_HEADER.lower().encode(), _version_header(versions).encode()),
+            ],
+        })
+
+        lines = []
+        async for line in _ndjson_lines(receive):
+            lines.append(line)
+            if len(lines) >= STREAM_CHUNK_ITEMS:
+                await self._send_results(send, lines, versions)
+                lines = []
+        if lines:
+            await self._send_results(send, lines, versions)
+
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    async def _send_results(self, send, lines, versions) -> None:
+        body, records, _ = await executor.submit(
+            convert_ndjson_lines, self.model, lines, versions, size=len(lines), wait=True,
+        )
+        conversion_log.record_many(records)
+        await send({"type": "http.response.body", "body": body, "more_body": True})
+
+app.router.add_route(
+    "/convert-coords/stream",
+    NDJSONConversionEndpoint(CoordsRequest),
+    methods=["POST"],
+)
+app.router.add_route(
+    "/convert-words/stream",
+    NDJSONConversionEndpoint(WordsRequest),
+    methods=["POST"],
+)
+
+@app.get("/autocomplete", response_model=AutocompleteResponse)
+async def autocomplete_words(
+    response: Response,
+    prefix: str = Query(..., min_length=1, max_length=32),
+    mode: Literal["global", "india"] = "global",
+    limit: int = Query(10, ge=1, le=50),
+):
+    """
+    Vocabulary words starting with prefix. A bisect over the sorted word list, so it is cheap
+    enough to run directly on the event loop for per-keystroke traffic.
+    """
+    label_mode(mode)
+    codec = await _codec(mode)
+    response.headers[VERSION_HEADER] = _version_header({mode: codec.version})
+    return {"prefix": prefix, "suggestions": codec.complete(prefix, limit)}
+
+@app.post("/suggest", response_model=SuggestResponse)
+def suggest_words(request: SuggestRequest, response: Response):
+    """Ranked corrections (within 2 edits per word) for a misspelled three-word address"""
+    label_mode(request.mode)
+    index = get_spelling_index(request.mode)
+    response.headers[VERSION_HEADER] = _version_header({request.mode: index.codec.version})
+    return {"suggestions": suggest(request.word1, request.word2, request.word3, request.mode, request.limit, index)}
+
+# Hard cap on the number of cells /grid will enumerate for one bounding box
+MAX_GRID_CELLS = int(os.getenv("MAX_GRID_CELLS", "10000"))
+@app.get("/grid")
+async def grid_cells(
+    south: float = Query(..., ge=-90, le=90),
+    west: float = Query(..., ge=-180, le=180),
+    north: float = Query(..., ge=-90, le=90),
+    east: float = Query(..., ge=-180, le=180),
+    mode: Literal["global", "india"] = "global",
+):
+    """Stream the ~3m grid cells inside a bounding box as labelled GeoJSON polygons"""
+    label_mode(mode)
+    try:
+        count = count_cells_in_bbox(south, west, north, east)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if count > MAX_GRID_CELLS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Bounding box covers {count} cells; the limit is {MAX_GRID_CELLS}",
+        )
+    if executor.should_offload(count):
+        # Large grids are rendered whole in a worker process and sent in one piece
+        body, version = await _run_job(
+            grid_geojson_text, south, west, north, east, mode, (await _codec(mode)).version, size=count,
+        )
+        return Response(body, media_type="application/geo+json", headers={VERSION_HEADER: f"{mode}={version}"})
+    codec = await _codec(mode)
+    return StreamingResponse(
+        grid_geojson(south, west, north, east, mode, codec),
+        media_type="application/geo+json",
+        headers={VERSION_HEADER: f"{mode}={codec.version}"},
+    )
+
+@app.get("/manifest")
+def vocabulary_manifest(
+    mode: Literal["global", "india"] = "global",
+    if_none_match: str = Header(""),
+    accept_encoding: str = Header(""),
+):
+    """
+    Sorted vocabulary, grid constants, algorithm version and conformance test vectors of a mode,
+    for clients that convert offline (see manifest.py). Built once per vocabulary version and
+    sent gzip-compressed to clients that accept it, under a content-hash ETag.
+    """
+    label_mode(mode)
+    bundle = get_manifest(mode)
+    version_header = _version_header({mode: bundle.version})
+    if _accepts_gzip(accept_encoding):
+        # Each encoding of the bundle is a different representation, so it gets its own ETag
+        etag = bundle.etag[:-1] + '-gzip"'
+        return _cacheable_response(bundle.gzipped, etag, version_header, if_none_match, "gzip")
+    return _cacheable_response(bundle.body, bundle.etag, version_header, if_none_match, "identity")
+
+@app.get("/cache/stats", response_model=CacheStatsResponse)
+def cache_stats():
+    """Hit, miss and eviction counters of the single-conversion result cache"""
+    return result_cache.stats()
+
+def _component_metrics() -> list:
+    """Gauges and counters read from the result cache, conversion log and process pool."""
+    lines = []
+    for name, kind, help_text, value in (
+        ("w3w_result_cache_entries", "gauge", "Entries in the result cache.", result_cache.stats()["size"]),
+        ("w3w_result_cache_hits_total", "counter", "Result cache hits (local and shared).",
+         result_cache.hits + result_cache.shared_hits),
+        ("w3w_result_cache_misses_total", "counter", "Result cache misses.", result_cache.misses),
+        ("w3w_result_cache_evictions_total", "counter", "Result cache evictions.", result_cache.evictions),
+        ("w3w_conversion_log_backlog", "gauge", "Conversion log records waiting to be written.",
+         conversion_log.stats()["backlog"]),
+        ("w3w_conversion_log_dropped_total", "counter", "Conversion log records dropped on a full backlog.",
+         conversion_log.dropped),
+        ("w3w_ws_connections", "gauge", "Open /ws connections.", ws_stats["connections"]),
+        ("w3w_ws_messages_total", "counter", "Messages received on /ws.", ws_stats["messages"]),
+        ("w3w_ws_coalesced_total", "counter", "/ws messages replaced by a newer one before being answered.",
+         ws_stats["coalesced"]),
+        ("w3w_process_pool_rejected_total", "counter", "Jobs rejected with 429 by the process pool.", executor.rejected),
+    ):
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {value}"]
+    return lines
+
+REGISTRY.add_collector(_component_metrics)
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    """Prometheus text exposition of request, geocoding and component metrics"""
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
 @app.get("/")
 def read_root():
     return {"message": "What3Words Clone API"}
@@ -0,0 +1,131 @@
+"""
+Vocabulary manifests for clients that convert offline.
+
+The word <-> cell mapping is fully determined by a mode's sorted vocabulary, the grid layout and
+the permutation math, so a client that has all three can convert without the server. A manifest
+bundles them as one JSON document, plus conformance test vectors the client checks its own
+implementation against before trusting it:
+
+    format          MANIFEST_FORMAT
+    algorithm       geocoding.ALGORITHM_VERSION (grid and permutation math)
+    mode, version   the mode and its vocabulary version (as in X-Vocabulary-Version)
+    grid            kind, rows, columns; band_rows and band_columns for GRID=equal_area
+    word_count      number of words
+    words           the sorted vocabulary, front-coded (see front_code) and joined by "\\n"
+    words_sha256    hex SHA-256 of the plain vocabulary joined by "\\n"
+    test_vectors    [{latitude, longitude, cell, words, center}, ...]
+
+Each bundle is serialized and gzip-compressed once per vocabulary version and identified by a
+hash of its content. frontend/src/lib/offlineCodec.ts is the reference client.
+"""
+import gzip
+import hashlib
+import json
+import random
+import threading
+from typing import Dict, List, NamedTuple
+
+# Support both package import (backend.*) and direct module import during tests
+try:
+    from .geocoding import ALGORITHM_VERSION, GRID, Codec, get_codec
+except ImportError:
+    from geocoding import ALGORITHM_VERSION, GRID, Codec, get_codec
+
+MANIFEST_FORMAT = 1
+# Random test vectors on top of the fixed edge cases below
+RANDOM_VECTORS = 64
+
+# Poles, the antimeridian, the prime meridian, the equator and cell edges around them
+EDGE_POINTS = [
+    (0.0, 0.0), (90.0, 180.0), (-90.0, -180.0), (90.0, -180.0), (-90.0, 180.0),
+    (89.9999999, 179.9999999), (-89.9999999, -179.9999999), (-1e-9, -1e-9), (1e-9, 1e-9),
+    (51.5074, -0.1278), (-33.8688, 151.2093), (40.6892, -74.0445), (28.6139, 77.209),
+]
+
+class ManifestBundle(NamedTuple):
+    version: str
+    etag: str
+    body: bytes
+    gzipped: bytes
+    codec: Codec
+
+_BUNDLES: Dict[str, ManifestBundle] = {}
+_bundle_lock = threading.Lock()
+
+def front_code(words: List[str]) -> List[str]:
+    """
+    Front-code a sorted word list: each entry is one digit, the length of the prefix shared
+    with the previous word (at most 9), followed by the rest of the word. Neighbouring sorted
+    words share long prefixes, so this compresses about 9x better under gzip than plain words.
+    """
+    entries = []
+    previous = ""
+    for word in words:
+        shared = 0
+        limit = min(len(word), len(previous), 9)
+        while shared < limit and word[shared] == previous[shared]:
+            shared += 1
+        entries.append(f"{shared}{word[shared:]}")
+        previous = word
+    return entries
+
+def front_decode(entries: List[str]) -> List[str]:
+    """Inverse of front_code."""
+    words = []
+    previous = ""
+    for entry in entries:
+        previous = previous[:int(entry[0])] + entry[1:]
+        words.append(previous)
+    return words
+
+def _grid_description() -> dict:
+    description = {"kind": GRID.kind, "rows": GRID.rows, "columns": GRID.columns}
+    if hasattr(GRID, "band_rows"):
+        description.update(band_rows=GRID.band_rows, band_columns=GRID.band_columns)
+    return description
+
+def conformance_vectors(codec: Codec) -> List[dict]:
+    """Expected results of encoding fixed and seeded random points, and of decoding their words."""
+    rng = random.Random(0)
+    points = EDGE_POINTS + [(rng.uniform(-90, 90), rng.uniform(-180, 180)) for _ in range(RANDOM_VECTORS)]
+    vectors = []
+    for lat, lng in points:
+        cell = GRID.cell(lat, lng)
+        words = codec.cell_words(cell)
+        vectors.append({
+            "latitude": lat,
+            "longitude": lng,
+            "cell": cell,
+            "words": list(words),
+            "center": list(codec.decode(*words)),
+        })
+    return vectors
+
+def build_manifest(codec: Codec) -> dict:
+    """The manifest document of a Codec's vocabulary."""
+    word_list = list(codec.word_list)
+    return {
+        "format": MANIFEST_FORMAT,
+        "algorithm": ALGORITHM_VERSION,
+        "mode": codec.mode,
+        "version": codec.version,
+        "grid": _grid_description(),
+        "word_count": codec.word_count,
+        "words": "\n".join(front_code(word_list)),
+        "words_sha256": hashlib.sha256("\n".join(word_list).encode("ascii")).hexdigest(),
+        "test_vectors": conformance_vectors(codec),
+    }
+
+def get_manifest(mode: str = "global") -> ManifestBundle:
+    """The serialized manifest of a mode's current vocabulary, built once per version."""
+    codec = get_codec(mode)
+    bundle = _BUNDLES.get(mode)
+    if bundle is None or bundle.codec is not codec:
+        with _bundle_lock:
+            bundle = _BUNDLES.get(mode)
+            if bundle is None or bundle.codec is not codec:
+                body = json.dumps(build_manifest(codec), separators=(",", ":")).encode()
+                etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+                bundle = ManifestBundle(codec.version, etag, body, gzip.compress(body, 9, mtime=0), codec)
+                _BUNDLES[mode] = bundle
+    return bundle
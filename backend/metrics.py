@@ -0,0 +1,219 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+Counters and histograms are plain Python objects keyed by label values, so recording a
+sample costs a bisect and a few integer updates under a lock; there is no dependency on
+prometheus_client. MetricsMiddleware records request counts, error counts and latency per
+route template and mode; geocoding wraps vocabulary loads and the batch functions with
+timed(). Single conversions take a few microseconds, about what a timed() sample costs, so
+they are only measured per request, by the middleware. Set METRICS=0 to turn all of it off:
+timed() then returns the function unchanged and the middleware is not added.
+"""
+import contextvars
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+METRICS_ENABLED = os.getenv("METRICS", "1") != "0"
+
+# Request latency buckets in seconds, from cache hits up to large batch jobs
+HTTP_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Geocoding operation buckets in seconds, from a single encode up to a vocabulary load
+OPERATION_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 1e-4, 1e-3, 0.01, 0.1, 1.0, 10.0)
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {value}")
+        return lines
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = HTTP_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket (last is +Inf, non-cumulative), sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._series.items())
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound!r}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._collectors: List[Callable[[], List[str]]] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collect: Callable[[], List[str]]) -> None:
+        """Add a callable returning extra exposition lines (e.g. gauges read from other components)."""
+        self._collectors.append(collect)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collect in self._collectors:
+            lines.extend(collect())
+        return "\n".join(lines) + "\n"
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    "w3w_http_requests_total", "HTTP requests by route template, method and mode.", ("route", "method", "mode"),
+))
+HTTP_ERRORS = REGISTRY.register(Counter(
+    "w3w_http_request_errors_total", "HTTP responses with status >= 400 (or unhandled exceptions, as 500).",
+    ("route", "method", "mode", "status"),
+))
+HTTP_LATENCY = REGISTRY.register(Histogram(
+    "w3w_http_request_duration_seconds", "HTTP request latency until the last body chunk is sent.",
+    ("route", "method", "mode"),
+))
+OPERATION_LATENCY = REGISTRY.register(Histogram(
+    "w3w_geocoding_operation_duration_seconds", "Latency of internal geocoding operations.",
+    ("operation", "mode"), OPERATION_BUCKETS,
+))
+
+def timed(operation: str, mode_index: int) -> Callable:
+    """
+    Decorator recording the wrapped function's latency in OPERATION_LATENCY, labelled with its
+    mode argument (keyword "mode" or positional argument mode_index, default "global").
+    """
+    def decorate(fn):
+        if not METRICS_ENABLED:
+            return fn
+        observe = OPERATION_LATENCY.observe
+        perf_counter = time.perf_counter
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                if "mode" in kwargs:
+                    mode = kwargs["mode"]
+                else:
+                    mode = args[mode_index] if len(args) > mode_index else "global"
+                observe(perf_counter() - start, operation, mode)
+        return wrapper
+    return decorate
+
+# Labels of the request being handled; a dict so handlers running in the threadpool (on a
+# copy of the context) can still fill it in for the middleware
+_request_labels: contextvars.ContextVar[Optional[dict]] = contextvars.ContextVar("request_labels", default=None)
+
+def label_mode(mode: str) -> None:
+    """Label the current request's metrics with the mode it was served in."""
+    labels = _request_labels.get()
+    if labels is not None:
+        labels["mode"] = mode
+
+class MetricsMiddleware:
+    """ASGI middleware recording count, errors and latency of every HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+        self._route_paths: Dict[object, str] = {}
+
+    def _route(self, scope) -> str:
+        route = scope.get("route")
+        if route is not None:
+            return route.path
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            # Unmatched paths share one label so scanners cannot blow up the series count
+            return "<unmatched>"
+        path = self._route_paths.get(id(endpoint))
+        if path is None:
+            router = scope["app"].router
+            path = next((r.path for r in router.routes if getattr(r, "endpoint", None) is endpoint), "<unknown>")
+            self._route_paths[id(endpoint)] = path
+        return path
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        labels = {"mode": "", "status": 500}
+        token = _request_labels.set(labels)
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                labels["status"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _request_labels.reset(token)
+            mode = labels["mode"]
+            route, method = self._route(scope), scope["method"]
+            HTTP_REQUESTS.inc(route, method, mode)
+            HTTP_LATENCY.observe(elapsed, route, method, mode)
+            if labels["status"] >= 400:
+                HTTP_ERRORS.inc(route, method, mode, str(labels["status"]))
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
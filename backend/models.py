@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float
+from sqlalchemy import Column, Index, Integer, String, Float
 # Support both package import (backend.*) and direct module import during tests
 try:
     from .database import Base
@@ -13,4 +13,13 @@ class Geocode(Base):
     longitude = Column(Float, nullable=False)
     word1 = Column(String, nullable=False)
     word2 = Column(String, nullable=False)
-    word3 = Column(String, nullable=False)
\ No newline at end of file
+    word3 = Column(String, nullable=False)
+    # Conversion log columns (added to existing databases by database.migrate)
+    mode = Column(String, server_default="global")
+    # "coords" (coordinates -> words) or "words" (words -> coordinates)
+    direction = Column(String)
+    # 0.01 degree bucket of the coordinate, see conversion_log.coarse_cell_key
+    cell_key = Column(Integer, index=True)
+    created_at = Column(Float)
+
+    __table_args__ = (Index("ix_geocodes_words", "word1", "word2", "word3"),)
@@ -1,5 +1,10 @@
-from pydantic import BaseModel
-from typing import Literal
+import os
+
+from pydantic import BaseModel, Field
+from typing import Any, List, Literal, Optional
+
+# Upper bound on items accepted by the JSON batch endpoints
+MAX_BATCH_ITEMS = int(os.getenv("MAX_BATCH_ITEMS", "10000"))
 
 class CoordsRequest(BaseModel):
     latitude: float
@@ -19,4 +24,56 @@ class WordsResponse(BaseModel):
 
 class CoordsResponse(BaseModel):
     latitude: float
-    longitude: float
\ No newline at end of file
+    longitude: float
+
+# Batch items are kept as raw JSON values and validated one by one, so a malformed
+# item is reported in its own result instead of rejecting the whole batch.
+class CoordsBatchRequest(BaseModel):
+    items: List[Any] = Field(..., max_length=MAX_BATCH_ITEMS)
+
+class WordsBatchRequest(BaseModel):
+    items: List[Any] = Field(..., max_length=MAX_BATCH_ITEMS)
+
+class WordsResult(BaseModel):
+    word1: Optional[str] = None
+    word2: Optional[str] = None
+    word3: Optional[str] = None
+    error: Optional[str] = None
+
+class CoordsResult(BaseModel):
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    error: Optional[str] = None
+
+class WordsBatchResponse(BaseModel):
+    results: List[WordsResult]
+
+class CoordsBatchResponse(BaseModel):
+    results: List[CoordsResult]
+
+class AutocompleteResponse(BaseModel):
+    prefix: str
+    suggestions: List[str]
+
+class SuggestRequest(WordsRequest):
+    limit: int = Field(5, ge=1, le=20)
+
+class Suggestion(BaseModel):
+    word1: str
+    word2: str
+    word3: str
+    distance: int
+    latitude: float
+    longitude: float
+
+class SuggestResponse(BaseModel):
+    suggestions: List[Suggestion]
+
+class CacheStatsResponse(BaseModel):
+    size: int
+    maxsize: int
+    hits: int
+    shared_hits: int
+    misses: int
+    evictions: int
+    hit_rate: float
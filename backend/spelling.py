@@ -0,0 +1,181 @@
+"""
+Fuzzy correction of misspelled three-word addresses.
+
+Each mode gets a SymSpell-style deletion index: every vocabulary word's prefix (first
+PREFIX_LENGTH letters) is expanded into all variants with up to MAX_DISTANCE letters deleted,
+and each variant maps to the words it came from. A query expands its own prefix the same way,
+so candidate lookup is a bounded number of dict probes instead of a scan over ~38k words. The
+candidates are then verified with an optimal-string-alignment (Damerau-Levenshtein) distance,
+computed with NumPy across all candidates at once.
+"""
+import threading
+from itertools import product
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+# Support both package import (backend.*) and direct module import during tests
+try:
+    from .geocoding import Codec, get_codec, register_reload_hook
+except ImportError:
+    from geocoding import Codec, get_codec, register_reload_hook
+
+MAX_DISTANCE = 2
+PREFIX_LENGTH = 7
+# Candidates kept per token before triples are combined and ranked
+CANDIDATES_PER_WORD = 10
+
+SPELLING_INDEX_CACHE: Dict[str, "SpellingIndex"] = {}
+# Indexes built for a reloaded vocabulary that has not been swapped in yet
+_PREPARED_INDEXES: Dict[str, "SpellingIndex"] = {}
+_index_lock = threading.Lock()
+
+def _deletes(term: str, max_distance: int) -> Set[str]:
+    """All strings obtained by deleting up to max_distance characters from term (term included)."""
+    result = {term}
+    frontier = {term}
+    for _ in range(max_distance):
+        frontier = {t[:i] + t[i + 1:] for t in frontier for i in range(len(t))}
+        result |= frontier
+    return result
+
+class SpellingIndex:
+    """Deletion index over one Codec's vocabulary."""
+
+    __slots__ = ("codec", "max_distance", "prefix_length", "_deletes", "_codes", "_lengths")
+
+    def __init__(self, codec: Codec, max_distance: int = MAX_DISTANCE, prefix_length: int = PREFIX_LENGTH):
+        self.codec = codec
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+
+        # Most delete keys map to a single word; store those as a bare int to save memory
+        deletes: Dict[str, object] = {}
+        for i, word in enumerate(codec.word_list):
+            for key in _deletes(word[:prefix_length], max_distance):
+                entry = deletes.get(key)
+                if entry is None:
+                    deletes[key] = i
+                elif type(entry) is int:
+                    deletes[key] = [entry, i]
+                else:
+                    entry.append(i)
+        self._deletes = deletes
+
+        # Vocabulary as a (words, width) uint8 matrix for the vectorized distance
+        word_bytes = codec.word_bytes
+        self._codes = word_bytes.view(np.uint8).reshape(len(word_bytes), word_bytes.dtype.itemsize)
+        self._lengths = np.array([len(w) for w in codec.word_list], dtype=np.int64)
+
+    def candidates(self, word: str) -> np.ndarray:
+        """Indices of words sharing a delete variant with word's prefix (a superset of the matches)."""
+        found: Set[int] = set()
+        deletes = self._deletes
+        for key in _deletes(word[:self.prefix_length], self.max_distance):
+            entry = deletes.get(key)
+            if entry is None:
+                continue
+            if type(entry) is int:
+                found.add(entry)
+            else:
+                found.update(entry)
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        indices = np.fromiter(found, dtype=np.int64, count=len(found))
+        # The length difference is a lower bound on the edit distance
+        return indices[np.abs(self._lengths[indices] - len(word)) <= self.max_distance]
+
+    def distances(self, word: str, indices: np.ndarray) -> np.ndarray:
+        """Optimal-string-alignment distance from word to each vocabulary word in indices."""
+        query = np.frombuffer(word.encode("ascii"), dtype=np.uint8)
+        lengths = self._lengths[indices]
+        width = int(lengths.max()) if len(indices) else 0
+        codes = self._codes[indices, :width]
+        count, m = len(indices), len(query)
+
+        # Rows of the DP table over the candidate word (columns), one row per query letter
+        prev2 = None
+        prev = np.broadcast_to(np.arange(width + 1), (count, width + 1)).copy()
+        for i in range(1, m + 1):
+            row = np.empty_like(prev)
+            row[:, 0] = i
+            q = query[i - 1]
+            for j in range(1, width + 1):
+                cost = codes[:, j - 1] != q
+                best = np.minimum(prev[:, j] + 1, row[:, j - 1] + 1)
+                np.minimum(best, prev[:, j - 1] + cost, out=best)
+                if prev2 is not None and j > 1:
+                    transposed = (codes[:, j - 1] == query[i - 2]) & (codes[:, j - 2] == q)
+                    best = np.where(transposed, np.minimum(best, prev2[:, j - 2] + 1), best)
+                row[:, j] = best
+            prev2, prev = prev, row
+        return prev[np.arange(count), lengths]
+
+    def lookup(self, word: str, limit: int = CANDIDATES_PER_WORD) -> List[Tuple[str, int]]:
+        """Up to limit (word, distance) corrections within max_distance, closest first."""
+        word = word.lower()
+        if not (word.isalpha() and word.isascii()):
+            return []
+
+        indices = self.candidates(word)
+        if not len(indices):
+            return []
+        distances = self.distances(word, indices)
+        keep = distances <= self.max_distance
+        indices, distances = indices[keep], distances[keep]
+        # Vocabulary indices follow sorted word order, so ties break alphabetically
+        order = np.lexsort((indices, distances))[:limit]
+        word_list = self.codec.word_list
+        return [(word_list[int(indices[k])], int(distances[k])) for k in order]
+
+def get_spelling_index(mode: str = "global") -> SpellingIndex:
+    """Return the deletion index for a mode's current Codec, building it once on first use."""
+    codec = get_codec(mode)
+    index = SPELLING_INDEX_CACHE.get(mode)
+    if index is None or index.codec is not codec:
+        with _index_lock:
+            index = SPELLING_INDEX_CACHE.get(mode)
+            if index is None or index.codec is not codec:
+                prepared = _PREPARED_INDEXES.pop(mode, None)
+                index = prepared if prepared is not None and prepared.codec is codec else SpellingIndex(codec)
+                SPELLING_INDEX_CACHE[mode] = index
+    return index
+
+def _prepare_index(codec: Codec) -> None:
+    """Reload hook: build the index for a new vocabulary before it goes live, if the mode uses one."""
+    if codec.mode in SPELLING_INDEX_CACHE:
+        _PREPARED_INDEXES[codec.mode] = SpellingIndex(codec)
+
+register_reload_hook(_prepare_index)
+
+def suggest(word1: str, word2: str, word3: str, mode: str = "global", limit: int = 5,
+            index: Optional[SpellingIndex] = None) -> List[dict]:
+    """
+    Ranked corrections for a possibly misspelled three-word address.
+
+    Each token is corrected independently (up to MAX_DISTANCE edits), the per-token candidates
+    are combined into triples of distinct words, ranked by total edit distance, and each triple
+    is decoded to its cell center. Returns dicts with word1..3, distance, latitude, longitude.
+    Pass index to pin the vocabulary (e.g. the one a response reports); by default the mode's
+    current index is used.
+    """
+    if index is None:
+        index = get_spelling_index(mode)
+    per_word = [index.lookup(w) for w in (word1, word2, word3)]
+    if not all(per_word):
+        return []
+
+    triples = []
+    for (w1, d1), (w2, d2), (w3, d3) in product(*per_word):
+        if w1 != w2 and w1 != w3 and w2 != w3:
+            triples.append((d1 + d2 + d3, w1, w2, w3))
+    triples.sort()
+
+    results = []
+    for distance, w1, w2, w3 in triples[:limit]:
+        lat, lng = index.codec.decode(w1, w2, w3)
+        results.append({
+            "word1": w1, "word2": w2, "word3": w3,
+            "distance": distance, "latitude": lat, "longitude": lng,
+        })
+    return results
@@ -0,0 +1,210 @@
+"""
+Synthetic vocabulary words.
+
+Curated word lists are topped up with generated, pronounceable lowercase words until a mode
+has enough words to address every grid cell. The candidates come from a fixed list of stages.
+A stage is a tuple of parts (tuples of letter groups) and yields each concatenation of one
+group per part, in itertools.product order (the order of the equivalent nested loops).
+
+A SyntheticSpace numbers the candidates of all its stages 0, 1, 2, ... ("ranks"). Any range of
+ranks can be produced directly, without walking the ranks before it, and a word can be mapped
+back to the ranks that produce it. generate() keeps the candidates that are neither in the
+existing vocabulary nor a repeat of an earlier candidate, in rank order, and can start at its
+k-th result.
+"""
+import math
+from bisect import bisect_right
+from itertools import accumulate, combinations, product
+from typing import Dict, FrozenSet, Iterable, List, Sequence, Tuple
+
+Stage = Tuple[Tuple[str, ...], ...]
+
+# Candidates produced per pass of generate(), at least; larger passes waste work on the last one
+CHUNK_CANDIDATES = 4096
+
+VOWELS = ("a", "e", "i", "o", "u")
+CONSONANTS = tuple("bcdfghjklmnpqrstvwxyz")
+
+# Generic pronounceable words: CVCV, CVCVC, CVCCV, then CVC and CV fallbacks
+GLOBAL_STAGES: Tuple[Stage, ...] = (
+    (CONSONANTS, VOWELS, CONSONANTS, VOWELS),
+    (CONSONANTS, VOWELS, CONSONANTS, VOWELS, CONSONANTS),
+    (CONSONANTS, VOWELS, CONSONANTS, CONSONANTS, VOWELS),
+    (CONSONANTS, VOWELS, CONSONANTS),
+    (CONSONANTS, VOWELS),
+)
+
+# Indian phonotactics and common name morphemes (INDIA_ONLY_WORDS)
+INDIA_VOWELS = ("a", "aa", "i", "ee", "u", "oo", "e", "ai", "o", "au")
+INDIA_ONSETS = (
+    "k", "kh", "g", "gh", "ch", "j", "jh", "t", "th", "d", "dh", "n", "p", "ph", "b", "bh", "m",
+    "y", "r", "l", "v", "w", "s", "sh", "h",
+    "tr", "dr", "pr", "br", "kr", "gr", "vr", "sr", "shr", "sri", "sk", "st", "sp", "kl", "gl", "pl", "bl",
+)
+INDIA_CODAS = (
+    "n", "m", "r", "l", "sh", "th", "dh", "nd", "nt", "nk", "mp", "rk", "rt", "rd", "rm", "rv", "rs", "rl",
+    "an", "in", "it", "ik", "il", "ir", "ar", "al", "am", "as", "at", "ash",
+)
+INDIA_SUFFIXES = (
+    "raj", "deep", "jeet", "preet", "veer", "kumar", "nath", "dev", "pal", "das", "jit", "kant",
+    "ish", "esh", "eshwar", "indra", "anand", "inder", "jeev", "prasad", "lal", "bai", "ben",
+)
+# onset + vowel + coda, onset + vowel + onset + vowel, onset + vowel + suffix, standalone
+# suffixes, then CV and CVC fallbacks
+INDIA_STAGES: Tuple[Stage, ...] = (
+    (INDIA_ONSETS, INDIA_VOWELS, INDIA_CODAS),
+    (INDIA_ONSETS, INDIA_VOWELS, INDIA_ONSETS, INDIA_VOWELS),
+    (INDIA_ONSETS, INDIA_VOWELS, INDIA_SUFFIXES),
+    (INDIA_SUFFIXES,),
+    (CONSONANTS, VOWELS),
+    (CONSONANTS, VOWELS, CONSONANTS),
+)
+
+def _product_range(parts: Stage, start: int, stop: int) -> List[str]:
+    """Words of ranks [start, stop) of product(*parts), in order, without producing earlier ones."""
+    if start >= stop:
+        return []
+    head, rest = parts[0], parts[1:]
+    if not rest:
+        return list(head[start:stop])
+    inner = math.prod(len(part) for part in rest)
+    first, last = start // inner, (stop - 1) // inner
+    if first == last:
+        return [head[first] + word for word in _product_range(rest, start - first * inner, stop - first * inner)]
+    words = [head[first] + word for word in _product_range(rest, start - first * inner, inner)]
+    words.extend(map("".join, product(head[first + 1:last], *rest)))
+    words.extend(head[last] + word for word in _product_range(rest, 0, stop - last * inner))
+    return words
+
+class SyntheticSpace:
+    """The ranked candidate words of a list of stages."""
+
+    def __init__(self, stages: Sequence[Stage]):
+        self.stages = tuple(tuple(tuple(part) for part in stage) for stage in stages)
+        # Rank of each stage's first candidate, then the total
+        self.offsets = list(accumulate((math.prod(map(len, stage)) for stage in self.stages), initial=0))
+        self.total = self.offsets[-1]
+        # Per stage: the shortest and longest candidate, and per part: group -> index, the
+        # distinct group lengths and the rank weight
+        self._parsers = []
+        for stage in self.stages:
+            weights = [math.prod(len(part) for part in stage[i + 1:]) for i in range(len(stage))]
+            self._parsers.append((
+                sum(min(map(len, part)) for part in stage),
+                sum(max(map(len, part)) for part in stage),
+                [
+                    ({group: index for index, group in enumerate(part)}, sorted({len(group) for group in part}), weight)
+                    for part, weight in zip(stage, weights)
+                ],
+            ))
+        self._duplicates = None
+
+    def __len__(self) -> int:
+        return self.total
+
+    def word(self, rank: int) -> str:
+        """The candidate of a rank."""
+        if not 0 <= rank < self.total:
+            raise IndexError("Candidate rank out of range")
+        stage = bisect_right(self.offsets, rank) - 1
+        return _product_range(self.stages[stage], rank - self.offsets[stage], rank - self.offsets[stage] + 1)[0]
+
+    def words(self, start: int, stop: int) -> List[str]:
+        """The candidates of ranks [start, stop), in order."""
+        start, stop = max(start, 0), min(stop, self.total)
+        words: List[str] = []
+        for stage, parts in enumerate(self.stages):
+            offset, end = self.offsets[stage], self.offsets[stage + 1]
+            if start < end and stop > offset:
+                words.extend(_product_range(parts, max(start, offset) - offset, min(stop, end) - offset))
+        return words
+
+    def ranks(self, word: str) -> List[int]:
+        """Every rank whose candidate is word, ascending; empty when no stage produces it."""
+        ranks: List[int] = []
+
+        def walk(parsers, position: int, rank: int) -> None:
+            if not parsers:
+                if position == len(word):
+                    ranks.append(rank)
+                return
+            groups, lengths, weight = parsers[0]
+            for length in lengths:
+                if position + length > len(word):
+                    break
+                index = groups.get(word[position:position + length])
+                if index is not None:
+                    walk(parsers[1:], position + length, rank + index * weight)
+
+        for offset, (shortest, longest, parsers) in zip(self.offsets, self._parsers):
+            if shortest <= len(word) <= longest:
+                walk(parsers, 0, offset)
+        return sorted(ranks)
+
+    def _unambiguous(self) -> bool:
+        # Single-letter groups, distinct within each part, and no two stages of one length that
+        # share a letter at every position: then no word has two ranks.
+        if any(len(group) != 1 for stage in self.stages for part in stage for group in part):
+            return False
+        if any(len(set(part)) != len(part) for stage in self.stages for part in stage):
+            return False
+        return not any(
+            len(a) == len(b) and all(set(x) & set(y) for x, y in zip(a, b))
+            for a, b in combinations(self.stages, 2)
+        )
+
+    @property
+    def duplicates(self) -> FrozenSet[int]:
+        """Ranks whose candidate a lower rank already produced; built once, on first use."""
+        if self._duplicates is None:
+            if self._unambiguous():
+                self._duplicates = frozenset()
+            else:
+                first: Dict[str, int] = {}
+                self._duplicates = frozenset(
+                    rank for rank, word in enumerate(self.words(0, self.total)) if first.setdefault(word, rank) != rank
+                )
+        return self._duplicates
+
+def _skip(space: SyntheticSpace, seen: set, start: int) -> int:
+    """Rank of the start-th word generate() keeps: start plus the excluded ranks at or before it."""
+    excluded = set(space.duplicates)
+    for word in seen:
+        excluded.update(space.ranks(word))
+    rank = start
+    for excluded_rank in sorted(excluded):
+        if excluded_rank > rank:
+            break
+        rank += 1
+    return rank
+
+def generate(space: SyntheticSpace, min_count: int, existing: Iterable[str], start: int = 0) -> List[str]:
+    """
+    Candidates of space, in rank order, that are not in existing and not a repeat of an earlier
+    candidate, until existing plus the result hold min_count distinct words (or the candidates
+    run out). With start, the result begins at that word of the full result; the words before
+    it are skipped by rank rather than generated.
+    """
+    seen = set(existing)
+    remaining = min_count - len(seen) - start
+    if remaining <= 0:
+        return []
+    rank, duplicates = 0, frozenset()
+    if start:
+        rank, duplicates = _skip(space, seen, start), space.duplicates
+    out: List[str] = []
+    while remaining > 0 and rank < space.total:
+        stop = min(space.total, rank + max(remaining, CHUNK_CANDIDATES))
+        chunk = space.words(rank, stop)
+        if duplicates:
+            # Repeats of candidates before the first rank are only known by rank
+            chunk = [word for word_rank, word in enumerate(chunk, rank) if word_rank not in duplicates]
+        fresh = [word for word in dict.fromkeys(chunk) if word not in seen][:remaining]
+        seen.update(fresh)
+        out.extend(fresh)
+        remaining -= len(fresh)
+        rank = stop
+    return out
+
+GLOBAL_SPACE = SyntheticSpace(GLOBAL_STAGES)
+INDIA_SPACE = SyntheticSpace(INDIA_STAGES)
@@ -0,0 +1,57 @@
+import csv
+
+import pytest
+
+from bulk import convert_file
+from geocoding import lat_lng_to_words, words_to_lat_lng
+
+def _write_csv(path, header, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+def _read_csv(path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+@pytest.mark.parametrize("workers", [0, 1])
+def test_csv_coords_to_words(tmp_path, workers):
+    points = [(51.5 + i * 0.001, -0.12 - i * 0.001) for i in range(25)]
+    _write_csv(tmp_path / "in.csv", ["id", "latitude", "longitude"],
+               [[i, lat, lng] for i, (lat, lng) in enumerate(points)] + [[25, "x", ""], [26, 91, 0]])
+    summary = convert_file(str(tmp_path / "in.csv"), str(tmp_path / "out.csv"),
+                           workers=workers, chunk_rows=10, progress=None)
+    assert summary["rows"] == 27 and summary["errors"] == 2
+
+    rows = _read_csv(tmp_path / "out.csv")
+    assert [row["id"] for row in rows] == [str(i) for i in range(27)]
+    for row, point in zip(rows, points):
+        assert (row["word1"], row["word2"], row["word3"]) == lat_lng_to_words(*point)
+        assert row["error"] == ""
+    assert rows[-1]["word1"] == "" and rows[-1]["error"] == "Invalid coordinates"
+
+def test_csv_words_to_coords_with_custom_columns(tmp_path):
+    words = lat_lng_to_words(48.8566, 2.3522)
+    _write_csv(tmp_path / "in.csv", ["a", "b", "c"], [list(words), ["not", "real", "words"]])
+    convert_file(str(tmp_path / "in.csv"), str(tmp_path / "out.csv"), to="coords",
+                 input_columns=["a", "b", "c"], workers=0, progress=None)
+    rows = _read_csv(tmp_path / "out.csv")
+    assert (float(rows[0]["latitude"]), float(rows[0]["longitude"])) == words_to_lat_lng(*words)
+    assert rows[1]["latitude"] == "" and rows[1]["error"] == "Invalid words"
+
+def test_missing_column_is_reported(tmp_path):
+    _write_csv(tmp_path / "in.csv", ["lat", "lng"], [[1, 2]])
+    with pytest.raises(ValueError, match="latitude"):
+        convert_file(str(tmp_path / "in.csv"), str(tmp_path / "out.csv"), workers=0, progress=None)
+
+def test_parquet_round_trip(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    table = pa.table({"latitude": [51.5, None, 10.0], "longitude": [-0.12, 3.0, 20.0]})
+    pq.write_table(table, tmp_path / "in.parquet")
+    convert_file(str(tmp_path / "in.parquet"), str(tmp_path / "out.parquet"), workers=0, chunk_rows=2, progress=None)
+    out = pq.read_table(tmp_path / "out.parquet").to_pydict()
+    assert out["latitude"] == [51.5, None, 10.0]
+    assert (out["word1"][0], out["word2"][0], out["word3"][0]) == lat_lng_to_words(51.5, -0.12)
+    assert out["error"] == [None, "Invalid coordinates", None]
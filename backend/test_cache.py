@@ -0,0 +1,38 @@
+import pytest
+
+from cache import InMemorySharedBackend, LRUCache, SharedCacheBackend
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    stats = cache.stats()
+    assert (stats["size"], stats["hits"], stats["misses"], stats["evictions"]) == (2, 3, 1, 1)
+    assert stats["hit_rate"] == 0.75
+
+def test_shared_backend_fills_local_misses():
+    shared = InMemorySharedBackend()
+    LRUCache(10, backend=shared).set("key", ("a", "b", "c"))
+    cache = LRUCache(10, backend=shared)
+    assert cache.get("key") == ("a", "b", "c")
+    assert cache.get("key") == ("a", "b", "c")
+    stats = cache.stats()
+    assert (stats["shared_hits"], stats["hits"], stats["misses"]) == (1, 1, 0)
+
+def test_zero_size_disables_local_cache():
+    cache = LRUCache(0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+def test_incomplete_shared_backend_fails_at_construction():
+    class GetOnly(SharedCacheBackend):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        GetOnly()
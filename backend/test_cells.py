@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+
+import geocoding
+from cells import (
+    cell_bounds, cell_bounds_batch, cell_children, cell_id, cell_id_to_words, cell_ids, cell_ids_to_words,
+    cell_neighbours, cell_parent, cell_parents, words_to_cell_id, words_to_cell_ids,
+)
+from geocoding import LATITUDE_CELLS, LONGITUDE_CELLS, cells_in_bbox, lat_lng_to_words
+from grid import EqualAreaGrid, EquirectangularGrid
+
+POINTS = [(51.5074, -0.1278), (-33.8688, 151.2093), (90.0, 180.0), (-90.0, -180.0), (0.0, 0.0)]
+
+def test_cell_id_round_trips_through_words():
+    for lat, lng in POINTS:
+        cid = cell_id(lat, lng)
+        words = lat_lng_to_words(lat, lng)
+        assert cell_id_to_words(cid) == words
+        assert words_to_cell_id(*words) == cid
+        south, west, north, east = cell_bounds(cid)
+        assert south <= lat <= north and west <= lng <= east
+    with pytest.raises(ValueError):
+        cell_id(91, 0)
+    with pytest.raises(ValueError):
+        cell_id_to_words(geocoding.TOTAL_GRID_SQUARES)
+
+def test_vectorized_forms_match_scalar():
+    rng = np.random.default_rng(0)
+    lats = np.append(rng.uniform(-90, 90, 200), [91.0, np.nan])
+    lngs = np.append(rng.uniform(-180, 180, 200), [0.0, 0.0])
+    ids, valid = cell_ids(lats, lngs)
+    assert valid.tolist() == [True] * 200 + [False, False]
+    assert ids[:200].tolist() == [cell_id(lat, lng) for lat, lng in zip(lats[:200], lngs[:200])]
+    assert ids[200:].tolist() == [-1, -1]
+
+    words, words_valid = cell_ids_to_words(ids)
+    assert words_valid.tolist() == valid.tolist()
+    assert [tuple(row) for row in words[:200].tolist()] == [cell_id_to_words(cid) for cid in ids[:200].tolist()]
+    assert words[200].tolist() == ["", "", ""]
+
+    back, back_valid = words_to_cell_ids(words[:, 0], words[:, 1], words[:, 2])
+    assert back.tolist() == ids.tolist() and back_valid.tolist() == valid.tolist()
+
+    bounds = cell_bounds_batch(ids, level=3)
+    for i, cid in enumerate(ids[:200].tolist()):
+        assert tuple(bound[i] for bound in bounds) == cell_bounds(cid, level=3)
+    assert all(np.isnan(bound[200]) for bound in bounds)
+
+def test_cell_bounds_match_grid_cells():
+    for cell in cells_in_bbox(51.5, -0.13, 51.50002, -0.12997):
+        assert cell_bounds(cell["cell_id"]) == (cell["south"], cell["west"], cell["north"], cell["east"])
+
+@pytest.mark.parametrize("grid", [
+    EquirectangularGrid(LATITUDE_CELLS, LONGITUDE_CELLS), EqualAreaGrid(LATITUDE_CELLS, LONGITUDE_CELLS),
+], ids=lambda grid: grid.kind)
+def test_neighbours_wrap_the_antimeridian_but_not_the_poles(grid, monkeypatch):
+    monkeypatch.setattr(geocoding, "GRID", grid)
+
+    def at(row, column):
+        offset, columns = grid.row_layout(row)
+        return offset + column % columns
+
+    # A mid-latitude row whose neighbouring rows have the same column count
+    row = next(r for r in range(grid.rows // 2, grid.rows) if len({grid.row_layout(r + d)[1] for d in (-1, 0, 1)}) == 1)
+    columns = grid.row_layout(row)[1]
+    assert cell_neighbours(at(row, 10)) == [
+        at(row - 1, 9), at(row - 1, 10), at(row - 1, 11),
+        at(row, 9), at(row, 11),
+        at(row + 1, 9), at(row + 1, 10), at(row + 1, 11),
+    ]
+    assert at(row, columns - 1) in cell_neighbours(at(row, 0))
+    assert at(row, 0) in cell_neighbours(at(row, columns - 1))
+
+    # The first and last rows have no row beyond the pole
+    assert grid.row_layout(0)[1] == grid.row_layout(1)[1]
+    assert cell_neighbours(0) == [at(0, -1), at(0, 1), at(1, -1), at(1, 0), at(1, 1)]
+    assert len(cell_neighbours(grid.total_cells - 1)) == 5
+
+def test_parents_and_children_form_a_hierarchy():
+    cid = cell_id(51.5074, -0.1278)
+    assert cell_parent(cid, 0) == cid
+    for level in (1, 4, 10):
+        block = cell_parent(cid, level)
+        south, west, north, east = cell_bounds(block, level)
+        assert south <= 51.5074 <= north and west <= -0.1278 <= east
+        assert cell_parent(block, level) == block
+        assert cell_parent(cid, level - 1) in cell_children(block, level)
+        assert all(cell_parent(child, level) == block for child in cell_children(block, level))
+
+    ids = np.array([cid, 0, geocoding.TOTAL_GRID_SQUARES - 1, -5])
+    assert cell_parents(ids, 6).tolist() == [cell_parent(i, 6) for i in ids[:3].tolist()] + [-1]
+
+    with pytest.raises(ValueError):
+        cell_children(cell_parent(cid, 3) + 1, 3)
+    with pytest.raises(ValueError):
+        cell_children(cid, 0)
+    with pytest.raises(ValueError):
+        cell_parent(cid, geocoding.GRID.max_level + 1)
+
+@pytest.mark.parametrize("grid", [EquirectangularGrid(12, 24), EqualAreaGrid(48, 96, band_rows=8)])
+def test_neighbours_and_blocks_on_small_grids(grid, monkeypatch):
+    monkeypatch.setattr(geocoding, "GRID", grid)
+    neighbours = {cid: set(cell_neighbours(cid)) for cid in range(grid.total_cells)}
+    for cid, others in neighbours.items():
+        assert cid not in others
+        assert all(cid in neighbours[other] for other in others)
+
+    ids = np.arange(grid.total_cells)
+    bounds = cell_bounds_batch(ids)
+    for level in range(1, grid.max_level + 1):
+        parents = cell_parents(ids, level)
+        for block in np.unique(parents).tolist():
+            members = ids[parents == block]
+            # A block covers exactly its members' bounds and splits into its children
+            assert cell_bounds(block, level) == pytest.approx((
+                bounds[0][members].min(), bounds[1][members].min(), bounds[2][members].max(), bounds[3][members].max(),
+            ))
+            assert set(cell_parents(members, level - 1).tolist()) == set(cell_children(block, level))
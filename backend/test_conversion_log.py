@@ -0,0 +1,97 @@
+import logging
+import sqlite3
+import threading
+
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+import conversion_log
+from conversion_log import ConversionLog, coarse_cell_key
+from database import migrate
+from models import Geocode
+
+def _session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'log.db'}")
+    migrate(engine)
+    return engine, sessionmaker(bind=engine)
+
+def test_flush_writes_queued_records(tmp_path):
+    engine, factory = _session_factory(tmp_path)
+    log = ConversionLog(session_factory=factory, enabled=True, flush_size=2, flush_interval=60)
+    for i in range(5):
+        log.record("coords", "global", 51.5 + i, -0.12, "apple", "banana", "cherry")
+    log.flush()
+    with factory() as session:
+        rows = session.query(Geocode).all()
+    assert len(rows) == 5
+    assert rows[0].cell_key == coarse_cell_key(51.5, -0.12)
+    assert log.stats()["written"] == 5
+
+def test_full_backlog_drops_records(tmp_path):
+    engine, factory = _session_factory(tmp_path)
+    database_stalled = threading.Event()
+    database_ready = threading.Event()
+
+    def slow_factory():
+        database_stalled.set()
+        database_ready.wait()
+        return factory()
+
+    log = ConversionLog(session_factory=slow_factory, enabled=True, flush_size=1, max_backlog=2)
+    log.record("coords", "global", 0.0, 0.0, "apple", "banana", "cherry")
+    database_stalled.wait()
+    for _ in range(10):
+        log.record("coords", "global", 0.0, 0.0, "apple", "banana", "cherry")
+    assert log.stats()["dropped"] == 8
+    database_ready.set()
+    log.flush()
+    assert log.stats()["written"] == 3
+
+def test_locked_database_is_retried_then_logged(tmp_path, monkeypatch, caplog):
+    engine, factory = _session_factory(tmp_path)
+    monkeypatch.setattr(conversion_log, "RETRY_DELAY", 0)
+    calls = []
+
+    def locked_once():
+        calls.append(1)
+        if len(calls) == 1:
+            raise OperationalError("INSERT", {}, sqlite3.OperationalError("database is locked"))
+        return factory()
+
+    log = ConversionLog(session_factory=locked_once, enabled=True, flush_size=10)
+    log.record("coords", "global", 0.0, 0.0, "apple", "banana", "cherry")
+    log.flush()
+    assert log.stats()["written"] == 1 and len(calls) == 2
+
+    def always_locked():
+        raise OperationalError("INSERT", {}, sqlite3.OperationalError("database is locked"))
+
+    log = ConversionLog(session_factory=always_locked, enabled=True, flush_size=10)
+    with caplog.at_level(logging.ERROR, logger="conversion_log"):
+        for _ in range(2):
+            log.record("coords", "global", 0.0, 0.0, "apple", "banana", "cherry")
+            log.flush()
+    assert log.stats()["failed"] == 2
+    # The second failure falls inside FAILURE_LOG_INTERVAL and is only counted
+    assert len(caplog.records) == 1 and "database is locked" in caplog.text
+
+def test_migrate_adds_log_columns_to_existing_table(tmp_path):
+    path = tmp_path / "old.db"
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "CREATE TABLE geocodes (id INTEGER PRIMARY KEY, latitude FLOAT NOT NULL, longitude FLOAT NOT NULL,"
+        " word1 VARCHAR NOT NULL, word2 VARCHAR NOT NULL, word3 VARCHAR NOT NULL)"
+    )
+    connection.execute("INSERT INTO geocodes VALUES (1, 1.0, 2.0, 'a', 'b', 'c')")
+    connection.commit()
+    connection.close()
+
+    engine = create_engine(f"sqlite:///{path}")
+    migrate(engine)
+    inspector = inspect(engine)
+    columns = {column["name"] for column in inspector.get_columns("geocodes")}
+    assert {"mode", "direction", "cell_key", "created_at"} <= columns
+    assert "ix_geocodes_words" in {index["name"] for index in inspector.get_indexes("geocodes")}
+    with sessionmaker(bind=engine)() as session:
+        assert session.get(Geocode, 1).mode == "global"
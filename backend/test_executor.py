@@ -0,0 +1,40 @@
+import asyncio
+import time
+
+import pytest
+
+from conversions import convert_coords_items
+from executor import JobExecutor, PoolSaturated
+from schemas import CoordsRequest
+
+def test_offloaded_job_matches_inline():
+    items = [CoordsRequest(latitude=51.5 + i * 1e-4, longitude=-0.12) for i in range(20)] + ["Invalid item: x"]
+    executor = JobExecutor(workers=1, max_pending=2, offload_min_items=10)
+    try:
+        results, records = asyncio.run(executor.submit(convert_coords_items, items, size=len(items)))
+    finally:
+        executor.shutdown()
+    inline_results, inline_records = convert_coords_items(items)
+    assert results == inline_results
+    assert len(records) == len(inline_records) == 20
+
+def test_small_jobs_run_inline():
+    executor = JobExecutor(workers=1, max_pending=1, offload_min_items=10)
+    assert asyncio.run(executor.submit(sum, [1, 2, 3], size=3)) == 6
+    assert executor._pool is None
+
+def test_saturated_pool_rejects_jobs():
+    executor = JobExecutor(workers=1, max_pending=1, offload_min_items=1)
+
+    async def two_jobs():
+        first = asyncio.ensure_future(executor.submit(time.sleep, 0.5, size=1))
+        await asyncio.sleep(0)
+        with pytest.raises(PoolSaturated):
+            await executor.submit(time.sleep, 0, size=1)
+        await first
+
+    try:
+        asyncio.run(two_jobs())
+    finally:
+        executor.shutdown()
+    assert executor.rejected == 1
@@ -55,3 +55,306 @@ def test_bounds():
 
     with pytest.raises(ValueError):
         lat_lng_to_words(0, 181)  # Invalid longitude
+
+def test_vocabulary_artifact_round_trip(tmp_path):
+    from geocoding import write_artifact, read_artifact, source_hash
+
+    path = str(tmp_path / "vocab-global.bin")
+    digest = source_hash("global")
+    write_artifact("global", WORD_LIST, digest, path)
+    assert read_artifact("global", digest, path) == WORD_LIST
+
+def test_vocabulary_artifact_rejects_stale_hash(tmp_path):
+    from geocoding import write_artifact, read_artifact, source_hash
+
+    path = str(tmp_path / "vocab-global.bin")
+    write_artifact("global", WORD_LIST, b"\0" * 32, path)
+    assert read_artifact("global", source_hash("global"), path) is None
+    assert read_artifact("global", source_hash("global"), str(tmp_path / "missing.bin")) is None
+
+def test_lat_lng_to_words_batch_matches_scalar():
+    import numpy as np
+    from geocoding import lat_lng_to_words_batch
+
+    rng = np.random.default_rng(0)
+    lats = np.concatenate([[-90, 90, 0, 51.5074], rng.uniform(-90, 90, 500)])
+    lngs = np.concatenate([[-180, 180, 0, -0.1278], rng.uniform(-180, 180, 500)])
+
+    i1, i2, i3, valid = lat_lng_to_words_batch(lats, lngs)
+    assert valid.all()
+    for k in range(len(lats)):
+        expected = lat_lng_to_words(lats[k], lngs[k])
+        assert (WORD_LIST[i1[k]], WORD_LIST[i2[k]], WORD_LIST[i3[k]]) == expected
+
+    words, valid = lat_lng_to_words_batch(lats[:4], lngs[:4], return_words=True)
+    assert tuple(words[3]) == lat_lng_to_words(51.5074, -0.1278)
+
+def test_lat_lng_to_words_batch_masks_invalid_rows():
+    import numpy as np
+    from geocoding import lat_lng_to_words_batch
+
+    i1, i2, i3, valid = lat_lng_to_words_batch([91, 0, float("nan"), 10], [0, 181, 0, 10])
+    assert valid.tolist() == [False, False, False, True]
+    assert (i1[:3] == -1).all() and (i2[:3] == -1).all() and (i3[:3] == -1).all()
+
+def test_words_to_lat_lng_batch_matches_scalar():
+    import numpy as np
+    from geocoding import lat_lng_to_words_batch, words_to_lat_lng_batch
+
+    rng = np.random.default_rng(1)
+    words, _ = lat_lng_to_words_batch(rng.uniform(-90, 90, 300), rng.uniform(-180, 180, 300), return_words=True)
+    w1 = [w.upper() for w in words[:, 0].tolist()]  # decoding is case-insensitive
+    lats, lngs, valid = words_to_lat_lng_batch(w1, words[:, 1], words[:, 2].tolist())
+
+    assert valid.all()
+    for k in range(len(w1)):
+        assert (lats[k], lngs[k]) == words_to_lat_lng(w1[k], words[k, 1], words[k, 2])
+
+def test_words_to_lat_lng_batch_masks_invalid_rows():
+    from geocoding import words_to_lat_lng_batch
+
+    lats, lngs, valid = words_to_lat_lng_batch(
+        ["invalid", "apple", "apple1", "", "apple"],
+        ["words", "apple", "banana", "banana", "banana"],
+        ["here", "banana", "cherry", "cherry", "cherry"],
+    )
+    assert valid.tolist() == [False, False, False, False, True]
+    assert (lats[4], lngs[4]) == words_to_lat_lng("apple", "banana", "cherry")
+
+def test_load_vocabulary_reuses_artifact_until_sources_change(tmp_path, monkeypatch):
+    import os
+    import geocoding
+
+    monkeypatch.setattr(geocoding, "ARTIFACT_DIR", str(tmp_path))
+    path = geocoding.artifact_path("global")
+
+    assert geocoding.load_vocabulary("global") == WORD_LIST
+    assert os.path.exists(path)
+
+    # Unchanged sources: the artifact is read back, not rebuilt
+    builds = []
+    monkeypatch.setattr(geocoding, "build_vocabulary", lambda mode: builds.append(mode) or WORD_LIST)
+    assert geocoding.load_vocabulary("global") == WORD_LIST
+    assert builds == []
+
+    # A change to anything hashed into the artifact triggers a rebuild and rewrite
+    stale_digest = geocoding.source_hash("global")
+    monkeypatch.setattr(geocoding, "SYNTHESIS_VERSION", geocoding.SYNTHESIS_VERSION + 1)
+    assert geocoding.load_vocabulary("global") == WORD_LIST
+    assert builds == ["global"]
+    assert geocoding.read_artifact("global", stale_digest) is None
+    assert geocoding.read_artifact("global", geocoding.source_hash("global")) == WORD_LIST
+
+def test_shared_backend_maps_one_table_file(tmp_path, monkeypatch):
+    import os
+    import numpy as np
+    import geocoding
+
+    monkeypatch.setattr(geocoding, "ARTIFACT_DIR", str(tmp_path))
+    monkeypatch.setattr(geocoding, "WORD_TABLE_BACKEND", "shared")
+    word_list, word_to_index, combinations, version = geocoding._build_word_data("global")
+    assert type(word_list).__name__ == "SharedWordTable"
+    assert os.path.exists(geocoding.table_path("global"))
+    assert word_list == WORD_LIST and version == geocoding.get_codec("global").version
+
+    # A second load maps the existing file instead of building the vocabulary again
+    monkeypatch.setattr(geocoding, "load_vocabulary", lambda *args: pytest.fail("table file was rebuilt"))
+    word_list = geocoding._build_word_data("global")[0]
+
+    codec = geocoding.Codec("global", word_list, word_to_index, version)
+    reference = geocoding.get_codec("global")
+    assert codec.word_bytes is word_list.word_bytes
+    for index in (0, 123456789, reference.word_combinations - 1):
+        assert codec.encode_index(index) == reference.encode_index(index)
+    lats, lngs = np.array([51.5074, -33.8688]), np.array([-0.1278, 151.2093])
+    words = codec.encode_batch(lats, lngs, return_words=True)[0]
+    assert words.tolist() == reference.encode_batch(lats, lngs, return_words=True)[0].tolist()
+    decoded = codec.decode_batch(words[:, 0], words[:, 1], words[:, 2])
+    assert [d.tolist() for d in decoded] == [d.tolist() for d in reference.decode_batch(words[:, 0], words[:, 1], words[:, 2])]
+
+def test_batch_functions_accept_scalar_input():
+    import numpy as np
+    from geocoding import lat_lng_to_words_batch, words_to_lat_lng_batch
+
+    words, valid = lat_lng_to_words_batch(10.0, 20.0, return_words=True)
+    assert words.shape == (3,) and bool(valid)
+    assert tuple(words.tolist()) == lat_lng_to_words(10.0, 20.0)
+
+    i1, i2, i3, valid = lat_lng_to_words_batch(91.0, 20.0)
+    assert np.ndim(i1) == 0 and not valid
+
+    lat, lng, valid = words_to_lat_lng_batch(*words.tolist())
+    assert bool(valid) and (float(lat), float(lng)) == words_to_lat_lng(*words.tolist())
+
+def test_codec_index_round_trip():
+    from geocoding import get_codec, TOTAL_GRID_SQUARES
+
+    codec = get_codec("global")
+    assert get_codec("global") is codec
+    for grid_index in (0, 1, codec.word_count, 123_456_789_012, TOTAL_GRID_SQUARES - 1):
+        i1, i2, i3 = codec.encode_index(grid_index)
+        assert len({i1, i2, i3}) == 3
+        assert codec.decode_index(i1, i2, i3) == grid_index
+
+def test_codec_rejects_unsorted_vocabulary():
+    from geocoding import Codec
+
+    with pytest.raises(ValueError):
+        Codec("test", ["banana", "apple", "cherry"])
+    with pytest.raises(ValueError):
+        Codec("test", ["apple", "apple1", "cherry"])
+
+def test_autocomplete_prefix():
+    from geocoding import autocomplete
+
+    suggestions = autocomplete("App", limit=5)
+    assert 0 < len(suggestions) <= 5
+    assert suggestions == sorted(suggestions)
+    assert all(w.startswith("app") for w in suggestions)
+    assert suggestions[0] == min(w for w in WORD_LIST if w.startswith("app"))
+    assert autocomplete("zzzzzzzz") == []
+    assert autocomplete("ap1") == []
+
+def test_cells_in_bbox_matches_point_encoding():
+    from geocoding import cells_in_bbox, count_cells_in_bbox
+
+    box = (51.50740, -0.12782, 51.50745, -0.12775)
+    cells = list(cells_in_bbox(*box))
+    assert len(cells) == count_cells_in_bbox(*box) > 1
+    for cell in cells:
+        center = ((cell["south"] + cell["north"]) / 2, (cell["west"] + cell["east"]) / 2)
+        assert lat_lng_to_words(*center) == cell["words"]
+
+def test_cells_in_bbox_crosses_antimeridian():
+    from geocoding import cells_in_bbox
+
+    cells = list(cells_in_bbox(0, 179.99999, 0.00001, -179.99999))
+    assert {cell["west"] > 0 for cell in cells} == {True, False}
+    with pytest.raises(ValueError):
+        next(cells_in_bbox(10, 0, 5, 1))
+
+def test_reload_vocabulary_swaps_codec_atomically(monkeypatch):
+    import geocoding
+    from geocoding import get_codec, reload_vocabulary, sync_vocabulary
+
+    old = get_codec("india")
+    old_words = old.encode(28.6139, 77.2090)
+    assert reload_vocabulary("india") is False
+
+    # Pretend the word list changed: new digest, vocabulary with one more word (one fewer
+    # would no longer cover the grid)
+    monkeypatch.setattr(geocoding, "source_hash", lambda mode="global": b"\x01" * 32)
+    monkeypatch.setattr(geocoding, "build_vocabulary", lambda mode: ["aaaaaaaaaaaa"] + list(old.word_list))
+    try:
+        assert reload_vocabulary("india") is True
+        new = get_codec("india")
+        assert new is not old
+        assert new.version == geocoding.vocabulary_version(new.word_list) != old.version
+        assert len(new.word_list) == len(old.word_list) + 1
+        # A holder of the old Codec keeps a complete, unchanged table
+        assert old.encode(28.6139, 77.2090) == old_words
+        assert new.decode(*new.encode(28.6139, 77.2090)) == old.decode(*old_words)
+    finally:
+        monkeypatch.undo()
+        # A worker told to serve the old version reloads back to it
+        assert sync_vocabulary("india", old.version).version == old.version
+    assert get_codec("india").encode(28.6139, 77.2090) == old_words
+
+def test_version_depends_on_words_not_on_source_code(monkeypatch):
+    import geocoding
+    from geocoding import get_codec, reload_vocabulary
+
+    old = get_codec("india")
+    assert old.version == geocoding.vocabulary_version(old.word_list)
+    # A comment-only change to the generator changes the source hash but not the words
+    monkeypatch.setattr(geocoding, "source_hash", lambda mode="global": b"\x03" * 32)
+    try:
+        assert reload_vocabulary("india") is False
+        assert get_codec("india") is old
+    finally:
+        monkeypatch.undo()
+        reload_vocabulary("india")
+    # The grid layout and algorithm version are part of it
+    monkeypatch.setattr(geocoding, "ALGORITHM_VERSION", geocoding.ALGORITHM_VERSION + 1)
+    assert geocoding.vocabulary_version(old.word_list) != old.version
+
+def test_watcher_compares_against_files_at_load_time(monkeypatch, tmp_path, caplog):
+    import logging
+    import geocoding
+    from geocoding import check_vocabulary_sources, get_codec
+
+    get_codec("india")
+    # Recorded when the codec was built, so an edit before the first poll is still seen
+    signature, digest = geocoding.SOURCE_STATE["india"]
+    assert signature == geocoding._source_signature("india") and digest == geocoding.source_hash("india")
+    assert check_vocabulary_sources() == []
+
+    monkeypatch.setitem(geocoding.SOURCE_STATE, "india", ((("edited", 0, 0),), digest))
+    calls = []
+    monkeypatch.setattr(geocoding, "reload_vocabulary", lambda mode: calls.append(mode) or 1 / 0)
+    failed = {}
+    with caplog.at_level(logging.ERROR, logger=geocoding.logger.name):
+        assert check_vocabulary_sources(failed) == []
+    assert calls == ["india"] and "Vocabulary reload for india failed" in caplog.text
+    assert caplog.records[-1].exc_info is not None
+    # A failed reload is not retried until the files change again
+    assert check_vocabulary_sources(failed) == [] and calls == ["india"]
+
+def test_warmup_leaves_batch_arrays_lazy_on_compact_backend(monkeypatch):
+    import geocoding
+
+    monkeypatch.setattr(geocoding, "WORD_TABLE_BACKEND", "compact")
+    for name in ("WORD_DATA", "CODEC_CACHE", "WORD_LIST_CACHE", "WORD_TO_INDEX_CACHE", "WORD_COMBINATIONS_CACHE"):
+        monkeypatch.setattr(geocoding, name, {})
+    geocoding.warmup(("india",))
+    codec = geocoding.get_codec("india")
+    assert codec._word_array is None and codec._word_bytes is None
+    assert codec.word_bytes.shape == (codec.word_count,)
+
+def test_import_loads_no_vocabulary():
+    import os
+    import subprocess
+    import sys
+
+    code = (
+        "import geocoding\n"
+        "assert not geocoding.WORD_DATA\n"
+        "geocoding.get_codec('india')\n"
+        "assert list(geocoding.WORD_DATA) == ['india']\n"
+        "from geocoding import WORD_LIST, WORD_COMBINATIONS\n"
+        "assert sorted(geocoding.WORD_DATA) == ['global', 'india']\n"
+        "assert WORD_LIST is geocoding.get_codec('global').word_list\n"
+        "assert WORD_COMBINATIONS == geocoding.get_codec('global').word_combinations\n"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+
+def test_concurrent_first_use_builds_each_mode_once(monkeypatch):
+    import threading
+    import time
+    import geocoding
+
+    for name in ("WORD_DATA", "CODEC_CACHE", "WORD_LIST_CACHE", "WORD_TO_INDEX_CACHE", "WORD_COMBINATIONS_CACHE"):
+        monkeypatch.setattr(geocoding, name, {})
+    builds = []
+    build_word_data = geocoding._build_word_data
+
+    def slow_build(mode, digest=None):
+        builds.append(mode)
+        time.sleep(0.05)
+        return build_word_data(mode, digest)
+
+    monkeypatch.setattr(geocoding, "_build_word_data", slow_build)
+    codecs = []
+    threads = [threading.Thread(target=lambda: codecs.append(geocoding.get_codec("india"))) for _ in range(8)]
+    threads.append(threading.Thread(target=geocoding.warmup, args=(("india",),)))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert builds == ["india"]
+    assert len(codecs) == 8 and all(codec is codecs[0] for codec in codecs)
+    # Batch arrays are built ahead except on the compact backend, where they stay lazy
+    assert (codecs[0]._word_bytes is None) == (geocoding.WORD_TABLE_BACKEND == "compact")
+
+    with pytest.raises(ValueError):
+        geocoding.warmup(("mars",))
@@ -0,0 +1,55 @@
+import math
+
+import numpy as np
+import pytest
+
+from grid import EqualAreaGrid, EquirectangularGrid, make_grid
+
+ROWS, COLUMNS = 5323250, 10646500
+
+def test_equal_area_small_grid_numbers_every_cell_once():
+    grid = EqualAreaGrid(90, 180, band_rows=4)
+    indices = set()
+    for row in range(grid.rows):
+        offset, columns = grid.row_layout(row)
+        lat = (row + 0.5) / grid.rows * 180 - 90
+        for column in range(columns):
+            lng = (column + 0.5) / columns * 360 - 180
+            index = grid.cell(lat, lng)
+            assert index == offset + column
+            assert grid.center(index) == pytest.approx((lat, lng))
+            indices.add(index)
+    assert indices == set(range(grid.total_cells))
+
+def test_equal_area_columns_follow_cos_latitude():
+    grid = EqualAreaGrid(ROWS, COLUMNS)
+    assert grid.total_cells / (ROWS * COLUMNS) == pytest.approx(2 / math.pi, rel=1e-3)
+    assert grid.row_layout(ROWS // 2)[1] == COLUMNS
+    assert grid.row_layout(0)[1] < COLUMNS / 1000 and grid.row_layout(ROWS - 1)[1] < COLUMNS / 1000
+    _, columns = grid.row_layout(grid.row_of(60.0))
+    assert columns == pytest.approx(COLUMNS / 2, rel=1e-3)
+
+@pytest.mark.parametrize("grid", [EquirectangularGrid(ROWS, COLUMNS), EqualAreaGrid(ROWS, COLUMNS)])
+def test_batch_mapping_matches_scalar(grid):
+    rng = np.random.default_rng(3)
+    lats = np.concatenate([rng.uniform(-90, 90, 2000), [-90.0, 90.0, 0.0]])
+    lngs = np.concatenate([rng.uniform(-180, 180, 2000), [-180.0, 180.0, 0.0]])
+    cells = grid.cells(lats, lngs)
+    assert cells.tolist() == [grid.cell(lat, lng) for lat, lng in zip(lats.tolist(), lngs.tolist())]
+    assert cells.min() >= 0 and cells.max() < grid.total_cells
+    center_lats, center_lngs = grid.centers(cells)
+    assert list(zip(center_lats.tolist(), center_lngs.tolist())) == [grid.center(c) for c in cells.tolist()]
+    # Each center lies in the cell it came from
+    assert grid.cells(center_lats, center_lngs).tolist() == cells.tolist()
+
+def test_row_segments_cover_the_rows():
+    grid = EqualAreaGrid(ROWS, COLUMNS)
+    segments = list(grid.row_segments(1000, 5000))
+    assert segments[0][0] == 1000 and segments[-1][1] == 5000
+    assert all(columns == grid.row_layout(first)[1] == grid.row_layout(last)[1] for first, last, columns in segments)
+    assert sum(last - first + 1 for first, last, _ in segments) == 4001
+
+def test_make_grid_rejects_unknown_kind():
+    assert make_grid("equal_area", 90, 180).kind == "equal_area"
+    with pytest.raises(ValueError):
+        make_grid("hexagonal", 90, 180)
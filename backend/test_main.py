@@ -1,5 +1,9 @@
+import json
+
+import pytest
 from fastapi.testclient import TestClient
 from main import app
+from metrics import METRICS_ENABLED
 
 client = TestClient(app)
 
@@ -33,4 +37,301 @@ def test_invalid_coords():
 
 def test_invalid_words():
     response = client.post("/convert-words", json={"word1": "invalid", "word2": "words", "word3": "here"})
-    assert response.status_code == 400
\ No newline at end of file
+    assert response.status_code == 400
+
+def test_convert_coords_batch():
+    response = client.post("/convert-coords/batch", json={"items": [
+        {"latitude": 51.5074, "longitude": -0.1278},
+        {"latitude": 100, "longitude": 0},
+        {"latitude": 28.6139, "longitude": 77.2090, "mode": "india"},
+    ]})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    single = client.post("/convert-coords", json={"latitude": 51.5074, "longitude": -0.1278}).json()
+    assert results[0] == {**single, "error": None}
+    assert results[1]["word1"] is None and "Latitude" in results[1]["error"]
+    assert results[2]["error"] is None
+
+def test_convert_words_batch():
+    words = client.post("/convert-coords", json={"latitude": 51.5074, "longitude": -0.1278}).json()
+    response = client.post("/convert-words/batch", json={"items": [
+        words,
+        {"word1": "invalid", "word2": "words", "word3": "here"},
+    ]})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    single = client.post("/convert-words", json=words).json()
+    assert results[0] == {**single, "error": None}
+    assert results[1] == {"latitude": None, "longitude": None, "error": "Invalid words provided"}
+
+def test_convert_coords_stream():
+    body = '{"latitude": 51.5074, "longitude": -0.1278}\n\n{"latitude": 100, "longitude": 0}\nnot json\n'
+    response = client.post("/convert-coords/stream", content=body)
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == 3
+    assert lines[0]["error"] is None and lines[0]["word1"]
+    assert "Latitude" in lines[1]["error"]
+    assert lines[2]["error"].startswith("Invalid item")
+
+def test_convert_words_stream():
+    words = client.post("/convert-coords", json={"latitude": 51.5074, "longitude": -0.1278}).json()
+    body = json.dumps(words) + "\n" + json.dumps({"word1": "invalid", "word2": "words", "word3": "here"})
+    response = client.post("/convert-words/stream", content=body)
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    single = client.post("/convert-words", json=words).json()
+    assert lines[0] == {**single, "error": None}
+    assert lines[1]["error"] == "Invalid words provided"
+
+def test_batch_reports_malformed_item_individually():
+    response = client.post("/convert-coords/batch", json={"items": [
+        {"latitude": 1, "longitude": 2},
+        {"latitude": "abc", "longitude": 2},
+        "not an object",
+    ]})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert results[0]["error"] is None
+    assert results[1]["error"].startswith("Invalid item: latitude")
+    assert results[2]["error"].startswith("Invalid item")
+
+def test_stream_rejects_oversized_line():
+    from main import MAX_NDJSON_LINE_BYTES
+
+    body = '{"latitude": 1, "longitude": 2}\n' + "x" * (MAX_NDJSON_LINE_BYTES + 1) + '\n{"latitude": 3, "longitude": 4}'
+    response = client.post("/convert-coords/stream", content=body)
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == 3
+    assert lines[0]["error"] is None and lines[2]["error"] is None
+    assert "exceeds" in lines[1]["error"]
+
+def test_autocomplete():
+    response = client.get("/autocomplete", params={"prefix": "ban", "limit": 3})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["prefix"] == "ban"
+    assert 0 < len(data["suggestions"]) <= 3
+    assert all(w.startswith("ban") for w in data["suggestions"])
+    assert client.get("/autocomplete", params={"prefix": ""}).status_code == 422
+
+def test_suggest():
+    words = client.post("/convert-coords", json={"latitude": 51.5074, "longitude": -0.1278}).json()
+    response = client.post("/suggest", json={**words, "word2": words["word2"] + "x", "limit": 20})
+    assert response.status_code == 200
+    suggestions = response.json()["suggestions"]
+    assert any((s["word1"], s["word2"], s["word3"]) == (words["word1"], words["word2"], words["word3"]) for s in suggestions)
+
+def test_grid_geojson():
+    params = {"south": 51.50740, "west": -0.12782, "north": 51.50745, "east": -0.12775}
+    response = client.get("/grid", params=params)
+    assert response.status_code == 200
+    collection = response.json()
+    assert collection["type"] == "FeatureCollection"
+    assert len(collection["features"]) > 1
+    words = collection["features"][0]["properties"]["words"].split(".")
+    assert len(words) == 3
+
+def test_grid_rejects_large_bbox():
+    response = client.get("/grid", params={"south": 0, "west": 0, "north": 1, "east": 1})
+    assert response.status_code == 400
+
+def test_result_cache_stats():
+    from main import result_cache
+
+    result_cache.clear()
+    for lat in (51.5074, 51.507401, 51.5074):
+        client.post("/convert-coords", json={"latitude": lat, "longitude": -0.1278})
+    stats = client.get("/cache/stats").json()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 2
+    assert stats["size"] == 1
+
+def test_conversions_are_logged():
+    from main import conversion_log
+
+    conversion_log.flush()
+    written = conversion_log.stats()["written"]
+    client.post("/convert-coords", json={"latitude": 10.0, "longitude": 20.0})
+    client.post("/convert-coords/batch", json={"items": [{"latitude": 1.0, "longitude": 2.0}, {"latitude": 100}]})
+    conversion_log.flush()
+    assert conversion_log.stats()["written"] == written + 2
+
+def test_batch_answers_429_when_pool_is_saturated(monkeypatch):
+    import main
+    from executor import JobExecutor
+
+    saturated = JobExecutor(workers=1, max_pending=1, offload_min_items=1)
+    saturated._slots.acquire()
+    monkeypatch.setattr(main, "executor", saturated)
+    response = client.post("/convert-coords/batch", json={"items": [{"latitude": 1.0, "longitude": 2.0}]})
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "1"
+
+@pytest.mark.skipif(not METRICS_ENABLED, reason="metrics are disabled (METRICS=0)")
+def test_metrics_endpoint():
+    client.post("/convert-coords", json={"latitude": 1.0, "longitude": 2.0, "mode": "india"})
+    client.post("/convert-words", json={"word1": "x", "word2": "y", "word3": "z"})
+    client.post("/convert-words/batch", json={"items": [{"word1": "x", "word2": "y", "word3": "z"}]})
+    body = client.get("/metrics").text
+    assert 'w3w_http_requests_total{route="/convert-coords",method="POST",mode="india"}' in body
+    assert 'w3w_http_request_errors_total{route="/convert-words",method="POST",mode="global",status="400"}' in body
+    assert 'w3w_http_request_duration_seconds_bucket{route="/convert-coords",method="POST",mode="india",le="+Inf"}' in body
+    assert 'w3w_geocoding_operation_duration_seconds_count{operation="decode_batch",mode="global"}' in body
+    assert "w3w_result_cache_entries" in body
+
+def test_responses_report_vocabulary_version():
+    from geocoding import get_codec
+
+    global_version, india_version = get_codec("global").version, get_codec("india").version
+    response = client.post("/convert-coords", json={"latitude": 1.0, "longitude": 2.0})
+    assert response.headers["x-vocabulary-version"] == f"global={global_version}"
+    response = client.post("/convert-coords/batch", json={"items": [
+        {"latitude": 1.0, "longitude": 2.0, "mode": "india"}, {"latitude": 1.0, "longitude": 2.0},
+    ]})
+    assert response.headers["x-vocabulary-version"] == f"global={global_version},india={india_version}"
+    response = client.get("/autocomplete", params={"prefix": "ap", "mode": "india"})
+    assert response.headers["x-vocabulary-version"] == f"india={india_version}"
+
+def test_reload_is_not_served_stale_from_result_cache(monkeypatch):
+    import geocoding
+    from geocoding import get_codec, reload_vocabulary
+
+    old = get_codec("india")
+    point = {"latitude": 12.9716, "longitude": 77.5946, "mode": "india"}
+    before = client.post("/convert-coords", json=point).json()
+    monkeypatch.setattr(geocoding, "source_hash", lambda mode="global": b"\x02" * 32)
+    monkeypatch.setattr(geocoding, "build_vocabulary", lambda mode: ["aaaaaaaaaaaa"] + list(old.word_list))
+    try:
+        assert reload_vocabulary("india")
+        response = client.post("/convert-coords", json=point)
+        assert response.headers["x-vocabulary-version"] == f"india={get_codec('india').version}"
+        assert get_codec("india").version != old.version
+        assert response.json() == dict(zip(("word1", "word2", "word3"), get_codec("india").encode(12.9716, 77.5946)))
+        assert response.json() != before
+    finally:
+        monkeypatch.undo()
+        reload_vocabulary("india")
+    assert client.post("/convert-coords", json=point).json() == before
+
+def test_get_coords_is_cacheable_per_cell():
+    from geocoding import get_codec
+
+    response = client.get("/c/51.50740,-0.12780")
+    assert response.status_code == 200
+    assert response.json() == client.post("/convert-coords", json={"latitude": 51.5074, "longitude": -0.1278}).json()
+    assert response.headers["cache-control"].startswith("public, max-age=")
+    etag = response.headers["etag"]
+    assert get_codec("global").version in etag and not etag.startswith("W/")
+
+    # Another point in the same ~3m cell has the same representation and ETag
+    same_cell = client.get("/c/51.507401,-0.127801")
+    assert same_cell.headers["etag"] == etag and same_cell.content == response.content
+    assert client.get("/c/51.5074,-0.1278", params={"mode": "india"}).headers["etag"] != etag
+
+    revalidated = client.get("/c/51.5074,-0.1278", headers={"If-None-Match": f'W/"other", {etag}'})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b"" and revalidated.headers["etag"] == etag
+
+def test_get_words_round_trip():
+    words = client.get("/c/12.9716,77.5946").json()
+    path = "/w/" + ".".join(words[k].upper() for k in ("word1", "word2", "word3"))
+    response = client.get(path)
+    assert response.status_code == 200
+    assert response.json() == client.post("/convert-words", json=words).json()
+    assert client.get(path, headers={"If-None-Match": response.headers["etag"]}).status_code == 304
+
+def test_get_conversions_reject_bad_input():
+    assert client.get("/c/51.5").status_code == 400
+    assert client.get("/c/north,west").status_code == 400
+    assert client.get("/c/91,0").json()["detail"] == "Latitude must be between -90 and 90"
+    assert client.get("/w/apple.banana").status_code == 400
+    response = client.get("/w/apple.apple.apple")
+    assert response.status_code == 400 and "etag" not in response.headers
+
+def test_manifest_is_compressed_and_revalidated_by_content_hash():
+    from geocoding import WORD_LIST, get_codec
+
+    response = client.get("/manifest", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip" and response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(response.content) / 5
+    manifest = response.json()
+    assert manifest["version"] == get_codec("global").version == response.headers["x-vocabulary-version"].split("=")[1]
+    assert manifest["word_count"] == len(WORD_LIST) and manifest["test_vectors"]
+
+    plain = client.get("/manifest", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers and plain.content == response.content
+    assert plain.headers["etag"] != response.headers["etag"]
+
+    revalidated = client.get("/manifest", headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["etag"]})
+    assert revalidated.status_code == 304 and revalidated.content == b""
+    assert client.get("/manifest", params={"mode": "india"}).json()["mode"] == "india"
+
+def test_manifest_honours_accept_encoding_q_values():
+    from main import _accepts_gzip
+
+    for header in ("gzip", "GZIP;q=0.5", "br, gzip;q=1.0", "*", "identity, *;q=0.1", "x-gzip"):
+        assert _accepts_gzip(header), header
+    for header in ("", "identity", "gzip;q=0", "gzip; q=0.000", "gzip;q=0, *", "*;q=0", "br", "gzip;q=oops"):
+        assert not _accepts_gzip(header), header
+
+    refused = client.get("/manifest", headers={"Accept-Encoding": "gzip;q=0, identity"})
+    assert "content-encoding" not in refused.headers and refused.headers["vary"] == "Accept-Encoding"
+    assert refused.content == client.get("/manifest", headers={"Accept-Encoding": "identity"}).content
+
+def test_websocket_conversions():
+    with client.websocket_connect("/ws") as ws:
+        ws.send_json({"id": 1, "type": "coords", "latitude": 51.5074, "longitude": -0.1278})
+        reply = ws.receive_json()
+        words = client.post("/convert-coords", json={"latitude": 51.5074, "longitude": -0.1278}).json()
+        assert reply["id"] == 1 and reply["type"] == "coords" and reply["mode"] == "global"
+        assert {k: reply[k] for k in words} == words
+
+        ws.send_json({"id": 2, "type": "words", **words, "mode": "global"})
+        reply = ws.receive_json()
+        assert (reply["latitude"], reply["longitude"]) == tuple(client.post("/convert-words", json=words).json().values())
+
+        ws.send_json({"id": 3, "type": "coords", "latitude": 100, "longitude": 0})
+        assert ws.receive_json()["error"] == "Latitude must be between -90 and 90"
+        ws.send_json({"id": 4, "type": "coords", "latitude": "north"})
+        assert ws.receive_json()["error"].startswith("Invalid message: latitude")
+        ws.send_text("not json")
+        assert ws.receive_json() == {"id": None, "error": "Messages must be JSON objects"}
+        ws.send_json({"id": 5, "type": "error"})
+        assert ws.receive_json() == {"id": 5, "error": 'type must be "coords" or "words"'}
+
+def test_websocket_coalesces_to_latest_message():
+    import main
+
+    coalesced = main.ws_stats["coalesced"]
+    with client.websocket_connect("/ws") as ws:
+        # Sent back to back, so most arrive while an older one is still waiting to be answered
+        for i in range(50):
+            ws.send_json({"id": i, "type": "coords", "latitude": i / 10, "longitude": 0})
+        ids = []
+        while not ids or ids[-1] != 49:
+            ids.append(ws.receive_json()["id"])
+    assert ids == sorted(ids)
+    assert main.ws_stats["coalesced"] - coalesced == 50 - len(ids)
+
+def test_unloaded_mode_is_loaded_off_the_event_loop(monkeypatch):
+    import asyncio
+    import geocoding
+    import main
+
+    loaded_on_loop = []
+
+    def get_codec(mode="global"):
+        try:
+            asyncio.get_running_loop()
+            loaded_on_loop.append(mode)
+        except RuntimeError:
+            pass
+        return geocoding.get_codec(mode)
+
+    geocoding.get_codec("india")
+    monkeypatch.setattr(main, "get_codec", get_codec)
+    monkeypatch.delitem(geocoding.CODEC_CACHE, "india")
+    response = client.post("/convert-coords", json={"latitude": 28.6139, "longitude": 77.209, "mode": "india"})
+    assert response.status_code == 200
+    assert "india" in geocoding.CODEC_CACHE and not loaded_on_loop
@@ -0,0 +1,106 @@
+import json
+import os
+import random
+import shutil
+import subprocess
+
+import pytest
+
+from geocoding import GRID, WORD_LIST, get_codec, lat_lng_to_cell, lat_lng_to_words, words_to_lat_lng
+from manifest import build_manifest, front_code, front_decode, get_manifest
+
+FRONTEND = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "frontend")
+OFFLINE_CODEC = os.path.join(FRONTEND, "src", "lib", "offlineCodec.ts")
+
+def test_front_code_round_trip():
+    words = ["a", "ab", "abcdefghijkl", "abcdefghijklm", "abd", "b"]
+    assert front_code(words) == ["0a", "1b", "2cdefghijkl", "9jklm", "2d", "0b"]
+    assert front_decode(front_code(words)) == words
+    assert front_decode(front_code(list(WORD_LIST))) == list(WORD_LIST)
+
+def test_manifest_vectors_match_geocoding():
+    manifest = build_manifest(get_codec("global"))
+    assert manifest["grid"]["rows"] == GRID.rows and manifest["word_count"] == len(WORD_LIST)
+    for vector in manifest["test_vectors"]:
+        lat, lng = vector["latitude"], vector["longitude"]
+        assert vector["cell"] == lat_lng_to_cell(lat, lng)
+        assert tuple(vector["words"]) == lat_lng_to_words(lat, lng)
+        assert tuple(vector["center"]) == words_to_lat_lng(*vector["words"])
+
+def test_manifest_alone_is_enough_to_convert():
+    # A client that only has the manifest (what offlineCodec.ts implements), for either grid kind
+    manifest = json.loads(get_manifest("global").body)
+    words = front_decode(manifest["words"].split("\n"))
+    grid, n = manifest["grid"], manifest["word_count"]
+    rows = grid["rows"]
+    if grid["kind"] == "equal_area":
+        band_rows, band_columns = grid["band_rows"], grid["band_columns"]
+    else:
+        band_rows, band_columns = rows, [grid["columns"]]
+    band_offsets = [0]
+    for band, columns in enumerate(band_columns):
+        band_offsets.append(band_offsets[-1] + (min(rows, (band + 1) * band_rows) - band * band_rows) * columns)
+
+    def encode(lat, lng):
+        band, local_row = divmod(min(int((lat + 90) / 180 * rows), rows - 1), band_rows)
+        columns = band_columns[band]
+        index = band_offsets[band] + local_row * columns + min(int((lng + 180) / 360 * columns), columns - 1)
+        a, r = divmod(index, (n - 1) * (n - 2))
+        b, c = divmod(r, n - 2)
+        second = b + (b >= a)
+        lo, hi = min(a, second), max(a, second)
+        third = c + (c >= lo)
+        third += third >= hi
+        return words[a], words[second], words[third]
+
+    rng = random.Random(1)
+    for _ in range(500):
+        lat, lng = rng.uniform(-90, 90), rng.uniform(-180, 180)
+        assert encode(lat, lng) == lat_lng_to_words(lat, lng)
+
+def _offline_codec_runner(tmp_path):
+    """
+    Node command prefix and module path that run frontend/src/lib/offlineCodec.ts: compiled with
+    the frontend's TypeScript when it is installed, else with Node's own type stripping (Node
+    22.6+). None when neither is available.
+    """
+    node = shutil.which("node")
+    if node is None:
+        return None
+    module = tmp_path / "offlineCodec.mjs"
+    transpile = (
+        "const ts = require('typescript'), fs = require('fs');"
+        "const options = {compilerOptions: {module: ts.ModuleKind.ESNext, target: ts.ScriptTarget.ES2020}};"
+        "fs.writeFileSync(process.argv[2], ts.transpileModule(fs.readFileSync(process.argv[1], 'utf8'), options).outputText);"
+    )
+    if subprocess.run([node, "-e", transpile, OFFLINE_CODEC, str(module)], cwd=FRONTEND, capture_output=True).returncode == 0:
+        return [node], module
+    if subprocess.run([node, "--experimental-strip-types", "-e", ""], capture_output=True).returncode == 0:
+        module = tmp_path / "offlineCodec.mts"
+        shutil.copyfile(OFFLINE_CODEC, module)
+        return [node, "--experimental-strip-types", "--no-warnings"], module
+    return None
+
+def test_typescript_codec_conforms_to_manifest(tmp_path):
+    runner = _offline_codec_runner(tmp_path)
+    if runner is None:
+        pytest.skip("needs node with the frontend's typescript installed, or node 22.6+")
+    command, module = runner
+    (tmp_path / "manifest.json").write_bytes(get_manifest("global").body)
+    rng = random.Random(2)
+    points = [(rng.uniform(-90, 90), rng.uniform(-180, 180)) for _ in range(200)] + [(90.0, 180.0), (-90.0, -180.0)]
+    (tmp_path / "points.json").write_text(json.dumps(points))
+    # The constructor checks the manifest's own test vectors and throws on any mismatch
+    (tmp_path / "run.mjs").write_text(
+        "import { readFileSync } from 'node:fs';\n"
+        f"import {{ OfflineCodec }} from './{module.name}';\n"
+        "const codec = new OfflineCodec(JSON.parse(readFileSync('manifest.json', 'utf8')));\n"
+        "const points = JSON.parse(readFileSync('points.json', 'utf8'));\n"
+        "const words = points.map(([lat, lng]) => codec.encode(lat, lng));\n"
+        "console.log(JSON.stringify({ words, centers: words.map((w) => codec.decode(...w)) }));\n"
+    )
+    result = subprocess.run(command + ["run.mjs"], cwd=tmp_path, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    output = json.loads(result.stdout)
+    assert [tuple(words) for words in output["words"]] == [lat_lng_to_words(lat, lng) for lat, lng in points]
+    assert [tuple(center) for center in output["centers"]] == [words_to_lat_lng(*words) for words in output["words"]]
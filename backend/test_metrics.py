@@ -0,0 +1,30 @@
+import pytest
+
+from metrics import METRICS_ENABLED, Counter, Histogram, timed, OPERATION_LATENCY
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("test_seconds", "Test.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value, "/x")
+    lines = histogram.render()
+    assert 'test_seconds_bucket{route="/x",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{route="/x",le="1.0"} 3' in lines
+    assert 'test_seconds_bucket{route="/x",le="+Inf"} 4' in lines
+    assert 'test_seconds_count{route="/x"} 4' in lines
+    assert 'test_seconds_sum{route="/x"} 6.05' in lines
+
+def test_counter_escapes_label_values():
+    counter = Counter("test_total", "Test.", ("path",))
+    counter.inc('a"b')
+    assert 'test_total{path="a\\"b"} 1' in counter.render()
+
+@pytest.mark.skipif(not METRICS_ENABLED, reason="metrics are disabled (METRICS=0)")
+def test_timed_labels_by_mode_argument():
+    @timed("test_op", mode_index=1)
+    def operation(value, mode="global"):
+        return value
+
+    before = OPERATION_LATENCY.count("test_op", "india")
+    assert operation(1, "india") == 1
+    assert operation(2, mode="india") == 2
+    assert OPERATION_LATENCY.count("test_op", "india") == before + 2
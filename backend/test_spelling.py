@@ -0,0 +1,34 @@
+from geocoding import lat_lng_to_words, words_to_lat_lng
+from spelling import get_spelling_index, suggest
+
+def _osa(a, b):
+    d = [[i + j if i * j == 0 else 0 for j in range(len(b) + 1)] for i in range(len(a) + 1)]
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1, d[i - 1][j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                d[i][j] = min(d[i][j], d[i - 2][j - 2] + 1)
+    return d[-1][-1]
+
+def test_lookup_matches_brute_force():
+    index = get_spelling_index("global")
+    words = index.codec.word_list
+    for query in ("appel", "chery"):
+        expected = sorted((_osa(query, w), w) for w in words if _osa(query, w) <= 2)
+        got = index.lookup(query, limit=len(words))
+        assert sorted((d, w) for w, d in got) == expected
+
+def test_suggest_recovers_misspelled_address():
+    words = lat_lng_to_words(51.5074, -0.1278)
+    # Swap two letters of the first word (a transposition counts as one edit)
+    first = words[0]
+    typo = first[0] + first[2] + first[1] + first[3:]
+    suggestions = suggest(typo, words[1], words[2].upper())
+    match = [s for s in suggestions if (s["word1"], s["word2"], s["word3"]) == words]
+    assert match
+    assert match[0]["distance"] == 1
+    assert (match[0]["latitude"], match[0]["longitude"]) == words_to_lat_lng(*words)
+    assert [s["distance"] for s in suggestions] == sorted(s["distance"] for s in suggestions)
+
+def test_suggest_no_candidates():
+    assert suggest("qqqqqqqqqq", "apple", "banana") == []
@@ -0,0 +1,50 @@
+import hashlib
+
+import pytest
+
+import geocoding
+from synthesis import GLOBAL_SPACE, INDIA_SPACE, generate
+
+EXISTING = {"baba", "kaan", "raj", "gigo", "zu", "kumar", "xyz", "sharaj"}
+
+def _digest(words):
+    return hashlib.sha256("\n".join(words).encode()).hexdigest()[:16]
+
+# Digests of the nested-loop generator this engine replaced; artifacts depend on the exact order
+@pytest.mark.parametrize("india_only, full_count, full_digest, partial_digest", [
+    (False, 476385, "3b9977f114839726", "f631ee030667a689"),
+    (True, 199813, "7c0e90d496593afd", "dd1300848c7a9088"),
+])
+def test_output_matches_the_original_generator(monkeypatch, india_only, full_count, full_digest, partial_digest):
+    monkeypatch.setattr(geocoding, "INDIA_ONLY", india_only)
+    words = geocoding.generate_synthetic_words(10**7, set())
+    assert len(words) == full_count and _digest(words) == full_digest
+    assert _digest(geocoding.generate_synthetic_words(30000, EXISTING)) == partial_digest
+
+@pytest.mark.parametrize("space", [GLOBAL_SPACE, INDIA_SPACE])
+def test_start_skips_to_the_kth_word(space):
+    words = generate(space, 30000, EXISTING)
+    assert len(words) == 30000 - len(EXISTING)
+    for start in (1, 2, 999, 12345, len(words) - 1, len(words), len(words) + 5):
+        assert generate(space, 30000, EXISTING, start=start) == words[start:]
+    every = generate(space, 10**7, ())
+    assert generate(space, 10**7, (), start=len(every) - 3) == every[-3:]
+
+@pytest.mark.parametrize("space", [GLOBAL_SPACE, INDIA_SPACE])
+def test_ranks_and_words_agree(space):
+    boundaries = space.offsets[1:-1]
+    for boundary in boundaries:
+        assert space.words(boundary - 3, boundary + 3) == [space.word(rank) for rank in range(boundary - 3, boundary + 3)]
+    for rank in list(range(0, space.total, 9973)) + [space.total - 1]:
+        assert rank in space.ranks(space.word(rank))
+    assert space.ranks("q") == [] and space.ranks("") == []
+    with pytest.raises(IndexError):
+        space.word(space.total)
+
+def test_duplicates_are_later_ranks_of_one_word():
+    assert GLOBAL_SPACE.duplicates == frozenset()
+    assert len(set(GLOBAL_SPACE.words(0, GLOBAL_SPACE.total))) == GLOBAL_SPACE.total
+    assert INDIA_SPACE.duplicates
+    for rank in sorted(INDIA_SPACE.duplicates)[::500]:
+        ranks = INDIA_SPACE.ranks(INDIA_SPACE.word(rank))
+        assert len(ranks) > 1 and ranks[0] < rank and rank in ranks
@@ -0,0 +1,93 @@
+import pytest
+from word_table import (
+    TABLE_HEADER, CompactWordIndex, CompactWordTable, SharedWordTable, compact_words, write_table_file,
+)
+
+WORDS = ["apple", "banana", "cherry", "date", "elderberry"]
+
+def test_compact_table_sequence_interface():
+    table = CompactWordTable.from_words(WORDS)
+    assert len(table) == len(WORDS)
+    assert [table[i] for i in range(len(WORDS))] == WORDS
+    assert table[-1] == "elderberry"
+    assert list(table) == WORDS
+    assert table == WORDS
+    with pytest.raises(IndexError):
+        table[len(WORDS)]
+
+def test_compact_index_lookup():
+    table, index = compact_words(WORDS)
+    for i, word in enumerate(WORDS):
+        assert index[word] == i
+        assert word in table
+    assert index.get("fig") is None
+    assert "fig" not in table
+    assert "café" not in table
+    with pytest.raises(KeyError):
+        index["fig"]
+
+def test_compact_table_matches_vocabulary():
+    from geocoding import WORD_LIST
+
+    table, index = compact_words(WORD_LIST)
+    assert table == WORD_LIST
+    for i in range(0, len(WORD_LIST), 997):
+        assert index[WORD_LIST[i]] == i
+
+def test_shared_table_file_round_trip(tmp_path):
+    path = str(tmp_path / "tables.bin")
+    digest = bytes(range(32))
+    write_table_file(path, WORDS, digest)
+
+    table = SharedWordTable.open(path, digest)
+    assert table == WORDS
+    assert table.validated
+    assert table.word_array.tolist() == WORDS
+    assert table.word_bytes.tolist() == [w.encode() for w in WORDS]
+    assert not table.word_array.flags.writeable
+    index = CompactWordIndex(table)
+    assert [index[w] for w in WORDS] == list(range(len(WORDS)))
+    assert "fig" not in table
+
+    # Other sources, truncated or missing files are rejected rather than misread
+    assert SharedWordTable.open(path, bytes(32)) is None
+    with open(path, "r+b") as f:
+        f.truncate(200)
+    assert SharedWordTable.open(path, digest) is None
+    assert SharedWordTable.open(str(tmp_path / "missing.bin"), digest) is None
+
+@pytest.mark.parametrize("field, value", [
+    (3, 2**31),    # word count the sections do not hold
+    (4, 99),       # word width the word_bytes and word_array sections do not match
+    (7, 0),        # blob length the offsets do not end at
+    (13, 1),       # word_bytes section shorter than count * width
+    (14, 10**9),   # word_array section past the end of the file
+])
+def test_inconsistent_table_file_is_rejected_and_unmapped(tmp_path, monkeypatch, field, value):
+    import mmap
+    import word_table
+
+    path = str(tmp_path / "tables.bin")
+    digest = bytes(range(32))
+    write_table_file(path, WORDS, digest)
+    with open(path, "r+b") as f:
+        fields = list(TABLE_HEADER.unpack(f.read(TABLE_HEADER.size)))
+        fields[field] = value
+        f.seek(0)
+        f.write(TABLE_HEADER.pack(*fields))
+
+    mapped = []
+
+    class TrackedMmap(mmap.mmap):
+        def __init__(self, *args, **kwargs):
+            mapped.append(self)
+
+    monkeypatch.setattr(word_table.mmap, "mmap", TrackedMmap)
+    assert SharedWordTable.open(path, digest) is None
+    assert len(mapped) == 1 and mapped[0].closed
+
+def test_write_table_file_rejects_invalid_words(tmp_path):
+    with pytest.raises(ValueError):
+        write_table_file(str(tmp_path / "t.bin"), ["banana", "apple"], bytes(32))
+    with pytest.raises(ValueError):
+        write_table_file(str(tmp_path / "t.bin"), ["apple", "b4nana"], bytes(32))
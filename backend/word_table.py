@@ -0,0 +1,271 @@
+"""
+Compact storage for a sorted vocabulary.
+
+CompactWordTable keeps every word in one contiguous ASCII bytes blob ("\n"-separated, the
+same layout as the compiled vocabulary artifact) with an array('I') offset table, instead of
+one Python str object per word. Word -> index lookups go through an open-addressing hash table
+of uint32 slots keyed by CRC-32, so they stay O(1) without a per-word dict entry.
+
+SharedWordTable is the same table mapped read-only from a table file, together with the
+NumPy arrays the batch codec needs. Every process that maps the file shares its pages through
+the OS page cache, so workers neither rebuild the tables nor hold private copies of them.
+"""
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+TABLE_MAGIC = b"W3WTABLE"
+TABLE_FORMAT_VERSION = 1
+# magic, format version, source hash, word count, longest word, hash slots, then
+# (offset, length) of the blob, offsets, slots, word_bytes and word_array sections
+TABLE_HEADER = struct.Struct("<8sI32sIII" + "QQ" * 5)
+# Sections start on cache-line boundaries so the NumPy views are aligned
+SECTION_ALIGN = 64
+
+class CompactWordTable:
+    """Read-only sequence of words backed by a bytes blob and an offset table."""
+
+    __slots__ = ("_blob", "_offsets", "_slots", "_mask", "_count")
+
+    def __init__(self, blob: bytes, offsets: Sequence[int]):
+        """
+        blob holds the words joined by "\\n"; offsets has len(words) + 1 entries, the start of
+        each word followed by len(blob) + 1 (one past the implicit final separator).
+        """
+        self._blob = bytes(blob)
+        self._offsets = offsets if isinstance(offsets, array) and offsets.typecode == "I" else array("I", offsets)
+        self._count = len(self._offsets) - 1
+        if self._count < 0 or self._offsets[0] != 0 or self._offsets[-1] != len(self._blob) + 1:
+            raise ValueError("Offset table does not match the word blob.")
+
+        # Power-of-two table at <= 2/3 load; each slot holds word index + 1 (0 = empty)
+        size = 1
+        while size * 2 < self._count * 3:
+            size *= 2
+        self._mask = size - 1
+        self._slots = array("I", bytes(4 * size))
+        for i in range(self._count):
+            slot = zlib.crc32(self._word_bytes(i)) & self._mask
+            while self._slots[slot]:
+                slot = (slot + 1) & self._mask
+            self._slots[slot] = i + 1
+
+    @classmethod
+    def from_words(cls, words: Iterable[str]) -> "CompactWordTable":
+        """Pack a sorted iterable of ASCII words into a table."""
+        words = list(words)
+        offsets = array("I", [0] * (len(words) + 1))
+        pos = 0
+        for i, w in enumerate(words):
+            offsets[i] = pos
+            pos += len(w) + 1
+        offsets[len(words)] = pos
+        return cls("\n".join(words).encode("ascii"), offsets)
+
+    def _word_bytes(self, i: int) -> bytes:
+        return self._blob[self._offsets[i]:self._offsets[i + 1] - 1]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._count))]
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("word index out of range")
+        offsets = self._offsets
+        # str() rather than .decode() so the blob may also be a memoryview (SharedWordTable)
+        return str(self._blob[offsets[i]:offsets[i + 1] - 1], "ascii")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(str(self._blob, "ascii").split("\n")) if self._count else iter(())
+
+    def __contains__(self, word) -> bool:
+        return isinstance(word, str) and self.find(word) >= 0
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CompactWordTable):
+            return self._blob == other._blob
+        if isinstance(other, (list, tuple)):
+            return len(other) == self._count and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def find(self, word: str) -> int:
+        """Index of word in the table, or -1 if it is not present."""
+        try:
+            key = word.encode("ascii")
+        except UnicodeEncodeError:
+            return -1
+        blob = self._blob
+        offsets = self._offsets
+        slots = self._slots
+        mask = self._mask
+        slot = zlib.crc32(key) & mask
+        while True:
+            entry = slots[slot]
+            if not entry:
+                return -1
+            i = entry - 1
+            if blob[offsets[i]:offsets[i + 1] - 1] == key:
+                return i
+            slot = (slot + 1) & mask
+
+    def nbytes(self) -> int:
+        """Approximate resident size of the table's buffers."""
+        return len(self._blob) + self._offsets.itemsize * len(self._offsets) + self._slots.itemsize * len(self._slots)
+
+class CompactWordIndex:
+    """dict-like word -> index view over a CompactWordTable (raises KeyError like a dict)."""
+
+    __slots__ = ("table",)
+
+    def __init__(self, table: CompactWordTable):
+        self.table = table
+
+    def __getitem__(self, word: str) -> int:
+        i = self.table.find(word)
+        if i < 0:
+            raise KeyError(word)
+        return i
+
+    def get(self, word: str, default: Optional[int] = None) -> Optional[int]:
+        i = self.table.find(word)
+        return default if i < 0 else i
+
+    def __contains__(self, word) -> bool:
+        return word in self.table
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+def compact_words(words: List[str]):
+    """Return (table, index) replacing a word list and its word -> index dict."""
+    table = CompactWordTable.from_words(words)
+    return table, CompactWordIndex(table)
+
+class SharedWordTable(CompactWordTable):
+    """
+    CompactWordTable whose blob, offsets and hash slots are read-only views of a mapped
+    table file (see write_table_file), plus word_bytes and word_array for the batch codec.
+    """
+
+    __slots__ = ("word_bytes", "word_array", "_mmap")
+
+    # The file was validated (sorted, unique, ASCII alphabetic) when it was written
+    validated = True
+
+    @classmethod
+    def open(cls, path: str, digest: bytes) -> Optional["SharedWordTable"]:
+        """Map a table file; None when it is missing, malformed or built from other sources."""
+        if sys.byteorder != "little":
+            return None
+        try:
+            f = open(path, "rb")
+        except OSError:
+            return None
+        with f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                return None
+        if not cls._valid(mm, digest):
+            mm.close()
+            return None
+
+        count, width, slot_count, *sections = TABLE_HEADER.unpack_from(mm, 0)[3:]
+        blob_at, blob_len, offsets_at, offsets_len, slots_at, slots_len, bytes_at, _, array_at, _ = sections
+        view = memoryview(mm)
+        table = cls.__new__(cls)
+        table._blob = view[blob_at:blob_at + blob_len]
+        table._offsets = view[offsets_at:offsets_at + offsets_len].cast("I")
+        table._slots = view[slots_at:slots_at + slots_len].cast("I")
+        table._mask = slot_count - 1
+        table._count = count
+        table.word_bytes = np.frombuffer(mm, dtype=f"S{width}", count=count, offset=bytes_at)
+        table.word_array = np.frombuffer(mm, dtype=f"<U{width}", count=count, offset=array_at)
+        table._mmap = mm
+        return table
+
+    @staticmethod
+    def _valid(mm: mmap.mmap, digest: bytes) -> bool:
+        # Checked before any view of the mapping exists, so a rejected file's mapping can be
+        # closed and a truncated or inconsistent one never reaches np.frombuffer
+        if len(mm) < TABLE_HEADER.size:
+            return False
+        magic, version, stored_digest, count, width, slot_count, *sections = TABLE_HEADER.unpack_from(mm, 0)
+        spans = list(zip(sections[::2], sections[1::2]))
+        (_, blob_len), (offsets_at, offsets_len), (_, slots_len), (_, bytes_len), (_, array_len) = spans
+        if (
+            magic != TABLE_MAGIC
+            or version != TABLE_FORMAT_VERSION
+            or stored_digest != digest
+            or count == 0
+            or width == 0
+            or any(start < TABLE_HEADER.size or start + length > len(mm) for start, length in spans)
+            or offsets_len != 4 * (count + 1)
+            or slots_len != 4 * slot_count
+            or slot_count == 0
+            or slot_count & (slot_count - 1)
+            or bytes_len != count * width
+            or array_len != 4 * count * width
+        ):
+            return False
+        first, = struct.unpack_from("<I", mm, offsets_at)
+        last, = struct.unpack_from("<I", mm, offsets_at + 4 * count)
+        return first == 0 and last == blob_len + 1
+
+def write_table_file(path: str, words: List[str], digest: bytes) -> str:
+    """
+    Build the compact tables and batch arrays for a sorted vocabulary and write them as one
+    table file for SharedWordTable.open:
+
+        header      TABLE_HEADER
+        blob        ASCII words joined by "\n"
+        offsets     uint32[len(words) + 1]
+        slots       uint32 hash table (word index + 1, 0 = empty)
+        word_bytes  fixed-width ASCII array of the words
+        word_array  fixed-width UCS-4 array of the words
+
+    The file is written to a temporary name and renamed into place, so workers that start
+    together may all build it and readers never see a partial file.
+    """
+    if any(a >= b for a, b in zip(words, words[1:])):
+        raise ValueError("Word list must be sorted and free of duplicates.")
+    if not words or not all(w.isalpha() and w.isascii() for w in words):
+        raise ValueError("Word list must contain only ASCII alphabetic words.")
+    table = CompactWordTable.from_words(words)
+    width = max(len(w) for w in words)
+    sections = [
+        table._blob,
+        table._offsets.tobytes(),
+        table._slots.tobytes(),
+        np.array(words, dtype=f"S{width}").tobytes(),
+        np.array(words, dtype=f"<U{width}").tobytes(),
+    ]
+    spans = []
+    position = TABLE_HEADER.size
+    for section in sections:
+        position = -(-position // SECTION_ALIGN) * SECTION_ALIGN
+        spans += [position, len(section)]
+        position += len(section)
+    header = TABLE_HEADER.pack(
+        TABLE_MAGIC, TABLE_FORMAT_VERSION, digest, len(words), width, len(table._slots), *spans,
+    )
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        for start, section in zip(spans[::2], sections):
+            f.write(bytes(start - f.tell()))
+            f.write(section)
+    os.replace(tmp_path, path)
+    return path
@@ -1,7 +1,9 @@
 'use client';
 
-import { useState } from 'react';
+import { useEffect, useRef, useState } from 'react';
 import dynamic from 'next/dynamic';
+import { ConnectionClosedError, ConversionSocket } from '../lib/conversionSocket';
+import { OfflineCodec } from '../lib/offlineCodec';
 
 // Dynamically import map component to avoid SSR issues
 const MapComponent = dynamic(() => import('../components/MapComponent'), { ssr: false });
@@ -21,6 +23,22 @@ export default function Home() {
   const [resultCoords, setResultCoords] = useState('');
   const [mapPosition, setMapPosition] = useState<[number, number]>([51.505, -0.09]);
   const [mapWords, setMapWords] = useState('');
+  // One WebSocket for all map-driven conversions, opened on first use
+  const socketRef = useRef<ConversionSocket | null>(null);
+  // Local codec from /manifest; once loaded, conversions make no network calls
+  const offlineRef = useRef<OfflineCodec | null>(null);
+
+  useEffect(() => () => socketRef.current?.close(), []);
+
+  useEffect(() => {
+    OfflineCodec.load(API_BASE)
+      .then((codec) => {
+        offlineRef.current = codec;
+      })
+      .catch(() => {
+        // No usable manifest: keep converting through the backend
+      });
+  }, []);
 
   const convertCoordsToWords = async () => {
     const latNum = parseFloat(lat);
@@ -35,6 +53,10 @@ export default function Home() {
       return;
     }
 
+    if (offlineRef.current) {
+      setResultWords(offlineRef.current.encode(latNum, lngNum).join(' '));
+      return;
+    }
     try {
       const response = await fetch(`${API_BASE}/convert-coords`, {
         method: 'POST',
@@ -58,6 +80,15 @@ export default function Home() {
       return;
     }
 
+    if (offlineRef.current) {
+      try {
+        const [latitude, longitude] = offlineRef.current.decode(word1.trim(), word2.trim(), word3.trim());
+        setResultCoords(`${latitude}, ${longitude}`);
+      } catch (error) {
+        setResultCoords('Error: Invalid words provided');
+      }
+      return;
+    }
     try {
       const response = await fetch(`${API_BASE}/convert-words`, {
         method: 'POST',
@@ -77,6 +108,29 @@ export default function Home() {
 
   const handleMapClick = async (lat: number, lng: number) => {
     setMapPosition([lat, lng]);
+    if (offlineRef.current) {
+      try {
+        setMapWords(offlineRef.current.encode(lat, lng).join(' '));
+      } catch (error) {
+        setMapWords(`Error: ${(error as Error).message}`);
+      }
+      return;
+    }
+    socketRef.current ??= new ConversionSocket(API_BASE);
+    try {
+      const data = await socketRef.current.convertCoords(lat, lng);
+      if (data) {
+        setMapWords(`${data.word1} ${data.word2} ${data.word3}`);
+      }
+      // null: a newer map event superseded this one, and its answer will update the words
+      return;
+    } catch (error) {
+      if (!(error instanceof ConnectionClosedError)) {
+        setMapWords(`Error: ${(error as Error).message}`);
+        return;
+      }
+    }
+    // The socket could not connect or dropped: fall back to a plain request
     try {
       const response = await fetch(`${API_BASE}/convert-coords`, {
         method: 'POST',
@@ -233,6 +287,7 @@ export default function Home() {
               onLocationSelect={handleMapClick}
               initialPosition={mapPosition}
               words={mapWords}
+              apiBase={API_BASE}
             />
           </div>
         </div>
@@ -1,7 +1,8 @@
 'use client';
 
-import { MapContainer, TileLayer, Marker, Popup, useMapEvents } from 'react-leaflet';
+import { MapContainer, TileLayer, Marker, Popup, GeoJSON, useMapEvents } from 'react-leaflet';
 import { useState } from 'react';
+import type { FeatureCollection } from 'geojson';
 import L from 'leaflet';
 
 // Fix Leaflet default icon paths to avoid 404 for marker icons in Next.js
@@ -19,6 +20,57 @@ interface MapComponentProps {
   onLocationSelect: (lat: number, lng: number) => void;
   initialPosition: [number, number];
   words: string;
+  apiBase: string;
+}
+
+// The 3m grid is only drawn once cells are a few pixels wide
+const GRID_MIN_ZOOM = 19;
+// Labels only fit inside a cell at the deepest zoom levels
+const GRID_LABEL_ZOOM = 21;
+
+function GridOverlay({ apiBase }: { apiBase: string }) {
+  const [grid, setGrid] = useState<{ key: string; data: FeatureCollection; labels: boolean } | null>(null);
+
+  const map = useMapEvents({
+    async moveend() {
+      const zoom = map.getZoom();
+      if (zoom < GRID_MIN_ZOOM) {
+        setGrid(null);
+        return;
+      }
+      const bounds = map.getBounds();
+      const params = new URLSearchParams({
+        south: bounds.getSouth().toFixed(6),
+        west: bounds.getWest().toFixed(6),
+        north: bounds.getNorth().toFixed(6),
+        east: bounds.getEast().toFixed(6),
+      });
+      try {
+        const response = await fetch(`${apiBase}/grid?${params}`);
+        if (!response.ok) {
+          setGrid(null);
+          return;
+        }
+        const data: FeatureCollection = await response.json();
+        setGrid({ key: params.toString(), data, labels: zoom >= GRID_LABEL_ZOOM });
+      } catch (error) {
+        console.error('Error loading grid:', error);
+      }
+    },
+  });
+
+  return grid === null ? null : (
+    <GeoJSON
+      key={grid.key}
+      data={grid.data}
+      style={{ color: '#e11d48', weight: 1, fillOpacity: 0 }}
+      onEachFeature={(feature, layer) => {
+        if (grid.labels) {
+          layer.bindTooltip(feature.properties.words, { permanent: true, direction: 'center', className: 'text-xs' });
+        }
+      }}
+    />
+  );
 }
 
 function LocationMarker({ onLocationSelect, words }: { onLocationSelect: (lat: number, lng: number) => void; words: string }) {
@@ -39,17 +91,21 @@ function LocationMarker({ onLocationSelect, words }: { onLocationSelect: (lat: n
   );
 }
 
-export default function MapComponent({ onLocationSelect, initialPosition, words }: MapComponentProps) {
+export default function MapComponent({ onLocationSelect, initialPosition, words, apiBase }: MapComponentProps) {
   return (
     <MapContainer
       center={initialPosition}
       zoom={13}
+      maxZoom={22}
       style={{ height: '100%', width: '100%' }}
     >
       <TileLayer
         url="https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png"
         attribution='&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors'
+        maxZoom={22}
+        maxNativeZoom={19}
       />
+      <GridOverlay apiBase={apiBase} />
       <LocationMarker onLocationSelect={onLocationSelect} words={words} />
     </MapContainer>
   );
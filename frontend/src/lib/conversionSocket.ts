@@ -0,0 +1,123 @@
+// Client for the backend's /ws conversion channel: one long-lived WebSocket instead of a
+// fetch per map event. Updates are latest-wins per type, matching the server: issuing a new
+// conversion resolves the previous unanswered one of the same type with null.
+
+export type Mode = 'global' | 'india';
+
+export interface WordsResult {
+  word1: string;
+  word2: string;
+  word3: string;
+  version: string;
+}
+
+export interface CoordsResult {
+  latitude: number;
+  longitude: number;
+  version: string;
+}
+
+// Raised when the socket cannot connect or drops; callers can fall back to plain HTTP
+export class ConnectionClosedError extends Error {
+  constructor() {
+    super('Connection to backend closed');
+    this.name = 'ConnectionClosedError';
+  }
+}
+
+// Result each message type is answered with
+interface Replies {
+  coords: WordsResult;
+  words: CoordsResult;
+}
+
+type MessageType = keyof Replies;
+
+interface Waiter<R> {
+  id: number;
+  resolve: (reply: R | null) => void;
+  reject: (error: Error) => void;
+}
+
+type Waiters = { [T in MessageType]?: Waiter<Replies[T]> };
+
+export class ConversionSocket {
+  private url: string;
+  private socket: WebSocket | null = null;
+  private nextId = 1;
+  private waiting: Waiters = {};
+  // Newest message per type not yet sent because the socket is still connecting
+  private unsent: Partial<Record<MessageType, string>> = {};
+
+  constructor(apiBase: string) {
+    this.url = apiBase.replace(/^http/, 'ws').replace(/\/$/, '') + '/ws';
+  }
+
+  convertCoords(latitude: number, longitude: number, mode: Mode = 'global'): Promise<WordsResult | null> {
+    return this.request('coords', { latitude, longitude, mode });
+  }
+
+  convertWords(word1: string, word2: string, word3: string, mode: Mode = 'global'): Promise<CoordsResult | null> {
+    return this.request('words', { word1, word2, word3, mode });
+  }
+
+  close(): void {
+    this.socket?.close();
+    this.socket = null;
+  }
+
+  private request<T extends MessageType>(type: T, fields: object): Promise<Replies[T] | null> {
+    const id = this.nextId++;
+    const message = JSON.stringify({ id, type, ...fields });
+    return new Promise<Replies[T] | null>((resolve, reject) => {
+      this.waiting[type]?.resolve(null);
+      this.waiting[type] = { id, resolve, reject };
+      const socket = this.connect();
+      if (socket.readyState === WebSocket.OPEN) {
+        socket.send(message);
+      } else {
+        this.unsent[type] = message;
+      }
+    });
+  }
+
+  private connect(): WebSocket {
+    if (this.socket && this.socket.readyState <= WebSocket.OPEN) {
+      return this.socket;
+    }
+    const socket = new WebSocket(this.url);
+    socket.onopen = () => {
+      for (const message of Object.values(this.unsent)) {
+        socket.send(message!);
+      }
+      this.unsent = {};
+    };
+    socket.onmessage = (event) => {
+      const reply = JSON.parse(event.data);
+      const type = reply.type as MessageType | undefined;
+      const waiter = type ? this.waiting[type] : undefined;
+      if (!waiter || waiter.id !== reply.id) {
+        return; // answer to a request that has since been superseded
+      }
+      delete this.waiting[type!];
+      if (reply.error) {
+        waiter.reject(new Error(reply.error));
+      } else {
+        waiter.resolve(reply);
+      }
+    };
+    socket.onclose = () => {
+      if (this.socket === socket) {
+        this.socket = null;
+      }
+      const waiters = Object.values(this.waiting);
+      this.waiting = {};
+      this.unsent = {};
+      for (const waiter of waiters) {
+        waiter!.reject(new ConnectionClosedError());
+      }
+    };
+    this.socket = socket;
+    return socket;
+  }
+}
@@ -0,0 +1,276 @@
+// Offline encoder/decoder built from the backend's /manifest. The sorted vocabulary, the grid
+// layout and the permutation math are all a conversion needs, so once a manifest is loaded,
+// and has reproduced its own test vectors, conversions make no network calls. The arithmetic
+// mirrors backend/grid.py and Codec in backend/geocoding.py operation for operation, so results
+// match the server's exactly (every cell index is below 2**53, so plain numbers are exact).
+
+import type { Mode } from './conversionSocket';
+
+// Manifest format and algorithm versions this implementation understands
+export const MANIFEST_FORMAT = 1;
+export const ALGORITHM_VERSION = 1;
+
+export type Words = [string, string, string];
+
+export interface ManifestGrid {
+  kind: 'equirectangular' | 'equal_area';
+  rows: number;
+  columns: number;
+  band_rows?: number;
+  band_columns?: number[];
+}
+
+export interface TestVector {
+  latitude: number;
+  longitude: number;
+  cell: number;
+  words: Words;
+  center: [number, number];
+}
+
+export interface Manifest {
+  format: number;
+  algorithm: number;
+  mode: Mode;
+  version: string;
+  grid: ManifestGrid;
+  word_count: number;
+  words: string;
+  words_sha256: string;
+  test_vectors: TestVector[];
+}
+
+// Raised for a manifest this client cannot use: unknown format, or test vectors it gets wrong
+export class ManifestError extends Error {
+  constructor(message: string) {
+    super(message);
+    this.name = 'ManifestError';
+  }
+}
+
+// Python's divmod for non-negative integers; the float quotient alone can be off by one
+function divmod(x: number, y: number): [number, number] {
+  let q = Math.floor(x / y);
+  let r = x - q * y;
+  if (r < 0) {
+    q -= 1;
+    r += y;
+  } else if (r >= y) {
+    q += 1;
+    r -= y;
+  }
+  return [q, r];
+}
+
+// Inverse of front_code in backend/manifest.py: a digit (prefix shared with the previous word) + the rest
+export function frontDecode(entries: string[]): string[] {
+  const words: string[] = [];
+  let previous = '';
+  for (const entry of entries) {
+    previous = previous.slice(0, Number(entry[0])) + entry.slice(1);
+    words.push(previous);
+  }
+  return words;
+}
+
+export class OfflineCodec {
+  readonly mode: Mode;
+  readonly version: string;
+  private grid: ManifestGrid;
+  private words: string[];
+  private wordIndex: Map<string, number>;
+  private n2: number;
+  private pBase2: number;
+  // Equal-area grids: index of each band's first cell (cumulative, plus the total at the end)
+  private bandOffsets: number[] = [];
+
+  constructor(manifest: Manifest) {
+    if (manifest.format !== MANIFEST_FORMAT || manifest.algorithm !== ALGORITHM_VERSION) {
+      throw new ManifestError(`Unsupported manifest format ${manifest.format}, algorithm ${manifest.algorithm}`);
+    }
+    this.mode = manifest.mode;
+    this.version = manifest.version;
+    this.grid = manifest.grid;
+    this.words = frontDecode(manifest.words.split('\n'));
+    if (this.words.length !== manifest.word_count) {
+      throw new ManifestError('Manifest word list is incomplete');
+    }
+    this.wordIndex = new Map(this.words.map((word, i) => [word, i]));
+    const n = this.words.length;
+    this.n2 = n - 2;
+    this.pBase2 = (n - 1) * (n - 2);
+    if (this.grid.kind === 'equal_area') {
+      const bandRows = this.grid.band_rows!;
+      let offset = 0;
+      this.grid.band_columns!.forEach((columns, band) => {
+        this.bandOffsets.push(offset);
+        offset += (Math.min(this.grid.rows, (band + 1) * bandRows) - band * bandRows) * columns;
+      });
+      this.bandOffsets.push(offset);
+    } else if (this.grid.kind !== 'equirectangular') {
+      throw new ManifestError(`Unsupported grid ${this.grid.kind}`);
+    }
+    this.verify(manifest.test_vectors);
+  }
+
+  // Fetch a mode's manifest, keeping the last good copy for when the network is unavailable
+  static async load(apiBase: string, mode: Mode = 'global'): Promise<OfflineCodec> {
+    const key = `w3w-manifest-${mode}`;
+    let text: string | null = null;
+    try {
+      const response = await fetch(`${apiBase.replace(/\/$/, '')}/manifest?mode=${mode}`);
+      if (response.ok) {
+        text = await response.text();
+      }
+    } catch {
+      // offline: fall back to the stored copy below
+    }
+    const stored = typeof localStorage !== 'undefined' ? localStorage.getItem(key) : null;
+    const source = text ?? stored;
+    if (source === null) {
+      throw new ManifestError('No manifest available');
+    }
+    const codec = new OfflineCodec(JSON.parse(source));
+    if (text !== null && text !== stored) {
+      try {
+        localStorage.setItem(key, text);
+      } catch {
+        // storage full or unavailable; the manifest is simply fetched again next time
+      }
+    }
+    return codec;
+  }
+
+  // Grid index of the cell containing a coordinate (grid.py cell())
+  cell(lat: number, lng: number): number {
+    if (!(lat >= -90 && lat <= 90)) {
+      throw new RangeError('Latitude must be between -90 and 90');
+    }
+    if (!(lng >= -180 && lng <= 180)) {
+      throw new RangeError('Longitude must be between -180 and 180');
+    }
+    const { rows, columns } = this.grid;
+    let row = Math.trunc(((lat + 90) / 180) * rows);
+    if (row >= rows) {
+      row = rows - 1;
+    }
+    if (this.grid.kind === 'equirectangular') {
+      let column = Math.trunc(((lng + 180) / 360) * columns);
+      if (column >= columns) {
+        column = columns - 1;
+      }
+      return row * columns + column;
+    }
+    const [band, localRow] = divmod(row, this.grid.band_rows!);
+    const bandColumns = this.grid.band_columns![band];
+    let column = Math.trunc(((lng + 180) / 360) * bandColumns);
+    if (column >= bandColumns) {
+      column = bandColumns - 1;
+    }
+    return this.bandOffsets[band] + localRow * bandColumns + column;
+  }
+
+  // Center of a cell (grid.py center()), clamped like the server's
+  center(index: number): [number, number] {
+    const { rows, columns } = this.grid;
+    if (this.grid.kind === 'equirectangular') {
+      const [latGrid, lngGrid] = divmod(index, columns);
+      let lat = (latGrid / rows) * 180 - 90;
+      let lng = (lngGrid / columns) * 360 - 180;
+      lat += 180 / rows / 2;
+      lng += 360 / columns / 2;
+      return [Math.max(-90, Math.min(90, lat)), Math.max(-180, Math.min(180, lng))];
+    }
+    const offsets = this.bandOffsets;
+    index = Math.min(index, offsets[offsets.length - 1] - 1);
+    // Last band whose first cell is <= index (bisect_right - 1)
+    let lo = 0;
+    let hi = offsets.length - 1;
+    while (hi - lo > 1) {
+      const mid = (lo + hi) >> 1;
+      if (offsets[mid] <= index) {
+        lo = mid;
+      } else {
+        hi = mid;
+      }
+    }
+    const bandColumns = this.grid.band_columns![lo];
+    const [localRow, column] = divmod(index - offsets[lo], bandColumns);
+    const row = lo * this.grid.band_rows! + localRow;
+    return [((row + 0.5) / rows) * 180 - 90, ((column + 0.5) / bandColumns) * 360 - 180];
+  }
+
+  // Codec.encode_index: a grid index to three distinct word indices
+  private encodeIndex(index: number): [number, number, number] {
+    const [a, r] = divmod(index, this.pBase2);
+    const [b, c0] = divmod(r, this.n2);
+    const i2 = b >= a ? b + 1 : b;
+    const lo = Math.min(a, i2);
+    const hi = Math.max(a, i2);
+    let c = c0;
+    if (c >= lo) {
+      c += 1;
+    }
+    if (c >= hi) {
+      c += 1;
+    }
+    return [a, i2, c];
+  }
+
+  // Codec.decode_index: the inverse of encodeIndex
+  private decodeIndex(i1: number, i2: number, i3: number): number {
+    const b = i2 > i1 ? i2 - 1 : i2;
+    const lo = Math.min(i1, i2);
+    const hi = Math.max(i1, i2);
+    let c = i3;
+    if (c > hi) {
+      c -= 1;
+    }
+    if (c > lo) {
+      c -= 1;
+    }
+    return i1 * this.pBase2 + b * this.n2 + c;
+  }
+
+  cellWords(index: number): Words {
+    const [i1, i2, i3] = this.encodeIndex(index);
+    return [this.words[i1], this.words[i2], this.words[i3]];
+  }
+
+  encode(lat: number, lng: number): Words {
+    return this.cellWords(this.cell(lat, lng));
+  }
+
+  // Cell center of three words; throws with the server's messages for invalid input
+  decode(word1: string, word2: string, word3: string): [number, number] {
+    const words = [word1, word2, word3].map((word) => word.toLowerCase());
+    if (!words.every((word) => /^\p{L}+$/u.test(word))) {
+      throw new Error('Words must contain only alphabetic characters.');
+    }
+    if (words[0] === words[1] || words[0] === words[2] || words[1] === words[2]) {
+      throw new Error('Words must be unique.');
+    }
+    const indices = words.map((word) => this.wordIndex.get(word));
+    if (indices.some((index) => index === undefined)) {
+      throw new Error('One or more words not found in the dictionary');
+    }
+    const [i1, i2, i3] = indices as number[];
+    return this.center(this.decodeIndex(i1, i2, i3));
+  }
+
+  private verify(vectors: TestVector[]): void {
+    for (const vector of vectors) {
+      const cell = this.cell(vector.latitude, vector.longitude);
+      const words = this.cellWords(cell);
+      const [lat, lng] = this.decode(...vector.words);
+      if (
+        cell !== vector.cell ||
+        words.join('.') !== vector.words.join('.') ||
+        lat !== vector.center[0] ||
+        lng !== vector.center[1]
+      ) {
+        throw new ManifestError(`Test vector ${vector.latitude},${vector.longitude} does not match`);
+      }
+    }
+  }
+}